@@ -0,0 +1,85 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+"""Microbenchmark of the model classes
+
+Compares the models of fossology.obj, storing their attributes in the instance
+__dict__, with their slotted variants.
+
+Usage: python benchmarks/models.py [--count 100000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from fossology.obj import Job, SlottedJob, SlottedUpload, Upload
+
+
+def upload_json(upload_id):
+    return {
+        "folderid": 1,
+        "foldername": "Software Repository",
+        "id": upload_id,
+        "description": "",
+        "uploadname": f"upload-{upload_id}.tar.gz",
+        "uploaddate": "2021-01-01 12:00:00.000000+00",
+        "hash": {
+            "sha1": "D4D663FC2877084362FB2297337BE05684869B00",
+            "md5": "6D2BCA3E4B5F6A5FD2E5C6F6F6C1B1E4",
+            "sha256": "E5E52BDB7BBE8E8B1C3D1E16DB8DF5BD6C9FAB1C3E4E1BE81F7C61D5A7E1D66A",
+            "size": 1234567,
+        },
+    }
+
+
+def job_json(job_id):
+    return {
+        "id": job_id,
+        "name": f"upload-{job_id}.tar.gz",
+        "queueDate": "2021-01-01 12:00:00.000000+00",
+        "uploadId": job_id,
+        "userId": 3,
+        "groupId": 3,
+        "eta": 0,
+        "status": "Completed",
+    }
+
+
+def measure(model, items, repeat):
+    """Return the number of objects created per second and the bytes per object"""
+    duration = min(
+        timeit.repeat(
+            lambda: [model.from_json(item) for item in items], number=1, repeat=repeat
+        )
+    )
+    gc.collect()
+    tracemalloc.start()
+    objects = [model.from_json(item) for item in items]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return len(items) / duration, size / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    uploads = [upload_json(i) for i in range(args.count)]
+    jobs = [job_json(i) for i in range(args.count)]
+    print(f"{'model':<8} {'variant':<8} {'objects/s':>12} {'bytes/object':>14}")
+    for name, items, plain, slotted in (
+        ("Upload", uploads, Upload, SlottedUpload),
+        ("Job", jobs, Job, SlottedJob),
+    ):
+        for variant, model in (("plain", plain), ("slotted", slotted)):
+            throughput, size = measure(model, items, args.repeat)
+            print(f"{name:<8} {variant:<8} {throughput:>12,.0f} {size:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
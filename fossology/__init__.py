@@ -3,24 +3,30 @@
 
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from fossology import concurrency
+from fossology.capabilities import Capabilities, versiontuple  # noqa: F401
+from fossology.codec import dumps, response_json, response_total_pages
 from fossology.exceptions import (
     AuthenticationError,
     AuthorizationError,
     FossologyApiError,
-    FossologyUnsupported,
 )
-from fossology.folders import Folders
+from fossology.folders import FolderIndex, Folders
 from fossology.groups import Groups
 from fossology.jobs import Jobs
 from fossology.license import LicenseEndpoint
 from fossology.obj import (
     Agents,
     File,
+    SearchResult,
     SearchTypes,
     TokenScope,
     Upload,
@@ -33,9 +39,8 @@ from fossology.uploads import Uploads
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-
-def versiontuple(v):
-    return tuple(map(int, (v.split("."))))
+FILESEARCH_ALGORITHMS = ("sha1", "md5", "sha256")
+SEARCH_MAX_PAGE_SIZE = 1000
 
 
 def search_headers(
@@ -69,6 +74,40 @@ def search_headers(
     return headers
 
 
+def filesearch_hash(entry: Dict) -> Tuple[str, str]:
+    """Get the hash sum identifying a filesearch entry: SHA1, MD5 or SHA256 in this order"""
+    for algorithm in FILESEARCH_ALGORITHMS:
+        if entry.get(algorithm):
+            return algorithm, entry[algorithm]
+    raise ValueError(f"No hash sum in filesearch entry {entry}")
+
+
+def filesearch_key(entry: Dict) -> Tuple[str, str]:
+    """Get the case-insensitive key of a filesearch entry: its hash sum in upper case"""
+    algorithm, value = filesearch_hash(entry)
+    return algorithm, value.upper()
+
+
+def match_filesearch_results(entries: List, results: List) -> List[Tuple]:
+    """Pair each filesearch entry with its result
+
+    The results are normally returned in the order of the entries, otherwise they
+    are matched by hash sum. Entries without result are paired with an empty result.
+    """
+    if len(results) == len(entries):
+        return list(zip(entries, results))
+
+    by_hash = dict()
+    for result in results:
+        for algorithm, value in (result.get("hash") or {}).items():
+            if algorithm in FILESEARCH_ALGORITHMS and value:
+                by_hash[(algorithm, value.upper())] = result
+    matches = list()
+    for entry in entries:
+        matches.append((entry, by_hash.get(filesearch_key(entry), {})))
+    return matches
+
+
 def fossology_token(
     url, username, password, token_name, token_scope=TokenScope.READ, token_expire=None
 ):
@@ -114,7 +153,7 @@ def fossology_token(
     try:
         response = requests.post(url + "/api/v1/tokens", data=data)
         if response.status_code == 201:
-            token = response.json()["Authorization"]
+            token = response_json(response)["Authorization"]
             return re.sub("Bearer ", "", token)
         elif response.status_code == 404:
             description = "Authentication error"
@@ -142,34 +181,148 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         The class instantiation exits if the session with the Fossology server
         can't be established
 
+    In lazy mode, instantiating the class doesn't perform any request: the attributes
+    ``user``, ``version``, ``rootFolder`` and ``folders`` are fetched from the server
+    on first access, independent requests being sent concurrently. The
+    :class:`~fossology.capabilities.Capabilities` of the server are derived from
+    ``version`` once and exposed as ``capabilities``.
+
+    :Example:
+
+    >>> foss = Fossology(FOSS_URL, FOSS_TOKEN, username, lazy=True)
+    >>> # Only GET /version is sent
+    >>> foss.version
+
+    The session attributes can also be read from an on-disk
+    :class:`~fossology.cache.SessionCache`, attributes which are not cached or expired
+    are fetched from the server and written back to the cache.
+
     :param url: URL of the Fossology instance
     :param token: The API token generated using the Fossology UI
     :param name: The name of the token owner
+    :param lazy: fetch the session attributes on first access (default: False)
+    :param session_cache: cache of the session attributes (default: None)
+    :param license_cache: cache of the licenses returned by detail_license() (default: None)
+    :param pool_size: the number of connections kept open to the server, should be at least
+                      the number of workers used by concurrent operations (default: 10)
     :type url: str
     :type token: str
     :type name: str
+    :type lazy: boolean
+    :type session_cache: SessionCache
+    :type license_cache: LicenseCache
+    :type pool_size: int
     :raises AuthenticationError: if the user couldn't be found
     """
 
-    def __init__(self, url, token, name):
+    # Session attributes fetched from the server, with their dependencies
+    BOOTSTRAP_ATTRIBUTES = {
+        "user": (),
+        "version": (),
+        "rootFolder": ("user",),
+        "folders": ("user",),
+        "capabilities": ("version",),
+    }
+
+    def __init__(
+        self,
+        url,
+        token,
+        name,
+        lazy=False,
+        session_cache=None,
+        pool_size=10,
+        license_cache=None,
+    ):
         self.host = url
         self.token = token
         self.name = name
         self.users = list()
-        self.folders = list()
 
         self.api = f"{self.host}/api/v1"
         self.session = requests.Session()
         self.session.headers.update({"Authorization": f"Bearer {self.token}"})
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._bootstrap_lock = threading.RLock()
+
+        self.license_cache = license_cache
+        self.session_cache = session_cache
+        if session_cache:
+            cached = session_cache.load(self.host, self.token, self.name)
+            for attribute, value in cached.items():
+                setattr(self, attribute, value)
+            if cached:
+                logger.debug(f"Loaded {', '.join(cached)} from the session cache")
+
+        if not lazy:
+            self.bootstrap()
+            logger.info(
+                f"Authenticated as {self.user.name} against {self.host} using API version {self.version}"
+            )
+
+    def __getattr__(self, name):
+        # Only called if the attribute hasn't been fetched yet
+        if name in self.BOOTSTRAP_ATTRIBUTES:
+            self.bootstrap(name)
+            return self.__dict__[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
 
-        self.user = self._auth()
-        self.version = self.get_version()
-        self.rootFolder = self.detail_folder(self.user.rootFolderId)
-        self.folders = self.list_folders()
+    def bootstrap(self, *names):
+        """Fetch the session attributes which are not known yet
 
-        logger.info(
-            f"Authenticated as {self.user.name} against {self.host} using API version {self.version}"
-        )
+        Attributes depending on each other are fetched in stages, the requests
+        of one stage are sent concurrently.
+
+        :param names: the attributes to be fetched (default: all session attributes)
+        :type names: str
+        :raises AuthenticationError: if the user couldn't be found
+        :raises FossologyApiError: if a REST call failed
+        """
+        fetchers = {
+            "user": self._auth,
+            "version": self.get_version,
+            "rootFolder": lambda: self._get_folder(self.user.rootFolderId),
+            "folders": lambda: FolderIndex(
+                self._list_folders(), self.user.rootFolderId
+            ),
+            "capabilities": lambda: Capabilities(self.version),
+        }
+        with self._bootstrap_lock:
+            needed = set(names or self.BOOTSTRAP_ATTRIBUTES)
+            for name in list(needed):
+                needed.update(self.BOOTSTRAP_ATTRIBUTES[name])
+            needed = {name for name in needed if name not in self.__dict__}
+            fetched = dict()
+            while needed:
+                stage = [
+                    name
+                    for name in needed
+                    if not needed.intersection(self.BOOTSTRAP_ATTRIBUTES[name])
+                ]
+                if len(stage) == 1:
+                    values = [fetchers[stage[0]]()]
+                else:
+                    with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                        futures = [executor.submit(fetchers[name]) for name in stage]
+                        values = [future.result() for future in futures]
+                for name, value in zip(stage, values):
+                    setattr(self, name, value)
+                    fetched[name] = value
+                needed.difference_update(stage)
+            if fetched and self.session_cache:
+                self.session_cache.store(self.host, self.token, self.name, fetched)
+
+    def invalidate_cache(self):
+        """Remove the session attributes of this session from the session cache
+
+        The attributes already known by the current object are kept.
+        """
+        if self.session_cache:
+            self.session_cache.invalidate(self.host, self.token, self.name)
 
     def _auth(self):
         """Perform the first API request and populate user variables
@@ -181,8 +334,7 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         self.users = self.list_users()
         for user in self.users:
             if user.name == self.name:
-                self.user = user
-                return self.user
+                return user
         description = f"User {self.name} was not found on {self.host}"
         raise AuthenticationError(description)
 
@@ -200,7 +352,7 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         """
         response = self.session.get(f"{self.api}/version")
         if response.status_code == 200:
-            return response.json()["version"]
+            return response_json(response)["version"]
         else:
             description = "Error while getting API version"
             raise FossologyApiError(description, response)
@@ -219,7 +371,7 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         response = self.session.get(f"{self.api}/users/{user_id}")
         if response.status_code == 200:
             user_agents = None
-            user_details = response.json()
+            user_details = response_json(response)
             if user_details.get("agents"):
                 user_agents = Agents.from_json(user_details["agents"])
             user = User.from_json(user_details)
@@ -241,7 +393,7 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         response = self.session.get(f"{self.api}/users")
         if response.status_code == 200:
             users_list = list()
-            for user in response.json():
+            for user in response_json(response):
                 if user.get("name") == "Default User":
                     continue
                 if user.get("email"):
@@ -308,9 +460,94 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         :type group: string
         :return: list of items corresponding to the search criteria
         :rtype: JSON
+        :raises FossologyUnsupported: if the search can't be limited to an upload by the server
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if upload:
+            self.capabilities.require("search_upload", "/search with upload")
+        headers = search_headers(
+            searchType,
+            upload,
+            filename,
+            tag,
+            filesizemin,
+            filesizemax,
+            license,
+            copyright,
+            group,
+        )
+        search_result, _ = self._search_page(headers)
+        return search_result
+
+    def iter_search(
+        self,
+        searchType: SearchTypes = SearchTypes.ALLFILES,
+        upload: Upload = None,
+        filename: str = None,
+        tag: str = None,
+        filesizemin: int = None,
+        filesizemax: int = None,
+        license: str = None,
+        copyright: str = None,
+        group: str = None,
+        page_size: int = 100,
+        prefetch: int = 4,
+    ):
+        """Iterate over the items found by a search, page after page
+
+        API Endpoint: GET /search
+
+        The total number of pages is read from the first response, the following pages
+        are fetched concurrently while the items are yielded in order. At most
+        ``prefetch`` pages of at most ``page_size`` items are held in memory.
+
+        If the server doesn't paginate the search results, all items are read from the
+        first response.
+
+        :Example:
+
+        >>> for item in foss.iter_search(license="GPL-2.0", page_size=500):
+        >>>     print(item.filename, item.upload.uploadname)
+
+        :param searchType: Limit search to: directory, allfiles (default), containers
+        :param upload: Limit search to a specific upload
+        :param filename: Filename to find, can contain % as wild-card
+        :param tag: tag to find
+        :param filesizemin: Min filesize in bytes
+        :param filesizemax: Max filesize in bytes
+        :param license: License search filter
+        :param copyright: Copyright search filter
+        :param group: the group name to choose while performing search (default: None)
+        :param page_size: the number of items per page, larger values are reduced to 1000 (default: 100)
+        :param prefetch: the maximum number of pages fetched in advance (default: 4)
+        :type searchType: one of SearchTypes Enum
+        :type upload: Upload
+        :type filename: string
+        :type tag: string
+        :type filesizemin: int
+        :type filesizemax: int
+        :type license: string
+        :type copyright: string
+        :type group: string
+        :type page_size: int
+        :type prefetch: int
+        :return: the items corresponding to the search criteria
+        :rtype: generator of SearchResult
+        :raises FossologyUnsupported: if the search can't be limited to an upload by the server
+        :raises ValueError: if the page size isn't positive
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
+        if upload:
+            self.capabilities.require("search_upload", "/search with upload")
+        if page_size <= 0:
+            raise ValueError(f"Search page size must be positive, got {page_size}")
+        if page_size > SEARCH_MAX_PAGE_SIZE:
+            logger.warning(
+                f"Search page size {page_size} too large, using {SEARCH_MAX_PAGE_SIZE}"
+            )
+            page_size = SEARCH_MAX_PAGE_SIZE
         headers = search_headers(
             searchType,
             upload,
@@ -322,13 +559,39 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
             copyright,
             group,
         )
+
+        def fetch_page(page):
+            search_result, total_pages = self._search_page(headers, page_size, page)
+            return [SearchResult.from_json(item) for item in search_result], total_pages
+
+        # Servers which don't paginate the search results return all items at once
+        yield from concurrency.iter_pages(
+            fetch_page, page_size, workers=prefetch, paginated=False
+        )
+
+    def _search_page(self, headers, page_size=None, page=None):
+        """Get one page of search results and the total number of pages
+
+        Internal function meant to be called by search() or iter_search()
+
+        API Endpoint: GET /search
+
+        :return: the items of the page and the total number of pages (None if unknown)
+        :rtype: tuple(JSON, int)
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if page_size:
+            headers = {**headers, "limit": str(page_size), "page": str(page)}
         response = self.session.get(f"{self.api}/search", headers=headers)
 
         if response.status_code == 200:
-            return response.json()
+            return response_json(response), response_total_pages(response)
 
         elif response.status_code == 403:
-            description = f"Searching {get_options(group)}not authorized"
+            description = (
+                f"Searching {get_options(headers.get('groupName'))}not authorized"
+            )
             raise AuthorizationError(description, response)
 
         else:
@@ -353,26 +616,143 @@ class Fossology(Folders, Groups, LicenseEndpoint, Uploads, Jobs, Report):
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
-        if versiontuple(self.version) <= versiontuple("1.0.16"):
-            description = f"Endpoint /filesearch is not supported by your Fossology API version {self.version}"
-            raise FossologyUnsupported(description)
+        all_files = []
+        for hash_file in self._filesearch_chunk(filelist, group):
+            if hash_file.get("findings"):
+                all_files.append(File.from_json(hash_file))
+            else:
+                return "Unable to get a result with the given filesearch criteria"
+        return all_files
+
+    def filesearch_batch(
+        self,
+        filelist: List,
+        chunk_size: int = 500,
+        workers: int = 4,
+        group: str = None,
+        index=None,
+    ) -> Dict:
+        """Search for many files from hash sums
+
+        API Endpoint: POST /filesearch
+
+        The list is split in chunks of ``chunk_size`` hashes which are searched concurrently.
+        Contrary to :func:`filesearch`, a file unknown to the server doesn't interrupt the
+        search, its result is None.
+
+        Hash sums are compared case-insensitively: a file listed several times with
+        different cases is only searched once, and its result is returned for each of
+        the hash sums as given.
 
-        headers = {}
+        :Example:
+
+        >>> results = foss.filesearch_batch([{"sha1": sha1} for sha1 in sbom_hashes])
+        >>> unknown = [sha1 for sha1, file in results.items() if file is None]
+        >>>
+        >>> # Keep the results in a local index shared by the next searches
+        >>> from fossology.cache import FilesearchIndex
+        >>> results = foss.filesearch_batch(sbom_hashes, index=FilesearchIndex())
+
+        :param filelist: the files hashes to search for, either hash sum dictionaries like
+                         {"sha1": "..."} or SHA1 strings
+        :param chunk_size: the maximum number of hashes sent in one request (default: 500)
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param group: the group name to choose while performing search (default: None)
+        :param index: local index of the results, only the hashes missing in the index or
+                      expired are searched on the server (default: None)
+        :type filelist: list of dict or string
+        :type chunk_size: int
+        :type workers: int
+        :type group: string
+        :type index: FilesearchIndex
+        :return: the file found for each searched hash sum, None if it is unknown
+        :rtype: dict of File
+        :raises FossologyApiError: if a REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        searched = dict()
+        keys = dict()
+        for entry in filelist:
+            if isinstance(entry, str):
+                entry = {"sha1": entry}
+            key = filesearch_key(entry)
+            keys.setdefault(filesearch_hash(entry)[1], key)
+            searched.setdefault(key, entry)
+
+        results = dict.fromkeys(searched)
+        entries = list(searched.values())
+        if index:
+            entries = self._filesearch_cached(index, entries, results, group)
+        chunks = [
+            entries[offset : offset + chunk_size]
+            for offset in range(0, len(entries), chunk_size)
+        ]
+        for chunk, hash_files in zip(
+            chunks,
+            concurrency.prefetch(
+                lambda chunk: self._filesearch_chunk(chunk, group), chunks, workers
+            ),
+        ):
+            matches = match_filesearch_results(chunk, hash_files)
+            if index:
+                index.store(
+                    self.host,
+                    [
+                        (filesearch_key(entry), hash_file)
+                        for entry, hash_file in matches
+                    ],
+                    group,
+                )
+            for entry, hash_file in matches:
+                if hash_file.get("findings"):
+                    results[filesearch_key(entry)] = File.from_json(hash_file)
+        return {value: results[key] for value, key in keys.items()}
+
+    def _filesearch_cached(self, index, entries, results, group=None):
+        """Fill the results of the entries found in a filesearch index
+
+        :param results: the results by key of the entries, see :func:`filesearch_key`
+        :return: the entries which need to be searched on the server
+        :rtype: list
+        """
+        keys = [filesearch_key(entry) for entry in entries]
+        cached = index.lookup(self.host, keys, group)
+        pending = list()
+        for entry, key in zip(entries, keys):
+            if key not in cached:
+                pending.append(entry)
+                continue
+            hash_file = cached[key]
+            if hash_file.get("findings"):
+                results[key] = File.from_json(hash_file)
+        logger.debug(f"{len(entries) - len(pending)} filesearch results found in index")
+        return pending
+
+    def _filesearch_chunk(self, filelist, group=None):
+        """Search for files from hash sum
+
+        Internal function meant to be called by filesearch() or filesearch_batch()
+
+        API Endpoint: POST /filesearch
+
+        :return: the search result of each file, in the order of the list
+        :rtype: list of JSON
+        :raises FossologyUnsupported: if the endpoint isn't supported by the server
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        self.capabilities.require("filesearch", "/filesearch")
+
+        headers = {"Content-Type": "application/json"}
         if group:
             headers["groupName"] = group
 
         response = self.session.post(
-            f"{self.api}/filesearch", headers=headers, json=filelist
+            f"{self.api}/filesearch", headers=headers, data=dumps(filelist)
         )
 
         if response.status_code == 200:
-            all_files = []
-            for hash_file in response.json():
-                if hash_file.get("findings"):
-                    all_files.append(File.from_json(hash_file))
-                else:
-                    return "Unable to get a result with the given filesearch criteria"
-            return all_files
+            return response_json(response)
 
         elif response.status_code == 403:
             description = f"Searching {get_options(group)}not authorized"
@@ -0,0 +1,1627 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import re
+from collections import deque
+from typing import Dict, List, Tuple
+
+from tenacity import TryAgain, retry, retry_if_exception_type, stop_after_attempt
+
+from fossology import (
+    SEARCH_MAX_PAGE_SIZE,
+    Fossology,
+    filesearch_hash,
+    filesearch_key,
+    match_filesearch_results,
+    search_headers,
+)
+from fossology.capabilities import Capabilities
+from fossology.codec import dumps, response_json, response_total_pages
+from fossology.concurrency import BatchResult
+from fossology.exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    FossologyApiError,
+)
+from fossology.folders import FolderIndex, split_folder_path
+from fossology.jobs import JOB_FINISHED_STATUSES, next_poll_interval
+from fossology.obj import (
+    Agents,
+    File,
+    Folder,
+    Group,
+    Job,
+    License,
+    Licenses,
+    ReportFormat,
+    SearchResult,
+    SearchTypes,
+    Summary,
+    Upload,
+    User,
+    get_options,
+)
+from fossology.store import LicenseStore
+from fossology.streaming import MultipartFile, aiter_json_array
+from fossology.uploads import file_hashes
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+async def _aiter_chunks(body):
+    # httpx only streams asynchronous iterables from an AsyncClient
+    for chunk in body:
+        yield chunk
+
+
+async def _aiter_pages(fetch_page, page_size, prefetch=4, paginated=True):  # noqa: C901
+    """Fetch the pages of a paginated listing and yield their items in order
+
+    Asynchronous equivalent of :func:`fossology.concurrency.iter_pages`: once the
+    total number of pages is known, at most ``prefetch`` pages are requested in advance.
+    """
+    items, total_pages = await fetch_page(1)
+    for item in items:
+        yield item
+
+    if total_pages is None:
+        page = 1
+        while paginated and len(items) == page_size:
+            page += 1
+            items, _ = await fetch_page(page)
+            for item in items:
+                yield item
+        return
+
+    pages = iter(range(2, total_pages + 1))
+    pending = deque()
+    try:
+        for page in pages:
+            pending.append(asyncio.ensure_future(fetch_page(page)))
+            if len(pending) == prefetch:
+                break
+        while pending:
+            items, _ = await pending.popleft()
+            for page in pages:
+                pending.append(asyncio.ensure_future(fetch_page(page)))
+                break
+            for item in items:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _run_batch(function, items):
+    """Await a coroutine for each item concurrently, isolating the errors
+
+    Asynchronous equivalent of :func:`fossology.concurrency.run_batch`.
+
+    :rtype: list of BatchResult
+    """
+    items = list(items)
+    values = await asyncio.gather(
+        *[function(item) for item in items], return_exceptions=True
+    )
+    results = list()
+    for item, value in zip(items, values):
+        if isinstance(value, Exception):
+            logger.debug(f"Batch operation failed for {item}: {value}")
+            results.append(BatchResult(item, error=value))
+        else:
+            results.append(BatchResult(item, result=value))
+    return results
+
+
+class AsyncFossology:
+
+    """Asynchronous Fossology API class
+
+    Native asyncio client sending its requests with an ``httpx.AsyncClient``, install
+    it with the ``aio`` extra: ``pip install fossology[aio]``. Hundreds of requests can
+    be in flight from a single event loop, they share a pool of at most
+    ``max_connections`` connections to the server. Models and exceptions are the
+    same as the ones used by :class:`~fossology.Fossology`.
+
+    The endpoint methods are coroutines taking the same arguments as the methods of
+    the same name of :class:`~fossology.Fossology`, see their documentation. The
+    listings ``iter_uploads``, ``iter_jobs``, ``iter_search`` and
+    ``iter_upload_licenses`` are asynchronous generators.
+
+    The batch helpers of the synchronous client running worker threads (``bulk_*``,
+    ``upload_summaries``, ``fan_out_groups``, ``walk_uploads``, ``job_waiter``...)
+    are not provided: gather the coroutines instead, the connection pool bounds the
+    number of concurrent requests.
+
+    The session attributes ``user``, ``version``, ``rootFolder``, ``folders`` and
+    ``capabilities`` are fetched when the session is opened.
+
+    :Example:
+
+    >>> import asyncio
+    >>> from fossology.aio import AsyncFossology
+    >>>
+    >>> async def main():
+    >>>     async with AsyncFossology(FOSS_URL, FOSS_TOKEN, username) as foss:
+    >>>         uploads = await asyncio.gather(
+    >>>             *[foss.detail_upload(upload_id) for upload_id in range(1, 100)]
+    >>>         )
+    >>>
+    >>> asyncio.get_event_loop().run_until_complete(main())
+
+    :param url: URL of the Fossology instance
+    :param token: The API token generated using the Fossology UI
+    :param name: The name of the token owner
+    :param max_connections: the maximum number of connections to the server (default: 10)
+    :param license_cache: cache of the licenses returned by detail_license() (default: None)
+    :param kwargs: further arguments passed to ``httpx.AsyncClient``, e.g. ``verify`` or
+                   ``transport``, requests don't time out by default
+    :type url: str
+    :type token: str
+    :type name: str
+    :type max_connections: int
+    :type license_cache: LicenseCache
+    :type kwargs: key word argument
+    :raises ImportError: if httpx isn't installed
+    """
+
+    BOOTSTRAP_ATTRIBUTES = Fossology.BOOTSTRAP_ATTRIBUTES
+
+    def __init__(
+        self, url, token, name, max_connections=10, license_cache=None, **kwargs
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncFossology requires httpx, install fossology[aio] to use it"
+            )
+        self.host = url
+        self.token = token
+        self.name = name
+        self.users = list()
+        self.license_cache = license_cache
+
+        self.api = f"{self.host}/api/v1"
+        options = {
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            # Like requests, wait for the server and for a free connection forever
+            "timeout": None,
+            **kwargs,
+        }
+        self.session = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.token}"}, **options
+        )
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        """Open the session with the Fossology server
+
+        :return: the opened client
+        :rtype: AsyncFossology
+        :raises AuthenticationError: if the user couldn't be found
+        :raises FossologyApiError: if a REST call failed
+        """
+        await self.bootstrap()
+        logger.info(
+            f"Authenticated as {self.user.name} against {self.host} using API version {self.version}"
+        )
+        return self
+
+    async def close(self):
+        """Close the connections to the Fossology server"""
+        await self.session.aclose()
+
+    async def bootstrap(self, *names):
+        """Fetch the session attributes which are not known yet
+
+        Attributes depending on each other are fetched in stages, the requests
+        of one stage are sent concurrently.
+
+        :param names: the attributes to be fetched (default: all session attributes)
+        :type names: str
+        :raises AuthenticationError: if the user couldn't be found
+        :raises FossologyApiError: if a REST call failed
+        """
+
+        async def root_folder():
+            return await self._get_folder(self.user.rootFolderId)
+
+        async def folders():
+            return FolderIndex(await self._list_folders(), self.user.rootFolderId)
+
+        async def capabilities():
+            return Capabilities(self.version)
+
+        fetchers = {
+            "user": self._auth,
+            "version": self.get_version,
+            "rootFolder": root_folder,
+            "folders": folders,
+            "capabilities": capabilities,
+        }
+        needed = set(names or self.BOOTSTRAP_ATTRIBUTES)
+        for name in list(needed):
+            needed.update(self.BOOTSTRAP_ATTRIBUTES[name])
+        needed = {name for name in needed if name not in self.__dict__}
+        while needed:
+            stage = [
+                name
+                for name in needed
+                if not needed.intersection(self.BOOTSTRAP_ATTRIBUTES[name])
+            ]
+            values = await asyncio.gather(*[fetchers[name]() for name in stage])
+            for name, value in zip(stage, values):
+                setattr(self, name, value)
+            needed.difference_update(stage)
+
+    async def _auth(self):
+        self.users = await self.list_users()
+        for user in self.users:
+            if user.name == self.name:
+                return user
+        description = f"User {self.name} was not found on {self.host}"
+        raise AuthenticationError(description)
+
+    async def get_version(self):
+        """Get API version from the server
+
+        API endpoint: GET /version
+
+        :return: the API version string
+        :rtype: string
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = await self.session.get(f"{self.api}/version")
+        if response.status_code == 200:
+            return response_json(response)["version"]
+        else:
+            description = "Error while getting API version"
+            raise FossologyApiError(description, response)
+
+    async def detail_user(self, user_id):
+        """Get details of Fossology user.
+
+        API Endpoint: GET /users/{id}
+
+        :rtype: User
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = await self.session.get(f"{self.api}/users/{user_id}")
+        if response.status_code == 200:
+            user_agents = None
+            user_details = response_json(response)
+            if user_details.get("agents"):
+                user_agents = Agents.from_json(user_details["agents"])
+            user = User.from_json(user_details)
+            user.agents = user_agents
+            return user
+        else:
+            description = f"Error while getting details for user {user_id}"
+            raise FossologyApiError(description, response)
+
+    async def list_users(self):
+        """List all users from the Fossology instance
+
+        API Endpoint: GET /users
+
+        :rtype: list of User
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = await self.session.get(f"{self.api}/users")
+        if response.status_code == 200:
+            users_list = list()
+            for user in response_json(response):
+                if user.get("name") == "Default User":
+                    continue
+                if user.get("email"):
+                    foss_user = User.from_json(user)
+                    agents = user.get("agents")
+                    if agents:
+                        foss_user.agents = Agents.from_json(agents)
+                    users_list.append(foss_user)
+            return users_list
+        else:
+            description = f"Unable to get a list of users from {self.host}"
+            raise FossologyApiError(description, response)
+
+    async def delete_user(self, user):
+        """Delete a Fossology user.
+
+        API Endpoint: DELETE /users/{id}
+
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = await self.session.delete(f"{self.api}/users/{user.id}")
+        if response.status_code == 202:
+            return
+        else:
+            description = f"Error while deleting user {user.name} ({user.id})"
+            raise FossologyApiError(description, response)
+
+    # Folders
+
+    async def list_folders(self):
+        """List all folders accessible to the authenticated user
+
+        API Endpoint: GET /folders
+
+        As with :func:`~fossology.folders.Folders.list_folders`, the parent of every
+        folder listed is set to the root folder of the user.
+
+        :rtype: list of Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        folders_list = await self._list_folders()
+        for folder in folders_list:
+            folder.parent = self.rootFolder.id
+        return folders_list
+
+    async def _list_folders(self):
+        response = await self.session.get(f"{self.api}/folders")
+        if response.status_code == 200:
+            return [Folder.from_json(folder) for folder in response_json(response)]
+        else:
+            description = f"Unable to get a list of folders for {self.user.name}"
+            raise FossologyApiError(description, response)
+
+    async def detail_folder(self, folder_id):
+        """Get details of folder and update the index of the folders
+
+        API Endpoint: GET /folders/{id}
+
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        detailled_folder = await self._get_folder(folder_id)
+        self.folders.add(detailled_folder)
+        return detailled_folder
+
+    async def _get_folder(self, folder_id):
+        response = await self.session.get(f"{self.api}/folders/{folder_id}")
+        if response.status_code == 200:
+            return Folder.from_json(response_json(response))
+        else:
+            description = f"Error while getting details for folder {folder_id}"
+            raise FossologyApiError(description, response)
+
+    async def refresh_folders(self):
+        """Reload the index of the folders from the server
+
+        API Endpoint: GET /folders
+
+        :rtype: FolderIndex
+        :raises FossologyApiError: if the REST call failed
+        """
+        self.folders.reset(await self._list_folders(), self.user.rootFolderId)
+        return self.folders
+
+    async def get_folder_by_path(self, path, refresh=True):
+        """Get a folder by path, see :func:`~fossology.folders.Folders.get_folder_by_path`
+
+        :return: the folder, None if it doesn't exist
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        folder = self.folders.get_by_path(path)
+        if folder is None and refresh:
+            folder = (await self.refresh_folders()).get_by_path(path)
+        return folder
+
+    async def ensure_folder_path(self, path, description=None, group=None):
+        """Get a folder by path, creating the missing folders like ``mkdir -p``
+
+        See :func:`~fossology.folders.Folders.ensure_folder_path`.
+
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user is not allowed to write in the folder or access the group
+        """
+        folder = self.folders.get(self.folders.root) or self.rootFolder
+        names = split_folder_path(path)
+        while names:
+            child = self.folders.get_child(folder, names[0])
+            if child is None:
+                break
+            folder = child
+            names.pop(0)
+        for name in names:
+            parent = folder
+            folder = await self.create_folder(parent, name, description, group)
+            if folder is None:
+                message = f"Unable to find folder {name} under {parent}"
+                raise FossologyApiError(message)
+        return folder
+
+    async def create_folder(self, parent, name, description=None, group=None):
+        """Create a new (sub)folder
+
+        API Endpoint: POST /folders/{id}
+
+        :return: the folder newly created (or already existing) - or None
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user is not allowed to write in the folder or access the group
+        """
+        headers = {
+            "parentFolder": f"{parent.id}",
+            "folderName": f"{name}",
+            "folderDescription": description or "",
+        }
+        if group:
+            headers["groupName"] = group
+
+        response = await self.session.post(f"{self.api}/folders", headers=headers)
+
+        if response.status_code == 200:
+            logger.info(f"Folder '{name}' already exists")
+            folder = self.folders.get_child(parent.id, name)
+            if folder is None:
+                folder = (await self.refresh_folders()).get_child(parent.id, name)
+            if folder is None:
+                logger.error(
+                    "Folder exists but was not found in the user's folder list"
+                )
+            return folder
+
+        elif response.status_code == 201:
+            logger.info(f"Folder {name} has been created")
+            folder = Folder(
+                int(response_json(response)["message"]),
+                name,
+                headers["folderDescription"],
+                parent.id,
+            )
+            self.folders.add(folder)
+            return folder
+
+        elif response.status_code == 403:
+            description = f"Folder creation {get_options(group, parent)}not authorized"
+            raise AuthorizationError(description, response)
+        else:
+            description = f"Unable to create folder {name} under {parent}"
+            raise FossologyApiError(description, response)
+
+    async def update_folder(self, folder, name=None, description=None):
+        """Update a folder's name or description
+
+        API Endpoint: PATCH /folders/{id}
+
+        :return: the updated folder
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        headers = dict()
+        if name:
+            headers["name"] = name
+        if description:
+            headers["description"] = description
+
+        response = await self.session.patch(
+            f"{self.api}/folders/{folder.id}", headers=headers
+        )
+        if response.status_code == 200:
+            folder = await self.detail_folder(folder.id)
+            logger.info(f"{folder} has been updated")
+            return folder
+        else:
+            description = f"Unable to update folder {folder.id}"
+            raise FossologyApiError(description, response)
+
+    async def delete_folder(self, folder):
+        """Delete a folder
+
+        API Endpoint: DELETE /folders/{id}
+
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = await self.session.delete(f"{self.api}/folders/{folder.id}")
+        if response.status_code == 202:
+            logger.info(f"Folder {folder.id} has been scheduled for deletion")
+            self.folders.discard(folder)
+        else:
+            description = f"Unable to delete folder {folder.id}"
+            raise FossologyApiError(description, response)
+
+    async def copy_folder(self, folder, parent):
+        """Copy a folder
+
+        API Endpoint: PUT /folders/{id}
+
+        :return: the updated folder
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        return await self._put_folder("copy", folder, parent)
+
+    async def move_folder(self, folder, parent):
+        """Move a folder
+
+        API Endpoint: PUT /folders/{id}
+
+        :return: the updated folder
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        return await self._put_folder("move", folder, parent)
+
+    async def _put_folder(self, action, folder, parent):
+        headers = {"parent": str(parent.id), "action": action}
+        response = await self.session.put(
+            f"{self.api}/folders/{folder.id}", headers=headers
+        )
+        if response.status_code == 202:
+            logger.info(f"Folder {folder.name} has been {action}d to {parent.name}")
+            if action == "copy":
+                # The ids of the copied folders are unknown
+                await self.refresh_folders()
+            return await self.detail_folder(folder.id)
+        else:
+            description = f"Unable to {action} folder {folder.name} to {parent.name}"
+            raise FossologyApiError(description, response)
+
+    # Groups and licenses
+
+    async def list_groups(self) -> List:
+        """Get the list of groups (accessible groups for user, all groups for admin)
+
+        API Endpoint: GET /groups
+
+        :rtype: list of Group
+        :raises FossologyUnsupported: if the endpoint isn't supported by the server
+        :raises FossologyApiError: if the REST call failed
+        """
+        self.capabilities.require("groups", "/groups")
+
+        response = await self.session.get(f"{self.api}/groups")
+        if response.status_code == 200:
+            return [Group.from_json(group) for group in response_json(response)]
+        else:
+            description = f"Unable to get a list of groups for {self.user.name}"
+            raise FossologyApiError(description, response)
+
+    async def create_group(self, name):
+        """Create a group
+
+        API Endpoint: POST /groups
+
+        :raises FossologyUnsupported: if the endpoint isn't supported by the server
+        :raises FossologyApiError: if the REST call failed
+        """
+        self.capabilities.require("groups", "/groups")
+
+        headers = {"name": f"{name}"}
+        response = await self.session.post(f"{self.api}/groups", headers=headers)
+        if response.status_code == 200:
+            logger.info(f"Group '{name}' has been added")
+            return
+        else:
+            description = f"Group {name} already exists, failed to create group or no group name provided"
+            raise FossologyApiError(description, response)
+
+    async def detail_license(self, name) -> License:
+        """Get a license from the DB, cached licenses are returned without any request
+
+        API Endpoint: GET /license
+
+        :rtype: License
+        :raises FossologyUnsupported: if the endpoint isn't supported by the server
+        :raises FossologyApiError: if the REST call failed
+        """
+        if self.license_cache is not None:
+            license = self.license_cache.get(self.host, name)
+            if license:
+                return license
+
+        self.capabilities.require("license", "/license")
+
+        headers = {"shortName": f"{name}"}
+        response = await self.session.get(f"{self.api}/license", headers=headers)
+        if response.status_code == 200:
+            license = License.from_json(response_json(response))
+            if self.license_cache is not None:
+                self.license_cache.put(self.host, name, license)
+            return license
+        else:
+            description = f"Unable to get license {name}"
+            raise FossologyApiError(description, response)
+
+    async def detail_licenses(self, names):
+        """Get many licenses concurrently
+
+        Each license is only requested once, see
+        :func:`~fossology.license.LicenseEndpoint.detail_licenses`.
+
+        :return: the result of each license by short name, with the License as result
+        :rtype: dict of BatchResult
+        """
+        names = list(dict.fromkeys(names))
+        results = await _run_batch(self.detail_license, names)
+        if self.license_cache is not None:
+            self.license_cache.save()
+        return {result.item: result for result in results}
+
+    # Uploads
+
+    # Retry until the unpack agent is finished
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(10))
+    async def detail_upload(
+        self, upload_id: int, group: str = None, wait_time: int = 0
+    ) -> Upload:
+        """Get detailled information about an upload, waiting until it is ready
+
+        API Endpoint: GET /uploads/{id}
+
+        See :func:`~fossology.uploads.Uploads.detail_upload`.
+
+        :rtype: Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        upload, retry_after = await self._get_upload(upload_id, group)
+        if upload:
+            return upload
+        await asyncio.sleep(int(wait_time or retry_after))
+        raise TryAgain
+
+    async def _get_upload(self, upload_id, group=None):
+        headers = {}
+        if group:
+            headers["groupName"] = group
+        response = await self.session.get(
+            f"{self.api}/uploads/{upload_id}", headers=headers
+        )
+
+        if response.status_code == 200:
+            logger.debug(f"Got details for upload {upload_id}")
+            return Upload.from_json(response_json(response)), 0
+
+        elif response.status_code == 403:
+            description = f"Getting details for upload {upload_id} {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        elif response.status_code == 503:
+            retry_after = int(response.headers.get("Retry-After", 1))
+            logger.debug(
+                f"Upload {upload_id} is not ready, retry after {retry_after} seconds: {response_json(response)['message']}"
+            )
+            return None, retry_after
+
+        else:
+            description = f"Error while getting details for upload {upload_id}"
+            raise FossologyApiError(description, response)
+
+    async def upload_file(  # noqa: C901
+        self,
+        folder,
+        file=None,
+        vcs=None,
+        url=None,
+        server=None,
+        description=None,
+        access_level=None,
+        ignore_scm=False,
+        group=None,
+        wait_time=0,
+        progress=None,
+        dedupe=False,
+    ):
+        """Upload a package to FOSSology and wait until it is ready
+
+        API Endpoint: POST /uploads
+
+        See :func:`~fossology.uploads.Uploads.upload_file`. To upload many packages,
+        gather the coroutines: the uploads are unpacked by the server concurrently.
+
+        :rtype: Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if file and dedupe:
+            existing_uploads = await self.find_uploads_by_hash(
+                file_hashes(file, algorithms=("sha1",)),
+                folder=folder,
+                group=group,
+                recursive=False,
+            )
+            if existing_uploads:
+                logger.info(
+                    f"{file} has already been uploaded as {existing_uploads[0]}, skipping"
+                )
+                return existing_uploads[0]
+
+        headers = {"folderId": str(folder.id)}
+        if description:
+            headers["uploadDescription"] = description
+        if access_level:
+            headers["public"] = access_level.value
+        if ignore_scm:
+            headers["ignoreScm"] = "false"
+        if group:
+            headers["groupName"] = group
+
+        if file:
+            headers["uploadType"] = "server"
+            with MultipartFile("fileInput", file, callback=progress) as body:
+                headers["Content-Type"] = body.content_type
+                headers["Content-Length"] = str(len(body))
+                response = await self.session.post(
+                    f"{self.api}/uploads", content=_aiter_chunks(body), headers=headers
+                )
+        elif vcs or url or server:
+            if vcs:
+                headers["uploadType"] = "vcs"
+                data = dumps(vcs)
+            elif url:
+                headers["uploadType"] = "url"
+                data = dumps(url)
+            elif server:
+                headers["uploadType"] = "server"
+                data = dumps(server)
+            headers["Content-Type"] = "application/json"
+            response = await self.session.post(
+                f"{self.api}/uploads", content=data, headers=headers
+            )
+        else:
+            logger.info(
+                "Neither VCS, or Url or filename option given, not uploading anything"
+            )
+            return
+
+        if file:
+            source = f"{file}"
+        elif vcs:
+            source = vcs.get("vcsName")
+        elif url:
+            source = url.get("name")
+        elif server:
+            source = server.get("name")
+
+        if response.status_code == 201:
+            try:
+                upload = await self.detail_upload(
+                    response_json(response)["message"], group=group, wait_time=wait_time
+                )
+                logger.info(
+                    f"Upload {upload.uploadname} has been uploaded on {upload.uploaddate}"
+                )
+                return upload
+            except TryAgain:
+                description = f"Upload of {source} failed"
+                raise FossologyApiError(description, response)
+
+        elif response.status_code == 403:
+            description = (
+                f"Upload of {source} {get_options(group, folder)}not authorized"
+            )
+            raise AuthorizationError(description, response)
+
+        elif server and response.status_code == 500:
+            description = (
+                f"Upload {description} could not be performed; "
+                f"did you add a prefix for '{server['path']}' in Fossology config "
+                f"variable 'Admin->Customize->Whitelist for serverupload'? "
+                f"Has fossy user read access to {server['path']}?"
+            )
+            raise FossologyApiError(description, response)
+
+        else:
+            description = f"Upload {description} could not be performed"
+            raise FossologyApiError(description, response)
+
+    async def find_uploads_by_hash(
+        self, file_hash, folder=None, group=None, recursive=True
+    ):
+        """Find the uploads of a file with the given hash sums
+
+        See :func:`~fossology.uploads.Uploads.find_uploads_by_hash`.
+
+        :rtype: list of Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if self.capabilities.filesearch:
+            known_files = await self.filesearch_batch([file_hash.sha1], group=group)
+            if known_files[file_hash.sha1] is None:
+                logger.debug(f"File with SHA1 {file_hash.sha1} is unknown")
+                return []
+
+        sha1 = file_hash.sha1.upper()
+        uploads_list = list()
+        upload_hash = self.capabilities.upload_hash
+        async for upload in self.iter_uploads(
+            folder=folder, group=group, recursive=recursive
+        ):
+            if upload_hash:
+                upload_sha1, upload_size = upload.hash.sha1, upload.hash.size
+            else:
+                upload_sha1, upload_size = upload.filesha1, upload.filesize
+            if not upload_sha1 or upload_sha1.upper() != sha1:
+                continue
+            if upload_size and int(upload_size) != file_hash.size:
+                continue
+            uploads_list.append(upload)
+        return uploads_list
+
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
+    async def upload_summary(self, upload, group=None):
+        """Get clearing information about an upload
+
+        API Endpoint: GET /uploads/{id}/summary
+
+        :rtype: Summary
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        headers = {}
+        if group:
+            headers["groupName"] = group
+        response = await self.session.get(
+            f"{self.api}/uploads/{upload.id}/summary", headers=headers
+        )
+
+        if response.status_code == 200:
+            return Summary.from_json(response_json(response))
+
+        elif response.status_code == 403:
+            description = f"Getting summary of upload {upload.id} {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        elif response.status_code == 503:
+            logger.debug(
+                f"Unpack agent for {upload.uploadname} (id={upload.id}) didn't start yet"
+            )
+            await asyncio.sleep(3)
+            raise TryAgain
+
+        else:
+            description = f"No summary for upload {upload.uploadname} (id={upload.id})"
+            raise FossologyApiError(description, response)
+
+    async def upload_licenses(
+        self, upload, group: str = None, agent=None, containers=False, compact=False
+    ):
+        """Get clearing information about an upload
+
+        API Endpoint: GET /uploads/{id}/licenses
+
+        :return: the list of licenses findings for the specified agent
+        :rtype: list of Licenses or LicenseStore
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        findings = [
+            file_licenses
+            async for file_licenses in self.iter_upload_licenses(
+                upload, group, agent, containers
+            )
+        ]
+        if compact:
+            return LicenseStore(findings)
+        return findings
+
+    async def iter_upload_licenses(
+        self, upload, group: str = None, agent=None, containers=False, chunk_size=65536
+    ):
+        """Iterate over the license findings of an upload, one file at a time
+
+        API Endpoint: GET /uploads/{id}/licenses
+
+        The response is decoded while it is received, see
+        :func:`~fossology.uploads.Uploads.iter_upload_licenses`.
+
+        :rtype: asynchronous generator of Licenses
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        response = await self._get_licenses_response(upload, group, agent, containers)
+        try:
+            async for file_with_findings in aiter_json_array(
+                response.aiter_bytes(chunk_size), response.encoding or "utf-8"
+            ):
+                yield Licenses.from_json(file_with_findings)
+        except json.JSONDecodeError as error:
+            description = f"Invalid licenses for upload {upload.uploadname} (id={upload.id}): {error}"
+            raise FossologyApiError(description)
+        finally:
+            await response.aclose()
+
+    # Retry until the unpack agent is finished
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
+    async def _get_licenses_response(
+        self, upload, group=None, agent=None, containers=False
+    ):
+        headers = {}
+        params = {}
+        if group:
+            headers["groupName"] = group
+        if agent:
+            params["agent"] = agent
+        else:
+            params["agent"] = agent = "nomos"
+        if containers:
+            params["containers"] = "true"
+
+        request = self.session.build_request(
+            "GET",
+            f"{self.api}/uploads/{upload.id}/licenses",
+            params=params,
+            headers=headers,
+        )
+        response = await self.session.send(request, stream=True)
+        if response.status_code == 200:
+            return response
+
+        # The body of the errors is read for the exception message
+        await response.aread()
+        await response.aclose()
+        if response.status_code == 403:
+            description = f"Getting license for upload {upload.id} {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        elif response.status_code == 412:
+            description = f"Unable to get licenses from {agent} for {upload.uploadname} (id={upload.id})"
+            raise FossologyApiError(description, response)
+
+        elif response.status_code == 503:
+            logger.debug(
+                f"Unpack agent for {upload.uploadname} (id={upload.id}) didn't start yet"
+            )
+            await asyncio.sleep(3)
+            raise TryAgain
+
+        else:
+            description = f"No licenses for upload {upload.uploadname} (id={upload.id})"
+            raise FossologyApiError(description, response)
+
+    async def delete_upload(self, upload, group=None):
+        """Delete an upload
+
+        API Endpoint: DELETE /uploads/{id}
+
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        headers = {}
+        if group:
+            headers["groupName"] = group
+        response = await self.session.delete(
+            f"{self.api}/uploads/{upload.id}", headers=headers
+        )
+
+        if response.status_code == 202:
+            logger.info(f"Upload {upload.id} has been scheduled for deletion")
+
+        elif response.status_code == 403:
+            description = (
+                f"Deleting upload {upload.id} {get_options(group)}not authorized"
+            )
+            raise AuthorizationError(description, response)
+
+        else:
+            description = f"Unable to delete upload {upload.id}"
+            raise FossologyApiError(description, response)
+
+    async def move_upload(self, upload, folder, group=None):
+        """Move an upload to another folder
+
+        API Endpoint: PATCH /uploads/{id}
+
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group or folder
+        """
+        headers = {"folderId": str(folder.id)}
+        if group:
+            headers["groupName"] = group
+        response = await self.session.patch(
+            f"{self.api}/uploads/{upload.id}", headers=headers
+        )
+
+        if response.status_code == 202:
+            logger.info(f"Upload {upload.uploadname} has been moved to {folder.name}")
+
+        elif response.status_code == 403:
+            description = (
+                f"Moving upload {upload.id} {get_options(group, folder)}not authorized"
+            )
+            raise AuthorizationError(description, response)
+
+        else:
+            description = f"Unable to move upload {upload.uploadname} to {folder.name}"
+            raise FossologyApiError(description, response)
+
+    async def copy_upload(self, upload, folder):
+        """Copy an upload in another folder
+
+        API Endpoint: PUT /uploads/{id}
+
+        :raises FossologyApiError: if the REST call failed
+        """
+        headers = {"folderId": str(folder.id)}
+        response = await self.session.put(
+            f"{self.api}/uploads/{upload.id}", headers=headers
+        )
+
+        if response.status_code == 202:
+            logger.info(f"Upload {upload.uploadname} has been copied to {folder.name}")
+
+        elif response.status_code == 403:
+            description = f"Copy upload {upload.id} {get_options(folder)}not authorized"
+            raise AuthorizationError(description, response)
+
+        else:
+            description = f"Unable to copy upload {upload.uploadname} to {folder.name}"
+            raise FossologyApiError(description, response)
+
+    async def list_uploads(
+        self, folder=None, group=None, recursive=True, page_size=20, page=1
+    ):
+        """Get one page of the uploads available to the registered user
+
+        API Endpoint: GET /uploads
+
+        :rtype: list of Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        uploads_list, total_pages = await self._list_uploads_page(
+            folder, group, recursive, page_size, page
+        )
+        logger.info(
+            f"Retrieved page {page} of uploads, {total_pages or 'Unknown'} pages are in total available"
+        )
+        return uploads_list
+
+    async def _list_uploads_page(self, folder, group, recursive, page_size, page):
+        params = {}
+        headers = {"limit": str(page_size), "page": str(page)}
+        if group:
+            headers["groupName"] = group
+        if folder:
+            params["folderId"] = folder.id
+        if not recursive:
+            params["recursive"] = "false"
+
+        response = await self.session.get(
+            f"{self.api}/uploads", headers=headers, params=params
+        )
+
+        if response.status_code == 200:
+            uploads_list = [
+                Upload.from_json(upload) for upload in response_json(response)
+            ]
+            return uploads_list, response_total_pages(response)
+
+        elif response.status_code == 403:
+            description = (
+                f"Retrieving list of uploads {get_options(group, folder)}not authorized"
+            )
+            raise AuthorizationError(description, response)
+
+        else:
+            description = "Unable to retrieve the list of uploads"
+            raise FossologyApiError(description, response)
+
+    async def iter_uploads(
+        self, folder=None, group=None, recursive=True, page_size=100, prefetch=4
+    ):
+        """Iterate over all uploads available to the registered user
+
+        API Endpoint: GET /uploads
+
+        At most ``prefetch`` pages are requested in advance, see
+        :func:`~fossology.uploads.Uploads.iter_uploads`.
+
+        :rtype: asynchronous generator of Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+
+        def fetch_page(page):
+            return self._list_uploads_page(folder, group, recursive, page_size, page)
+
+        async for upload in _aiter_pages(fetch_page, page_size, prefetch):
+            yield upload
+
+    # Jobs
+
+    async def list_jobs(self, page_size=20, page=1, upload=None):
+        """Get one page of the available jobs
+
+        API Endpoint: GET /jobs
+
+        :rtype: list of Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        upload_id = upload.id if upload else None
+        jobs_list, _ = await self._list_jobs_page(page_size, page, upload_id)
+        return jobs_list
+
+    async def _list_jobs_page(self, page_size, page, upload_id):
+        params = {}
+        headers = {"limit": str(page_size), "page": str(page)}
+        if upload_id is not None:
+            params["upload"] = upload_id
+        response = await self.session.get(
+            f"{self.api}/jobs", params=params, headers=headers
+        )
+        if response.status_code == 200:
+            jobs_list = [Job.from_json(job) for job in response_json(response)]
+            return jobs_list, response_total_pages(response)
+        else:
+            description = "Getting the list of jobs failed"
+            raise FossologyApiError(description, response)
+
+    async def iter_jobs(self, upload=None, page_size=100, prefetch=4):
+        """Iterate over all available jobs
+
+        API Endpoint: GET /jobs
+
+        :rtype: asynchronous generator of Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        upload_id = upload.id if upload else None
+
+        def fetch_page(page):
+            return self._list_jobs_page(page_size, page, upload_id)
+
+        async for job in _aiter_pages(fetch_page, page_size, prefetch):
+            yield job
+
+    async def list_jobs_since(self, job_id, upload=None, page_size=20):
+        """Get the jobs which are newer than a given job, newest first
+
+        API Endpoint: GET /jobs
+
+        See :func:`~fossology.jobs.Jobs.list_jobs_since`.
+
+        :rtype: list of Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        upload_id = upload.id if upload else None
+        new_jobs = list()
+        page = 1
+        while True:
+            jobs_list, total_pages = await self._list_jobs_page(
+                page_size, page, upload_id
+            )
+            for job in jobs_list:
+                if int(job.id) <= job_id:
+                    return new_jobs
+                new_jobs.append(job)
+            if len(jobs_list) < page_size or (total_pages and page >= total_pages):
+                return new_jobs
+            page += 1
+
+    async def detail_job(self, job_id, wait=False, timeout=30):
+        """Get detailled information about a job
+
+        API Endpoint: GET /jobs/{id}
+
+        If ``wait`` is True, the job is polled until it is finished or ``timeout``
+        seconds elapsed, see :func:`~fossology.jobs.Jobs.detail_job`.
+
+        :return: the job data (the last known data if the job didn't finish in time)
+        :rtype: Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        job = await self._get_job(job_id)
+        if not wait:
+            return job
+        return await self._wait_job(job, timeout)
+
+    async def _get_job(self, job_id):
+        response = await self.session.get(f"{self.api}/jobs/{job_id}")
+        if response.status_code == 200:
+            logger.debug(f"Got details for job {job_id}")
+            return Job.from_json(response_json(response))
+        else:
+            description = f"Error while getting details for job {job_id}"
+            raise FossologyApiError(description, response)
+
+    async def _wait_job(self, job, timeout=None):
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        interval = 0
+        while job.status not in JOB_FINISHED_STATUSES:
+            interval = next_poll_interval(interval, job.eta)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.debug(f"Job {job.id} didn't finish within {timeout} seconds")
+                    return job
+                interval = min(interval, remaining)
+            logger.debug(f"Waiting {interval} seconds for job {job.id} to complete")
+            await asyncio.sleep(interval)
+            job = await self._get_job(job.id)
+
+        logger.debug(f"Job {job.id} has finished with status {job.status}")
+        return job
+
+    async def wait_for_jobs(self, jobs, timeout=None, callback=None):
+        """Wait until all given jobs are finished
+
+        Each job is polled with its own interval, see :func:`detail_job`.
+
+        :param jobs: the jobs (or job ids) to wait for
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :param callback: function called with each Job as soon as it is finished, not called for the jobs still running when the timeout expires (default: None)
+        :type jobs: list of Job or int
+        :type timeout: int
+        :type callback: callable
+        :return: the jobs data, in the order of the given jobs, the last known data for the jobs still running when the timeout expires
+        :rtype: list of Job
+        :raises FossologyApiError: if a REST call failed
+        """
+
+        async def wait(job):
+            if not isinstance(job, Job):
+                job = await self._get_job(job)
+            job = await self._wait_job(job, timeout)
+            if callback and job.status in JOB_FINISHED_STATUSES:
+                callback(job)
+            return job
+
+        return list(await asyncio.gather(*[wait(job) for job in jobs]))
+
+    async def schedule_jobs(
+        self, folder, upload, spec, group=None, wait=False, timeout=30
+    ):
+        """Schedule jobs for a specific upload
+
+        API Endpoint: POST /jobs
+
+        See :func:`~fossology.jobs.Jobs.schedule_jobs` for the job specification.
+
+        :rtype: Job
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        headers = {
+            "folderId": str(folder.id),
+            "uploadId": str(upload.id),
+            "Content-Type": "application/json",
+        }
+        if group:
+            headers["groupName"] = group
+
+        response = await self.session.post(
+            f"{self.api}/jobs", headers=headers, content=dumps(spec)
+        )
+
+        if response.status_code == 201:
+            return await self.detail_job(
+                response_json(response)["message"], wait=wait, timeout=timeout
+            )
+
+        elif response.status_code == 403:
+            description = f"Scheduling job {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        else:
+            description = f"Scheduling jobs for upload {upload.uploadname} failed"
+            raise FossologyApiError(description, response)
+
+    # Reports
+
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
+    async def generate_report(
+        self, upload: Upload, report_format: ReportFormat = None, group: str = None
+    ):
+        """Generate a report for a given upload
+
+        API Endpoint: GET /report
+
+        :return: the report id
+        :rtype: int
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        headers = {"uploadId": str(upload.id)}
+        if report_format:
+            headers["reportFormat"] = report_format.value
+        else:
+            headers["reportFormat"] = "readmeoss"
+        if group:
+            headers["groupName"] = group
+
+        response = await self.session.get(f"{self.api}/report", headers=headers)
+
+        if response.status_code == 201:
+            report_id = re.search("[0-9]*$", response_json(response)["message"])
+            return report_id[0]
+
+        elif response.status_code == 403:
+            description = f"Generating report for upload {upload.id} {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        elif response.status_code == 503:
+            wait_time = response.headers["Retry-After"]
+            logger.debug(f"Retry generate report after {wait_time} seconds")
+            await asyncio.sleep(int(wait_time))
+            raise TryAgain
+
+        else:
+            description = f"Report generation for upload {upload.uploadname} failed"
+            raise FossologyApiError(description, response)
+
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
+    async def download_report(
+        self, report_id: int, group: str = None
+    ) -> Tuple[str, str]:
+        """Download a report
+
+        API Endpoint: GET /report/{id}
+
+        :return: the report content and the report name
+        :rtype: Tuple[str, str]
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        :raises TryAgain: if the report generation timed out after 3 retries
+        """
+        headers = dict()
+        if group:
+            headers["groupName"] = group
+
+        response = await self.session.get(
+            f"{self.api}/report/{report_id}", headers=headers
+        )
+        if response.status_code == 200:
+            content = response.headers["Content-Disposition"]
+            report_name_pattern = '(^attachment; filename=")(.*)("$)'
+            report_name = re.match(report_name_pattern, content).group(2)
+            return response.text, report_name
+        elif response.status_code == 403:
+            description = (
+                f"Getting report {report_id} {get_options(group)}not authorized"
+            )
+            raise AuthorizationError(description, response)
+        elif response.status_code == 503:
+            wait_time = response.headers["Retry-After"]
+            logger.debug(f"Retry get report after {wait_time} seconds")
+            await asyncio.sleep(int(wait_time))
+            raise TryAgain
+        else:
+            description = f"Download of report {report_id} failed"
+            raise FossologyApiError(description, response)
+
+    # Search
+
+    async def search(
+        self,
+        searchType: SearchTypes = SearchTypes.ALLFILES,
+        upload: Upload = None,
+        filename: str = None,
+        tag: str = None,
+        filesizemin: int = None,
+        filesizemax: int = None,
+        license: str = None,
+        copyright: str = None,
+        group: str = None,
+    ):
+        """Search for a specific file
+
+        API Endpoint: GET /search
+
+        :return: list of items corresponding to the search criteria
+        :rtype: JSON
+        :raises FossologyUnsupported: if the search can't be limited to an upload by the server
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if upload:
+            self.capabilities.require("search_upload", "/search with upload")
+        headers = search_headers(
+            searchType,
+            upload,
+            filename,
+            tag,
+            filesizemin,
+            filesizemax,
+            license,
+            copyright,
+            group,
+        )
+        search_result, _ = await self._search_page(headers)
+        return search_result
+
+    async def iter_search(
+        self,
+        searchType: SearchTypes = SearchTypes.ALLFILES,
+        upload: Upload = None,
+        filename: str = None,
+        tag: str = None,
+        filesizemin: int = None,
+        filesizemax: int = None,
+        license: str = None,
+        copyright: str = None,
+        group: str = None,
+        page_size: int = 100,
+        prefetch: int = 4,
+    ):
+        """Iterate over the items found by a search, page after page
+
+        API Endpoint: GET /search
+
+        See :func:`~fossology.Fossology.iter_search`.
+
+        :rtype: asynchronous generator of SearchResult
+        :raises FossologyUnsupported: if the search can't be limited to an upload by the server
+        :raises ValueError: if the page size isn't positive
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if upload:
+            self.capabilities.require("search_upload", "/search with upload")
+        if page_size <= 0:
+            raise ValueError(f"Search page size must be positive, got {page_size}")
+        if page_size > SEARCH_MAX_PAGE_SIZE:
+            logger.warning(
+                f"Search page size {page_size} too large, using {SEARCH_MAX_PAGE_SIZE}"
+            )
+            page_size = SEARCH_MAX_PAGE_SIZE
+        headers = search_headers(
+            searchType,
+            upload,
+            filename,
+            tag,
+            filesizemin,
+            filesizemax,
+            license,
+            copyright,
+            group,
+        )
+
+        async def fetch_page(page):
+            search_result, total_pages = await self._search_page(
+                headers, page_size, page
+            )
+            return [SearchResult.from_json(item) for item in search_result], total_pages
+
+        # Servers which don't paginate the search results return all items at once
+        async for item in _aiter_pages(
+            fetch_page, page_size, prefetch, paginated=False
+        ):
+            yield item
+
+    async def _search_page(self, headers, page_size=None, page=None):
+        # httpx only accepts strings as header values
+        headers = {key: str(value) for key, value in headers.items()}
+        if page_size:
+            headers.update(limit=str(page_size), page=str(page))
+        response = await self.session.get(f"{self.api}/search", headers=headers)
+
+        if response.status_code == 200:
+            return response_json(response), response_total_pages(response)
+
+        elif response.status_code == 403:
+            description = (
+                f"Searching {get_options(headers.get('groupName'))}not authorized"
+            )
+            raise AuthorizationError(description, response)
+
+        else:
+            description = "Unable to get a result with the given search criteria"
+            raise FossologyApiError(description, response)
+
+    async def filesearch(
+        self, filelist: List = [], group: str = None,
+    ):
+        """Search for files from hash sum
+
+        API Endpoint: POST /filesearch
+
+        :return: list of items corresponding to the search criteria
+        :rtype: list of File
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        all_files = []
+        for hash_file in await self._filesearch_chunk(filelist, group):
+            if hash_file.get("findings"):
+                all_files.append(File.from_json(hash_file))
+            else:
+                return "Unable to get a result with the given filesearch criteria"
+        return all_files
+
+    async def filesearch_batch(
+        self, filelist: List, chunk_size: int = 500, group: str = None, index=None,
+    ) -> Dict:
+        """Search for many files from hash sums
+
+        API Endpoint: POST /filesearch
+
+        The chunks of ``chunk_size`` hashes are searched concurrently, see
+        :func:`~fossology.Fossology.filesearch_batch`.
+
+        :return: the file found for each searched hash sum, None if it is unknown
+        :rtype: dict of File
+        :raises FossologyApiError: if a REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        searched = dict()
+        keys = dict()
+        for entry in filelist:
+            if isinstance(entry, str):
+                entry = {"sha1": entry}
+            key = filesearch_key(entry)
+            keys.setdefault(filesearch_hash(entry)[1], key)
+            searched.setdefault(key, entry)
+
+        results = dict.fromkeys(searched)
+        entries = list(searched.values())
+        if index:
+            entries = self._filesearch_cached(index, entries, results, group)
+        chunks = [
+            entries[offset : offset + chunk_size]
+            for offset in range(0, len(entries), chunk_size)
+        ]
+        chunks_files = await asyncio.gather(
+            *[self._filesearch_chunk(chunk, group) for chunk in chunks]
+        )
+        for chunk, hash_files in zip(chunks, chunks_files):
+            matches = match_filesearch_results(chunk, hash_files)
+            if index:
+                index.store(
+                    self.host,
+                    [
+                        (filesearch_key(entry), hash_file)
+                        for entry, hash_file in matches
+                    ],
+                    group,
+                )
+            for entry, hash_file in matches:
+                if hash_file.get("findings"):
+                    results[filesearch_key(entry)] = File.from_json(hash_file)
+        return {value: results[key] for value, key in keys.items()}
+
+    def _filesearch_cached(self, index, entries, results, group=None):
+        keys = [filesearch_key(entry) for entry in entries]
+        cached = index.lookup(self.host, keys, group)
+        pending = list()
+        for entry, key in zip(entries, keys):
+            if key not in cached:
+                pending.append(entry)
+                continue
+            hash_file = cached[key]
+            if hash_file.get("findings"):
+                results[key] = File.from_json(hash_file)
+        logger.debug(f"{len(entries) - len(pending)} filesearch results found in index")
+        return pending
+
+    async def _filesearch_chunk(self, filelist, group=None):
+        self.capabilities.require("filesearch", "/filesearch")
+
+        headers = {"Content-Type": "application/json"}
+        if group:
+            headers["groupName"] = group
+
+        response = await self.session.post(
+            f"{self.api}/filesearch", headers=headers, content=dumps(filelist)
+        )
+
+        if response.status_code == 200:
+            return response_json(response)
+
+        elif response.status_code == 403:
+            description = f"Searching {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        else:
+            description = "Unable to get a result with the given filesearch criteria"
+            raise FossologyApiError(description, response)
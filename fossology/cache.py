@@ -0,0 +1,349 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from fossology.capabilities import Capabilities
+from fossology.codec import dumps, loads
+from fossology.folders import FolderIndex
+from fossology.obj import Agents, Folder, User
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def _load_user(user_dict):
+    user = User.from_json(user_dict)
+    if user.agents:
+        user.agents = Agents.from_json(user.agents)
+    return user
+
+
+def _dump_folders(folders):
+    return {"root": folders.root, "folders": [folder.to_dict() for folder in folders]}
+
+
+def _load_folders(folders_dict):
+    # The root folder of the user isn't necessarily a top-level folder
+    folders = (Folder.from_json(folder) for folder in folders_dict["folders"])
+    return FolderIndex(folders, folders_dict["root"])
+
+
+# Serializers and deserializers of the cached session attributes
+SESSION_ATTRIBUTES = {
+    "version": (lambda version: version, lambda version: version),
+    "capabilities": (lambda capabilities: capabilities.version, Capabilities),
+    "user": (lambda user: user.to_dict(), _load_user),
+    "rootFolder": (lambda folder: folder.to_dict(), Folder.from_json),
+    "folders": (_dump_folders, _load_folders),
+}
+
+
+def cache_directory():
+    """Get the default directory of the caches: $XDG_CACHE_HOME/fossology or ~/.cache/fossology"""
+    cache_home = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(cache_home, "fossology")
+
+
+class SessionCache:
+
+    """On-disk cache of the session attributes
+
+    Stores the data gathered during the initialization of a :class:`~fossology.Fossology`
+    session (API version, authenticated user, root folder and folder list), so that
+    short-lived processes don't need to fetch them from the server each time.
+
+    Entries are keyed by host, user name and a hash of the API token, the token itself
+    is never written to disk. The index of the folders is written again each time the
+    session creates, changes or deletes a folder, so that the sessions sharing the cache
+    don't use outdated folders.
+
+    :Example:
+
+    >>> from fossology import Fossology
+    >>> from fossology.cache import SessionCache
+    >>> cache = SessionCache(ttl=600)
+    >>> foss = Fossology(FOSS_URL, FOSS_TOKEN, username, session_cache=cache)
+    >>> # Force the next session to fetch fresh data from the server
+    >>> foss.invalidate_cache()
+
+    :param directory: the directory where entries are stored (default: ~/.cache/fossology)
+    :param ttl: the number of seconds after which a cached attribute expires (default: 3600)
+    :type directory: str
+    :type ttl: int
+    """
+
+    def __init__(self, directory=None, ttl=3600):
+        self.directory = directory or cache_directory()
+        self.ttl = ttl
+
+    def _path(self, host, token, name):
+        key = hashlib.sha256(f"{host}\n{name}\n{token}".encode()).hexdigest()
+        return os.path.join(self.directory, f"session-{key}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as fp:
+                return loads(fp.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable session cache {path}: {error}")
+            return {}
+
+    def load(self, host, token, name):
+        """Get the cached session attributes which didn't expire yet
+
+        :param host: the URL of the Fossology instance
+        :param token: the API token of the session
+        :param name: the name of the token owner
+        :type host: str
+        :type token: str
+        :type name: str
+        :return: the session attributes found in the cache
+        :rtype: dict
+        """
+        entries = self._read(self._path(host, token, name))
+        now = time.time()
+        attributes = dict()
+        for attribute, entry in entries.items():
+            if attribute not in SESSION_ATTRIBUTES:
+                continue
+            if now - entry.get("timestamp", 0) > self.ttl:
+                logger.debug(f"Cached session attribute {attribute} has expired")
+                continue
+            _, deserialize = SESSION_ATTRIBUTES[attribute]
+            try:
+                attributes[attribute] = deserialize(entry["value"])
+            except (KeyError, TypeError) as error:
+                logger.warning(f"Ignoring invalid cached {attribute}: {error}")
+        return attributes
+
+    def store(self, host, token, name, attributes):
+        """Add or refresh session attributes in the cache
+
+        :param host: the URL of the Fossology instance
+        :param token: the API token of the session
+        :param name: the name of the token owner
+        :param attributes: the session attributes to be cached
+        :type host: str
+        :type token: str
+        :type name: str
+        :type attributes: dict
+        """
+        path = self._path(host, token, name)
+        entries = self._read(path)
+        now = time.time()
+        for attribute, value in attributes.items():
+            serialize, _ = SESSION_ATTRIBUTES[attribute]
+            entries[attribute] = {"timestamp": now, "value": serialize(value)}
+
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, delete=False, suffix=".tmp"
+        ) as fp:
+            fp.write(dumps(entries))
+        os.replace(fp.name, path)
+
+    def invalidate(self, host, token, name):
+        """Remove the cached session attributes of a session
+
+        :param host: the URL of the Fossology instance
+        :param token: the API token of the session
+        :param name: the name of the token owner
+        :type host: str
+        :type token: str
+        :type name: str
+        """
+        try:
+            os.remove(self._path(host, token, name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Remove all the cached sessions"""
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if filename.startswith("session-") and filename.endswith(".json"):
+                os.remove(os.path.join(self.directory, filename))
+
+
+class FilesearchIndex:
+
+    """Persistent local index of filesearch results
+
+    Stores the results of :func:`~fossology.Fossology.filesearch_batch` by hash sum in a
+    SQLite database, so that hashes already searched are not sent to the server again.
+    The database uses write-ahead logging and can be shared by concurrent processes.
+
+    Results are scoped by server and group. Files with concluded licenses are kept for
+    ``ttl`` seconds. Files which are not cleared yet or unknown to the server may change
+    sooner, they are kept for ``pending_ttl`` seconds only.
+
+    :Example:
+
+    >>> from fossology.cache import FilesearchIndex
+    >>> index = FilesearchIndex(ttl=7 * 24 * 3600)
+    >>> results = foss.filesearch_batch(sbom_hashes, index=index)
+    >>> # Files cleared on the server in the meantime
+    >>> index.invalidate(foss.host, [("sha1", sha1) for sha1 in cleared_hashes])
+
+    :param path: the path of the database (default: ~/.cache/fossology/filesearch.sqlite)
+    :param ttl: the number of seconds after which the results of cleared files expire (default: 1 day)
+    :param pending_ttl: the number of seconds after which the other results expire (default: 1 hour)
+    :param timeout: the number of seconds to wait for a lock held by another process (default: 30)
+    :type path: str
+    :type ttl: int
+    :type pending_ttl: int
+    :type timeout: int
+    """
+
+    # Maximum number of hashes looked up in one query
+    QUERY_SIZE = 500
+
+    def __init__(self, path=None, ttl=86400, pending_ttl=3600, timeout=30):
+        if not path:
+            path = os.path.join(cache_directory(), "filesearch.sqlite")
+        self.path = path
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "server TEXT NOT NULL, grp TEXT NOT NULL, algorithm TEXT NOT NULL, "
+                "hash TEXT NOT NULL, result TEXT NOT NULL, expires REAL NOT NULL, "
+                "PRIMARY KEY (server, grp, algorithm, hash))"
+            )
+
+    def _connection(self):
+        # SQLite connections can't be shared by threads nor inherited by forked processes
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _expiry(self, result, now):
+        findings = result.get("findings") or {}
+        if findings.get("conclusion"):
+            return now + self.ttl
+        return now + self.pending_ttl
+
+    def lookup(self, server, hashes, group=None):
+        """Get the results of the given hash sums which didn't expire yet
+
+        :param server: the URL of the Fossology instance
+        :param hashes: the hash algorithms and sums to be looked up, e.g. ("sha1", "DA39...")
+        :param group: the group the search was performed for (default: None)
+        :type server: str
+        :type hashes: list of tuple
+        :type group: str
+        :return: the filesearch result of each hash found, keyed by algorithm and upper case hash sum
+        :rtype: dict
+        """
+        by_algorithm = dict()
+        for algorithm, value in hashes:
+            by_algorithm.setdefault(algorithm, []).append(value.upper())
+        results = dict()
+        now = time.time()
+        connection = self._connection()
+        for algorithm, values in by_algorithm.items():
+            for offset in range(0, len(values), self.QUERY_SIZE):
+                chunk = values[offset : offset + self.QUERY_SIZE]
+                rows = connection.execute(
+                    "SELECT hash, result FROM files WHERE server = ? AND grp = ? "
+                    f"AND algorithm = ? AND hash IN ({', '.join('?' * len(chunk))}) "
+                    "AND expires > ?",
+                    [server, group or "", algorithm, *chunk, now],
+                )
+                for value, result in rows:
+                    results[(algorithm, value)] = loads(result)
+        return results
+
+    def store(self, server, results, group=None):
+        """Add or refresh filesearch results in the index
+
+        :param server: the URL of the Fossology instance
+        :param results: the hash algorithm and sum of each searched file and its result
+                        (a result without findings if the file is unknown)
+        :param group: the group the search was performed for (default: None)
+        :type server: str
+        :type results: list of tuple
+        :type group: str
+        """
+        now = time.time()
+        rows = [
+            (
+                server,
+                group or "",
+                algorithm,
+                value.upper(),
+                dumps(result),
+                self._expiry(result, now),
+            )
+            for (algorithm, value), result in results
+        ]
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def invalidate(self, server, hashes=None, group=None):
+        """Remove results from the index
+
+        :param server: the URL of the Fossology instance
+        :param hashes: the hash algorithms and sums to be removed (default: None, all results of the server)
+        :param group: the group the search was performed for (default: None, all groups if no hashes are given, no group otherwise)
+        :type server: str
+        :type hashes: list of tuple
+        :type group: str
+        """
+        with self._connection() as connection:
+            if hashes is None and group is None:
+                connection.execute("DELETE FROM files WHERE server = ?", (server,))
+                return
+            if hashes is None:
+                connection.execute(
+                    "DELETE FROM files WHERE server = ? AND grp = ?", (server, group),
+                )
+                return
+            connection.executemany(
+                "DELETE FROM files WHERE server = ? AND grp = ? AND algorithm = ? AND hash = ?",
+                [
+                    (server, group or "", algorithm, value.upper())
+                    for algorithm, value in hashes
+                ],
+            )
+
+    def purge(self):
+        """Remove the expired results from the index"""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM files WHERE expires <= ?", (time.time(),))
+
+    def clear(self):
+        """Remove all results from the index"""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM files")
+
+    def close(self):
+        """Close the connection of the current thread to the database"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
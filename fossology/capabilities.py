@@ -0,0 +1,84 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import logging
+
+from fossology.exceptions import FossologyUnsupported
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def versiontuple(v):
+    return tuple(map(int, (v.split("."))))
+
+
+class Capabilities:
+
+    """Features supported by a Fossology server
+
+    The capabilities are derived once from the API version of the server and exposed by
+    ``foss.capabilities``, so that tools can choose a supported code path up front.
+
+    :Example:
+
+    >>> if foss.capabilities.filesearch:
+    >>>     results = foss.filesearch_batch(hashes)
+    >>> else:
+    >>>     results = {sha1: foss.find_uploads_by_hash(sha1) for sha1 in hashes}
+
+    :param version: the API version of the server
+    :type version: str
+    :ivar filesearch: the endpoint /filesearch is supported, files are searched in batches
+    :ivar upload_hash: the hash sums of uploads are provided
+    :ivar search_upload: searches can be limited to one upload
+    :ivar license: the endpoint /license is supported
+    :ivar groups: the endpoint /groups is supported
+    :vartype filesearch: bool
+    :vartype upload_hash: bool
+    :vartype search_upload: bool
+    :vartype license: bool
+    :vartype groups: bool
+    """
+
+    # Minimal API version of each feature
+    FEATURES = {
+        "filesearch": "1.0.17",
+        "upload_hash": "1.0.17",
+        "search_upload": "1.0.17",
+        "license": "1.1.3",
+        "groups": "1.2.1",
+    }
+
+    __slots__ = ("version",) + tuple(FEATURES)
+
+    def __init__(self, version):
+        self.version = version
+        parsed = versiontuple(version)
+        for feature, minimal_version in self.FEATURES.items():
+            setattr(self, feature, parsed >= versiontuple(minimal_version))
+
+    def __str__(self):
+        supported = [feature for feature in self.FEATURES if getattr(self, feature)]
+        return f"Capabilities of API version {self.version}: {', '.join(supported)}"
+
+    def to_dict(self):
+        """Get a dictionary with the support of each feature
+
+        :return: whether each feature is supported, by feature name
+        :rtype: dict
+        """
+        return {feature: getattr(self, feature) for feature in self.FEATURES}
+
+    def require(self, feature, endpoint):
+        """Check that a feature is supported by the server
+
+        :param feature: the name of the feature
+        :param endpoint: the endpoint depending on the feature, used in the error message
+        :type feature: str
+        :type endpoint: str
+        :raises FossologyUnsupported: if the feature isn't supported
+        """
+        if not getattr(self, feature):
+            description = f"Endpoint {endpoint} is not supported by your Fossology API version {self.version}"
+            raise FossologyUnsupported(description)
@@ -0,0 +1,139 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class JSONCodec:
+
+    """JSON encoder and decoder used for the request and response bodies
+
+    :param name: the name of the codec
+    :param loads: function decoding a JSON document given as str or bytes
+    :param dumps: function encoding an object as a JSON str
+    :type name: str
+    :type loads: callable
+    :type dumps: callable
+    """
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __str__(self):
+        return f"JSON codec {self.name}"
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj).decode()
+
+
+STDLIB_CODEC = JSONCodec("json", json.loads, json.dumps)
+ORJSON_CODEC = JSONCodec("orjson", orjson.loads, _orjson_dumps) if orjson else None
+CODECS = {codec.name: codec for codec in (STDLIB_CODEC, ORJSON_CODEC) if codec}
+
+# The fastest codec available is used by default
+_codec = ORJSON_CODEC or STDLIB_CODEC
+
+
+def get_codec():
+    """Get the JSON codec currently used
+
+    :return: the codec in use
+    :rtype: JSONCodec
+    """
+    return _codec
+
+
+def set_codec(codec):
+    """Select the JSON codec used for all request and response bodies
+
+    By default orjson is used if it is installed, the json module of the standard
+    library otherwise. Decoding errors are reported as
+    :class:`json.JSONDecodeError` whatever the codec.
+
+    :Example:
+
+    >>> from fossology import codec
+    >>> codec.set_codec("json")
+    >>> # Any implementation providing loads() and dumps() can be plugged in
+    >>> import simplejson
+    >>> codec.set_codec(codec.JSONCodec("simplejson", simplejson.loads, simplejson.dumps))
+
+    :param codec: the codec or the name of a built-in codec ("json" or "orjson")
+    :type codec: JSONCodec or str
+    :return: the previously used codec
+    :rtype: JSONCodec
+    :raises ValueError: if the built-in codec is unknown or not installed
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"JSON codec {codec} is not available")
+        codec = CODECS[codec]
+    previous, _codec = _codec, codec
+    logger.debug(f"Using {codec}")
+    return previous
+
+
+def loads(document):
+    """Decode a JSON document with the current codec
+
+    :param document: the JSON document
+    :type document: str or bytes
+    :return: the decoded object
+    :raises JSONDecodeError: if the document isn't valid JSON
+    """
+    try:
+        return _codec.loads(document)
+    except json.JSONDecodeError:
+        raise
+    except ValueError as error:
+        raise json.JSONDecodeError(str(error), str(document[:100]), 0) from error
+
+
+def dumps(obj):
+    """Encode an object as a JSON document with the current codec
+
+    :param obj: the object to be encoded
+    :return: the JSON document
+    :rtype: str
+    """
+    return _codec.dumps(obj)
+
+
+def response_json(response):
+    """Decode the JSON body of a response with the current codec
+
+    Used instead of ``response.json()``, the body is decoded from the raw bytes.
+
+    :param response: the response of a REST call
+    :type response: requests.Response
+    :return: the decoded body
+    :raises JSONDecodeError: if the body isn't valid JSON
+    """
+    return loads(response.content)
+
+
+def response_total_pages(response):
+    """Get the total number of pages announced by a paginated response
+
+    :param response: the response of a REST call
+    :type response: requests.Response
+    :return: the value of the ``X-TOTAL-PAGES`` header, None if the server didn't send it
+    :rtype: int
+    """
+    total_pages = response.headers.get("X-TOTAL-PAGES")
+    if total_pages is None:
+        return None
+    return int(total_pages)
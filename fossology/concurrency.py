@@ -0,0 +1,288 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from queue import Queue
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def prefetch(function, arguments, workers=4):
+    """Call a function for each argument concurrently and yield the results in order
+
+    At most ``workers`` calls are in flight at the same time, so that the number of
+    results held in memory is bounded whatever the number of arguments.
+
+    If the generator is closed before all results have been consumed, the calls which
+    didn't start yet are cancelled.
+
+    :param function: the function to be called with each argument
+    :param arguments: the arguments to call the function with
+    :param workers: the maximum number of concurrent calls (default: 4)
+    :type function: callable
+    :type arguments: iterable
+    :type workers: int
+    :return: the results of the function calls, in the order of the arguments
+    :rtype: generator
+    :raises Exception: the first exception raised by a call, in the order of the arguments
+    """
+    arguments = iter(arguments)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for argument in arguments:
+                pending.append(executor.submit(function, argument))
+                if len(pending) == workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for argument in arguments:
+                    pending.append(executor.submit(function, argument))
+                    break
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_pages(fetch_page, page_size, workers=4, paginated=True):
+    """Fetch the pages of a paginated listing and yield their items in order
+
+    The function returns the items of a page and the total number of pages, None if
+    the server didn't announce it. Once the total number of pages is read from the
+    first page, the following pages are fetched concurrently with :func:`prefetch`.
+
+    If the total number of pages is unknown, the pages are fetched one after the other
+    until a page isn't full. If ``paginated`` is False, the listing is then considered
+    not paginated by the server: the first page holds all items.
+
+    :param fetch_page: the function returning the items of a page and the total number of pages
+    :param page_size: the maximum number of items per page
+    :param workers: the maximum number of pages fetched in advance (default: 4)
+    :param paginated: fetch the next pages if the total number of pages is unknown (default: True)
+    :type fetch_page: callable
+    :type page_size: int
+    :type workers: int
+    :type paginated: boolean
+    :return: the items of all pages, in order
+    :rtype: generator
+    """
+    items, total_pages = fetch_page(1)
+    yield from items
+
+    if total_pages is None:
+        page = 1
+        while paginated and len(items) == page_size:
+            page += 1
+            items, _ = fetch_page(page)
+            yield from items
+        return
+
+    for items, _ in prefetch(fetch_page, range(2, total_pages + 1), workers):
+        yield from items
+
+
+def crawl(function, items, workers=4):
+    """Call a function for each item concurrently, the calls may add more items
+
+    The function returns a result and the items to be processed next, which are
+    scheduled as soon as a worker is free. The results are yielded as they arrive.
+
+    If the generator is closed before all results have been consumed, the calls which
+    didn't start yet are cancelled.
+
+    :param function: the function returning a tuple (result, further items) for an item
+    :param items: the items to start with
+    :param workers: the maximum number of concurrent calls (default: 4)
+    :type function: callable
+    :type items: iterable
+    :type workers: int
+    :return: the items and their results, in the order of completion
+    :rtype: generator of tuple(item, result)
+    :raises Exception: the first exception raised by a call
+    """
+    items = deque(items)
+    pending = dict()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while items or pending:
+                while items and len(pending) < workers:
+                    item = items.popleft()
+                    pending[executor.submit(function, item)] = item
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    result, further_items = future.result()
+                    items.extend(further_items)
+                    yield item, result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+_DONE = object()
+
+
+def interleave(function, items, workers=4, buffer_size=100):
+    """Consume the iterables returned by a function for each item concurrently
+
+    The values are yielded as soon as they are produced, whatever the item they come
+    from. At most ``buffer_size`` values are held in memory, the workers wait while the
+    buffer is full. An exception raised for one item doesn't abort the other items.
+
+    If the generator is closed before all values have been consumed, the iterables are
+    closed and the calls which didn't start yet are cancelled.
+
+    :param function: the function returning an iterable for an item
+    :param items: the items to call the function with
+    :param workers: the maximum number of iterables consumed concurrently (default: 4)
+    :param buffer_size: the maximum number of values waiting to be yielded (default: 100)
+    :type function: callable
+    :type items: iterable
+    :type workers: int
+    :type buffer_size: int
+    :return: a result for each value, and a result with the error for each failed item
+    :rtype: generator of BatchResult
+    """
+    queue = Queue(maxsize=buffer_size)
+    stop = threading.Event()
+
+    def produce(item):
+        iterable = ()
+        try:
+            iterable = function(item)
+            for value in iterable:
+                queue.put(BatchResult(item, result=value))
+                if stop.is_set():
+                    break
+        except Exception as error:
+            logger.debug(f"Batch operation failed for {item}: {error}")
+            queue.put(BatchResult(item, error=error))
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+            queue.put(_DONE)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(produce, item) for item in items]
+        pending = len(futures)
+        try:
+            while pending:
+                result = queue.get()
+                if result is _DONE:
+                    pending -= 1
+                else:
+                    yield result
+        finally:
+            stop.set()
+            pending -= sum(future.cancel() for future in futures)
+            # Unblock the running workers until they are finished
+            while pending > 0:
+                if queue.get() is _DONE:
+                    pending -= 1
+
+
+class BatchResult:
+
+    """Result of one item of a batch operation
+
+    :param item: the item the operation has been performed on
+    :param result: the value returned by the operation (default: None)
+    :param error: the exception raised by the operation (default: None)
+    :type item: any
+    :type result: any
+    :type error: Exception
+    """
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        """Whether the operation succeeded"""
+        return self.error is None
+
+    def __str__(self):
+        if self.ok:
+            return f"{self.item}: {self.result}"
+        return f"{self.item}: failed ({getattr(self.error, 'message', self.error)})"
+
+
+def run_batch(function, items, workers=4):
+    """Call a function for each item concurrently, isolating the errors
+
+    An exception raised for one item doesn't abort the other calls, it is stored
+    in the result of the item.
+
+    :param function: the function to be called with each item
+    :param items: the items to call the function with
+    :param workers: the maximum number of concurrent calls (default: 4)
+    :type function: callable
+    :type items: iterable
+    :type workers: int
+    :return: the results, in the order of the items
+    :rtype: list of BatchResult
+    """
+
+    def call(item):
+        try:
+            return BatchResult(item, result=function(item))
+        except Exception as error:
+            logger.debug(f"Batch operation failed for {item}: {error}")
+            return BatchResult(item, error=error)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(call, items))
+
+
+def poll_batch(check, results, timeout=None, workers=4, max_interval=30):
+    """Poll the items of a batch until the operations performed on them are completed
+
+    Only the successful results are polled, ``check`` is called concurrently for the
+    pending items. The polling interval starts at 1 second and doubles up to
+    ``max_interval``. An exception raised by ``check`` is stored in the result of
+    the item.
+
+    :param check: the function returning True once the operation on an item is completed
+    :param results: the results of the batch operation
+    :param timeout: stop polling after x seconds (default: None, poll forever)
+    :param workers: the maximum number of concurrent checks (default: 4)
+    :param max_interval: the maximal polling interval in seconds (default: 30)
+    :type check: callable
+    :type results: list of BatchResult
+    :type timeout: int
+    :type workers: int
+    :type max_interval: float
+    :return: the results of the items which weren't completed in time
+    :rtype: list of BatchResult
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = [result for result in results if result.ok]
+    interval = 0
+    while pending:
+        checks = run_batch(check, [result.item for result in pending], workers)
+        for result, checked in zip(pending, checks):
+            result.error = checked.error
+        pending = [
+            result
+            for result, checked in zip(pending, checks)
+            if checked.ok and not checked.result
+        ]
+        if not pending:
+            break
+        interval = min(max(interval * 2, 1), max_interval)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            interval = min(interval, remaining)
+        logger.debug(f"{len(pending)} operations pending, polling in {interval}s")
+        time.sleep(interval)
+    return pending
@@ -3,6 +3,8 @@
 
 from json.decoder import JSONDecodeError
 
+from fossology.codec import response_json
+
 
 class Error(Exception):
     """Base class for exceptions in this module."""
@@ -16,7 +18,7 @@ class AuthenticationError(Error):
     def __init__(self, description, response=None):
         if response:
             try:
-                message = response.json().get("message")
+                message = response_json(response).get("message")
             except JSONDecodeError:
                 message = response.text
             self.message = f"{description}: {message} ({response.status_code})"
@@ -29,7 +31,7 @@ class AuthorizationError(Error):
 
     def __init__(self, description, response):
         try:
-            message = response.json().get("message")
+            message = response_json(response).get("message")
         except JSONDecodeError:
             message = response.text
         self.message = f"{description}: {message} ({response.status_code})"
@@ -39,8 +41,11 @@ class FossologyApiError(Error):
     """Error during a Fossology request"""
 
     def __init__(self, description, response=None):
+        if response is None:
+            self.message = description
+            return
         try:
-            message = response.json().get("message")
+            message = response_json(response).get("message")
         except JSONDecodeError:
             message = response.text
         self.message = f"{description}: {message} ({response.status_code})"
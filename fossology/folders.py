@@ -2,7 +2,11 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+import threading
+from collections.abc import Sequence
 
+from fossology import concurrency
+from fossology.codec import response_json
 from fossology.exceptions import AuthorizationError, FossologyApiError
 from fossology.obj import Folder, get_options
 
@@ -10,6 +14,232 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+class FolderIndex(Sequence):
+
+    """Indexed cache of the folders known to the session
+
+    Folders are indexed by id and by parent and name, which gives constant time
+    lookups by path. Paths are relative to the root folder, e.g. "/Top/Product/1.2",
+    the root folder itself being "/".
+
+    The index can be used like the list of folders it replaces: it supports iteration,
+    ``len()``, indexing and slicing in insertion order, comparison with a list,
+    ``append()``, ``extend()`` and ``remove()``. Contrary to a list, a folder is only
+    stored once and removing a folder also removes its subfolders.
+
+    :Example:
+
+    >>> for folder, children in foss.folders.walk():
+    >>>     print(foss.folders.path(folder), len(children))
+
+    :param folders: the folders to be indexed (default: None)
+    :param root: the id of the root folder (default: None, the folder without parent)
+    :type folders: iterable of Folder
+    :type root: int
+    """
+
+    def __init__(self, folders=None, root=None):
+        self._lock = threading.RLock()
+        self.reset(folders or (), root)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._by_id.values()))
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __getitem__(self, index):
+        with self._lock:
+            return list(self._by_id.values())[index]
+
+    def __contains__(self, folder):
+        return getattr(folder, "id", folder) in self._by_id
+
+    def __eq__(self, other):
+        if isinstance(other, (FolderIndex, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __str__(self):
+        return f"Index of {len(self)} folders"
+
+    def reset(self, folders, root=None):
+        """Replace all folders of the index
+
+        :param folders: the folders to be indexed
+        :param root: the id of the root folder (default: None, the folder without parent)
+        :type folders: iterable of Folder
+        :type root: int
+        """
+        with self._lock:
+            self._by_id = dict()
+            self._children = dict()
+            self.root = root
+            for folder in folders:
+                self.add(folder)
+            if self.root is None:
+                self.root = next(
+                    (f.id for f in self._by_id.values() if f.parent is None), None
+                )
+
+    def add(self, folder):
+        """Add a folder to the index or update it
+
+        :param folder: the folder to be added or updated
+        :type folder: Folder
+        """
+        with self._lock:
+            self._unlink(folder.id)
+            self._by_id[folder.id] = folder
+            self._children.setdefault(folder.parent, dict())[folder.name] = folder.id
+
+    def append(self, folder):
+        """Add a folder to the index or update it, like :func:`add`
+
+        :param folder: the folder to be added or updated
+        :type folder: Folder
+        """
+        self.add(folder)
+
+    def extend(self, folders):
+        """Add several folders to the index or update them
+
+        :param folders: the folders to be added or updated
+        :type folders: iterable of Folder
+        """
+        with self._lock:
+            for folder in folders:
+                self.add(folder)
+
+    def remove(self, folder):
+        """Remove a folder and its subfolders from the index
+
+        :param folder: the folder (or its id) to be removed
+        :type folder: Folder or int
+        :raises ValueError: if the folder isn't in the index
+        """
+        with self._lock:
+            if folder not in self:
+                raise ValueError(f"Folder {folder} is not in the index")
+            self.discard(folder)
+
+    def discard(self, folder):
+        """Remove a folder and its subfolders from the index if it is present
+
+        :param folder: the folder (or its id) to be removed
+        :type folder: Folder or int
+        """
+        with self._lock:
+            folder_id = getattr(folder, "id", folder)
+            for child_id in list(self._children.get(folder_id, {}).values()):
+                self.discard(child_id)
+            self._children.pop(folder_id, None)
+            self._unlink(folder_id)
+            self._by_id.pop(folder_id, None)
+
+    def _unlink(self, folder_id):
+        previous = self._by_id.get(folder_id)
+        if previous is None:
+            return
+        siblings = self._children.get(previous.parent, {})
+        if siblings.get(previous.name) == folder_id:
+            del siblings[previous.name]
+
+    def get(self, folder_id):
+        """Get a folder by id
+
+        :param folder_id: the id of the folder
+        :type folder_id: int
+        :return: the folder, None if it isn't known
+        :rtype: Folder
+        """
+        return self._by_id.get(folder_id)
+
+    def get_child(self, parent, name):
+        """Get a folder by parent and name
+
+        :param parent: the parent folder (or its id)
+        :param name: the name of the folder
+        :type parent: Folder or int
+        :type name: str
+        :return: the folder, None if it isn't known
+        :rtype: Folder
+        """
+        children = self._children.get(getattr(parent, "id", parent), {})
+        return self._by_id.get(children.get(name))
+
+    def children(self, parent):
+        """Get the subfolders of a folder
+
+        :param parent: the parent folder (or its id)
+        :type parent: Folder or int
+        :return: the subfolders, sorted by name
+        :rtype: list of Folder
+        """
+        with self._lock:
+            children = self._children.get(getattr(parent, "id", parent), {})
+            return [self._by_id[children[name]] for name in sorted(children)]
+
+    def get_by_path(self, path):
+        """Get a folder by path
+
+        :param path: the path of the folder relative to the root folder, e.g. "/Top/Product"
+        :type path: str
+        :return: the folder, None if it isn't known
+        :rtype: Folder
+        """
+        folder = self._by_id.get(self.root)
+        for name in split_folder_path(path):
+            if folder is None:
+                break
+            folder = self.get_child(folder.id, name)
+        return folder
+
+    def path(self, folder):
+        """Get the path of a folder relative to the root folder
+
+        :param folder: the folder (or its id)
+        :type folder: Folder or int
+        :return: the path of the folder, None if a parent isn't known
+        :rtype: str
+        """
+        names = []
+        folder = self._by_id.get(getattr(folder, "id", folder))
+        while folder is not None and folder.id != self.root:
+            names.append(folder.name)
+            folder = self._by_id.get(folder.parent)
+        if folder is None:
+            return None
+        return "/" + "/".join(reversed(names))
+
+    def walk(self, top=None):
+        """Walk over the folder tree, top-down
+
+        For each folder, the folder and the list of its subfolders are yielded. As with
+        :func:`os.walk`, removing folders from the list prunes the walk.
+
+        :param top: the folder (or its id) the walk starts from (default: None, the root folder)
+        :type top: Folder or int
+        :return: the folders and their subfolders
+        :rtype: generator of tuple(Folder, list of Folder)
+        """
+        top = self._by_id.get(getattr(top, "id", top) if top else self.root)
+        if top is None:
+            return
+        stack = [top]
+        while stack:
+            folder = stack.pop()
+            children = self.children(folder)
+            yield folder, children
+            stack.extend(reversed(children))
+
+
+def split_folder_path(path):
+    """Split a folder path in folder names, ignoring empty segments"""
+    return [name for name in path.split("/") if name]
+
+
 class Folders:
     """Class dedicated to all "folders" related endpoints"""
 
@@ -18,6 +248,27 @@ class Folders:
 
         API Endpoint: GET /folders
 
+        As in previous versions, the parent of every folder listed is set to the root
+        folder of the user. The actual hierarchy is available from the index of the
+        folders ``foss.folders``, see :class:`FolderIndex`.
+
+        :return: a list of folders
+        :rtype: list()
+        :raises FossologyApiError: if the REST call failed
+        """
+        folders_list = self._list_folders()
+        for folder in folders_list:
+            folder.parent = self.rootFolder.id
+        return folders_list
+
+    def _list_folders(self):
+        """List all folders accessible to the authenticated user with their parent
+
+        Internal function meant to be called by list_folders() or to build the index
+        of the folders
+
+        API Endpoint: GET /folders
+
         :return: a list of folders
         :rtype: list()
         :raises FossologyApiError: if the REST call failed
@@ -25,11 +276,9 @@ class Folders:
         response = self.session.get(f"{self.api}/folders")
         if response.status_code == 200:
             folders_list = list()
-            response_list = response.json()
+            response_list = response_json(response)
             for folder in response_list:
-                sub_folder = Folder.from_json(folder)
-                sub_folder.parent = self.rootFolder.id
-                folders_list.append(sub_folder)
+                folders_list.append(Folder.from_json(folder))
             return folders_list
         else:
             description = f"Unable to get a list of folders for {self.user.name}"
@@ -40,6 +289,108 @@ class Folders:
 
         API Endpoint: GET /folders/{id}
 
+        :param id: the ID of the folder to be analysed
+        :type id: int
+        :return: the requested folder
+        :rtype: Folder() object
+        :raises FossologyApiError: if the REST call failed
+        """
+        detailled_folder = self._get_folder(folder_id)
+        self.folders.add(detailled_folder)
+        self._store_folders()
+        return detailled_folder
+
+    def refresh_folders(self):
+        """Reload the index of the folders from the server
+
+        API Endpoint: GET /folders
+
+        :return: the index of the folders
+        :rtype: FolderIndex
+        :raises FossologyApiError: if the REST call failed
+        """
+        self.folders.reset(self._list_folders(), self.user.rootFolderId)
+        self._store_folders()
+        return self.folders
+
+    def _store_folders(self):
+        """Write the index of the folders to the session cache after a change
+
+        Other sessions sharing the cache would otherwise keep using the folders known
+        when the cache was filled.
+        """
+        if self.session_cache:
+            self.session_cache.store(
+                self.host, self.token, self.name, {"folders": self.folders}
+            )
+
+    def get_folder_by_path(self, path, refresh=True):
+        """Get a folder by path
+
+        The folder is looked up in the index of the folders, which is reloaded from the
+        server once if the folder can't be found and ``refresh`` is True.
+
+        :Example:
+
+        >>> folder = foss.get_folder_by_path("/Top/Product/1.2")
+
+        :param path: the path of the folder relative to the root folder, e.g. "/Top/Product"
+        :param refresh: reload the folders from the server if the folder isn't found (default: True)
+        :type path: str
+        :type refresh: boolean
+        :return: the folder, None if it doesn't exist
+        :rtype: Folder
+        :raises FossologyApiError: if the REST call failed
+        """
+        folder = self.folders.get_by_path(path)
+        if folder is None and refresh:
+            folder = self.refresh_folders().get_by_path(path)
+        return folder
+
+    def ensure_folder_path(self, path, description=None, group=None):
+        """Get a folder by path, creating the missing folders like ``mkdir -p``
+
+        Existing folders are resolved from the index of the folders, only the
+        missing folders at the end of the path are created, one request each.
+
+        :Example:
+
+        >>> folder = foss.ensure_folder_path("/BU/Product/1.2")
+
+        :param path: the path of the folder relative to the root folder, e.g. "/Top/Product"
+        :param description: the description of the folders created (default: None)
+        :param group: the name of the group chosen to create the folders (default: None)
+        :type path: str
+        :type description: str
+        :type group: string
+        :return: the folder at the end of the path
+        :rtype: Folder() object
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user is not allowed to write in the folder or access the group
+        """
+        folder = self.folders.get(self.folders.root) or self.rootFolder
+        names = split_folder_path(path)
+        while names:
+            child = self.folders.get_child(folder, names[0])
+            if child is None:
+                break
+            folder = child
+            names.pop(0)
+        for name in names:
+            parent = folder
+            folder = self.create_folder(parent, name, description, group)
+            if folder is None:
+                message = f"Unable to find folder {name} under {parent}"
+                raise FossologyApiError(message)
+        return folder
+
+    def _get_folder(self, folder_id):
+        """Get details of folder without updating the list of known folders
+
+        Internal function meant to be called by detail_folder() or during the session initialization
+
+        API Endpoint: GET /folders/{id}
+
         :param id: the ID of the folder to be analysed
         :type id: int
         :return: the requested folder
@@ -48,12 +399,7 @@ class Folders:
         """
         response = self.session.get(f"{self.api}/folders/{folder_id}")
         if response.status_code == 200:
-            detailled_folder = Folder.from_json(response.json())
-            for folder in self.folders:
-                if folder.id == folder_id:
-                    self.folders.remove(folder)
-            self.folders.append(detailled_folder)
-            return detailled_folder
+            return Folder.from_json(response_json(response))
         else:
             description = f"Error while getting details for folder {folder_id}"
             raise FossologyApiError(description, response)
@@ -81,7 +427,7 @@ class Folders:
         headers = {
             "parentFolder": f"{parent.id}",
             "folderName": f"{name}",
-            "folderDescription": f"{description}",
+            "folderDescription": description or "",
         }
         if group:
             headers["groupName"] = group
@@ -90,15 +436,27 @@ class Folders:
 
         if response.status_code == 200:
             logger.info(f"Folder '{name}' already exists")
-            for folder in self.folders:
-                if folder.name == name:
-                    return folder
-            logger.error("Folder exists but was not found in the user's folder list")
-            return
+            folder = self.folders.get_child(parent.id, name)
+            if folder is None:
+                folder = self.refresh_folders().get_child(parent.id, name)
+            if folder is None:
+                logger.error(
+                    "Folder exists but was not found in the user's folder list"
+                )
+            return folder
 
         elif response.status_code == 201:
             logger.info(f"Folder {name} has been created")
-            return self.detail_folder(response.json()["message"])
+            # The folder is known from the request, no need to get its details
+            folder = Folder(
+                int(response_json(response)["message"]),
+                name,
+                headers["folderDescription"],
+                parent.id,
+            )
+            self.folders.add(folder)
+            self._store_folders()
+            return folder
 
         elif response.status_code == 403:
             description = f"Folder creation {get_options(group, parent)}not authorized"
@@ -150,11 +508,131 @@ class Folders:
         response = self.session.delete(f"{self.api}/folders/{folder.id}")
         if response.status_code == 202:
             logger.info(f"Folder {folder.id} has been scheduled for deletion")
+            self.folders.discard(folder)
+            self._store_folders()
         else:
             description = f"Unable to delete folder {folder.id}"
             raise FossologyApiError(description, response)
 
-    def _put_folder(self, action, folder, parent):
+    def bulk_delete_folders(self, folders, workers=4, wait=False, timeout=None):
+        """Delete many folders concurrently
+
+        The deletions are only scheduled by the server. If ``wait`` is True, the folders
+        are polled until they don't exist anymore or ``timeout`` seconds elapsed. A failed
+        deletion doesn't abort the others.
+
+        :param folders: the folders to be deleted
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param wait: wait until the folders are deleted (default: False)
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type folders: list of Folder
+        :type workers: int
+        :type wait: boolean
+        :type timeout: int
+        :return: the result of each deletion, with the folder as item
+        :rtype: list of BatchResult
+        """
+
+        def deleted(folder):
+            return not self._folder_exists(folder.id)
+
+        results = concurrency.run_batch(self.delete_folder, folders, workers=workers)
+        if wait:
+            for result in concurrency.poll_batch(deleted, results, timeout, workers):
+                description = (
+                    f"Folder {result.item.id} not deleted after {timeout} seconds"
+                )
+                result.error = FossologyApiError(description)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Deleted {len(results) - len(failed)} of {len(results)} folders")
+        return results
+
+    def bulk_move_folders(self, folders, parent, workers=4, wait=False, timeout=None):
+        """Move many folders to another parent folder concurrently
+
+        If ``wait`` is True, the folders are polled until the server reports the new
+        parent or ``timeout`` seconds elapsed. A failed move doesn't abort the others.
+
+        :param folders: the folders to be moved
+        :param parent: the new parent folder
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param wait: wait until the folders are moved (default: False)
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type folders: list of Folder
+        :type parent: Folder
+        :type workers: int
+        :type wait: boolean
+        :type timeout: int
+        :return: the result of each move, with the folder as item and the updated folder as result
+        :rtype: list of BatchResult
+        """
+
+        def move(folder):
+            return self._put_folder("move", folder, parent)
+
+        def moved(folder):
+            return self.detail_folder(folder.id).parent == parent.id
+
+        results = concurrency.run_batch(move, folders, workers=workers)
+        if wait:
+            for result in concurrency.poll_batch(moved, results, timeout, workers):
+                description = (
+                    f"Folder {result.item.id} not moved after {timeout} seconds"
+                )
+                result.error = FossologyApiError(description)
+            for result in results:
+                if result.ok:
+                    result.result = self.folders.get(result.item.id)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Moved {len(results) - len(failed)} of {len(results)} folders")
+        return results
+
+    def bulk_copy_folders(self, folders, parent, workers=4):
+        """Copy many folders to another parent folder concurrently
+
+        A failed copy doesn't abort the others. The index of the folders is reloaded
+        once all copies are done, the server doesn't return the id of the copies.
+
+        :param folders: the folders to be copied
+        :param parent: the new parent folder
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :type folders: list of Folder
+        :type parent: Folder
+        :type workers: int
+        :return: the result of each copy, with the folder as item
+        :rtype: list of BatchResult
+        """
+
+        def copy(folder):
+            return self._put_folder("copy", folder, parent, refresh=False)
+
+        results = concurrency.run_batch(copy, folders, workers=workers)
+        failed = [result for result in results if not result.ok]
+        if len(failed) < len(results):
+            self.refresh_folders()
+        logger.info(f"Copied {len(results) - len(failed)} of {len(results)} folders")
+        return results
+
+    def _folder_exists(self, folder_id):
+        """Check whether a folder exists
+
+        Internal function meant to be called by bulk_delete_folders()
+
+        API Endpoint: GET /folders/{id}
+
+        :rtype: boolean
+        :raises FossologyApiError: if the REST call failed
+        """
+        response = self.session.get(f"{self.api}/folders/{folder_id}")
+        if response.status_code == 200:
+            return True
+        elif response.status_code == 404:
+            return False
+        else:
+            description = f"Error while getting details for folder {folder_id}"
+            raise FossologyApiError(description, response)
+
+    def _put_folder(self, action, folder, parent, refresh=True):
         """Copy or move a folder
 
         Internal function meant to be called by move_folder() or copy_folder()
@@ -167,6 +645,8 @@ class Folders:
         :type folder: Folder() object
         :param parent: the new parent folder
         :type parent: Folder() object
+        :param refresh: reload the index of the folders after a copy (default: True)
+        :type refresh: boolean
         :return: the updated folder
         :rtype: Folder() object
         :raises FossologyApiError: if the REST call failed
@@ -175,6 +655,9 @@ class Folders:
         response = self.session.put(f"{self.api}/folders/{folder.id}", headers=headers)
         if response.status_code == 202:
             logger.info(f"Folder {folder.name} has been {action}d to {parent.name}")
+            if action == "copy" and refresh:
+                # The ids of the copied folders are unknown
+                self.refresh_folders()
             return self.detail_folder(folder.id)
         else:
             description = f"Unable to {action} folder {folder.name} to {parent.name}"
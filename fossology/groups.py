@@ -1,17 +1,45 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import inspect
 import logging
-from typing import List
+from typing import Dict, List, Tuple
 
-import fossology
-from fossology.exceptions import FossologyApiError, FossologyUnsupported
-from fossology.obj import Group
+from fossology import concurrency
+from fossology.codec import response_json
+from fossology.exceptions import FossologyApiError
+from fossology.obj import File, Group, Licenses, SearchResult
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+def result_key(item):
+    """Get the key identifying an item returned by several groups
+
+    Uploads, jobs and other objects with an ``id`` are identified by type and id, search
+    results by upload and upload tree item, license findings by file path and filesearch
+    results by SHA1 sum.
+
+    :raises TypeError: if the item isn't a model object or a search result, a ``key``
+        function must be given for such items
+    """
+    if isinstance(item, SearchResult):
+        return ("SearchResult", item.upload.id, item.uploadTreeId)
+    if isinstance(item, Licenses):
+        return ("Licenses", item.filepath)
+    if isinstance(item, File):
+        return ("File", item.hash.sha1)
+    if isinstance(item, dict) and "uploadTreeId" in item:
+        return ("SearchResult", item["upload"]["id"], item["uploadTreeId"])
+    if not isinstance(item, dict) and hasattr(item, "id"):
+        return (type(item).__name__, item.id)
+    raise TypeError(
+        f"No default key for items of type {type(item).__name__}, pass key= to "
+        "identify the duplicate items"
+    )
+
+
 class Groups:
     """Class dedicated to all "groups" related endpoints"""
 
@@ -24,14 +52,12 @@ class Groups:
         :rtype: list()
         :raises FossologyApiError: if the REST call failed
         """
-        if fossology.versiontuple(self.version) < fossology.versiontuple("1.2.1"):
-            description = f"Endpoint /groups is not supported by your Fossology API version {self.version}"
-            raise FossologyUnsupported(description)
+        self.capabilities.require("groups", "/groups")
 
         response = self.session.get(f"{self.api}/groups")
         if response.status_code == 200:
             groups_list = []
-            response_list = response.json()
+            response_list = response_json(response)
             for group in response_list:
                 single_group = Group.from_json(group)
                 groups_list.append(single_group)
@@ -49,9 +75,7 @@ class Groups:
         :type name: str
         :raises FossologyApiError: if the REST call failed
         """
-        if fossology.versiontuple(self.version) < fossology.versiontuple("1.2.1"):
-            description = f"Endpoint /groups is not supported by your Fossology API version {self.version}"
-            raise FossologyUnsupported(description)
+        self.capabilities.require("groups", "/groups")
 
         headers = {"name": f"{name}"}
         response = self.session.post(f"{self.api}/groups", headers=headers)
@@ -62,3 +86,140 @@ class Groups:
         else:
             description = f"Group {name} already exists, failed to create group or no group name provided"
             raise FossologyApiError(description, response)
+
+    def _fan_out_query(self, function, args, kwargs):
+        if isinstance(function, str):
+            function = getattr(self, function)
+
+        def query(group):
+            result = function(*args, group=group, **kwargs)
+            if isinstance(result, (list, tuple)) or inspect.isgenerator(result):
+                return result
+            return [result]
+
+        return query
+
+    def fan_out_groups(
+        self, function, *args, key=None, groups=None, workers=8, **kwargs
+    ) -> Tuple[List, Dict]:
+        """Run the same query for several groups concurrently and merge the results
+
+        The function is called with the given arguments and ``group=<group name>``
+        for each group. Lists and generators returned are merged in the order of the
+        groups, an item returned for several groups is only kept once. A failure for one
+        group doesn't abort the query for the other groups.
+
+        All the results of all groups are collected in memory before being returned, use
+        :func:`iter_fan_out_groups` to process large results as they arrive.
+
+        :Example:
+
+        >>> uploads, errors = foss.fan_out_groups(foss.iter_uploads, page_size=500)
+        >>> items, errors = foss.fan_out_groups("iter_search", license="GPL-2.0")
+        >>> for group, error in errors.items():
+        >>>     print(f"Search failed for group {group}: {error.message}")
+
+        :param function: the method (or its name) to be called for each group
+        :param args: the positional arguments of the function
+        :param key: function returning the key used to find duplicate items, required if the items aren't model objects (default: :func:`result_key`)
+        :param groups: the groups or group names to query (default: None, all groups of :func:`list_groups`)
+        :param workers: the maximum number of groups queried concurrently (default: 8)
+        :param kwargs: the key word arguments of the function
+        :type function: callable or str
+        :type key: callable
+        :type groups: list of Group or str
+        :type workers: int
+        :return: the merged results and the error raised for each failed group, by group name
+        :rtype: tuple(list, dict)
+        :raises FossologyApiError: if the groups couldn't be listed
+        :raises TypeError: if no key is given for items which aren't model objects
+        """
+        query = self._fan_out_query(function, args, kwargs)
+        if groups is None:
+            groups = self.list_groups()
+        names = [getattr(group, "name", group) for group in groups]
+        key = key or result_key
+
+        merged = list()
+        errors = dict()
+        seen = set()
+        for result in concurrency.run_batch(
+            lambda group: list(query(group)), names, workers
+        ):
+            if not result.ok:
+                errors[result.item] = result.error
+                continue
+            for item in result.result:
+                item_key = key(item)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    merged.append(item)
+        logger.debug(
+            f"Merged {len(merged)} results from {len(names) - len(errors)} groups, "
+            f"{len(errors)} groups failed"
+        )
+        return merged, errors
+
+    def iter_fan_out_groups(
+        self,
+        function,
+        *args,
+        key=None,
+        groups=None,
+        workers=8,
+        errors=None,
+        buffer_size=100,
+        **kwargs,
+    ):
+        """Run the same query for several groups concurrently and yield the results as they arrive
+
+        Streaming variant of :func:`fan_out_groups`: the items are yielded in the order
+        they are received from the groups, an item returned for several groups is only
+        yielded once. Only ``buffer_size`` items and the keys of the items already
+        yielded are kept in memory. Closing the generator stops the pending queries.
+
+        :Example:
+
+        >>> errors = dict()
+        >>> for group, upload in foss.iter_fan_out_groups(
+        >>>     foss.iter_uploads, page_size=500, errors=errors
+        >>> ):
+        >>>     print(f"{upload.uploadname} is visible by group {group}")
+
+        :param function: the method (or its name) to be called for each group
+        :param args: the positional arguments of the function
+        :param key: function returning the key used to find duplicate items, required if the items aren't model objects (default: :func:`result_key`)
+        :param groups: the groups or group names to query (default: None, all groups of :func:`list_groups`)
+        :param workers: the maximum number of groups queried concurrently (default: 8)
+        :param errors: dictionary filled with the error raised for each failed group, by group name (default: None, the first error is raised)
+        :param buffer_size: the maximum number of items received but not yielded yet (default: 100)
+        :param kwargs: the key word arguments of the function
+        :type function: callable or str
+        :type key: callable
+        :type groups: list of Group or str
+        :type workers: int
+        :type errors: dict
+        :type buffer_size: int
+        :return: the name of the group each item was first received from and the item
+        :rtype: generator of tuple(str, object)
+        :raises FossologyApiError: if the groups couldn't be listed
+        :raises Exception: the error raised for the first failed group if no errors dictionary is given
+        :raises TypeError: if no key is given for items which aren't model objects
+        """
+        query = self._fan_out_query(function, args, kwargs)
+        if groups is None:
+            groups = self.list_groups()
+        names = [getattr(group, "name", group) for group in groups]
+        key = key or result_key
+
+        seen = set()
+        for result in concurrency.interleave(query, names, workers, buffer_size):
+            if not result.ok:
+                if errors is None:
+                    raise result.error
+                errors[result.item] = result.error
+                continue
+            item_key = key(result.result)
+            if item_key not in seen:
+                seen.add(item_key)
+                yield result.item, result.result
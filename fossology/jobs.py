@@ -1,16 +1,261 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
-import json
 import logging
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
 
+from fossology import concurrency
+from fossology.codec import dumps, response_json, response_total_pages
 from fossology.exceptions import AuthorizationError, FossologyApiError
 from fossology.obj import Job, get_options
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+JOB_FINISHED_STATUSES = ("Completed", "Failed")
+
+
+def next_poll_interval(interval, eta=None, min_interval=1, max_interval=30, factor=2):
+    """Compute the time to wait before polling a job again
+
+    The interval grows exponentially up to ``max_interval``, a positive estimated
+    time left for the job shortens it down to ``min_interval``.
+
+    :param interval: the previous interval (0 for the first poll)
+    :param eta: the estimated time left for the job in seconds (default: None)
+    :param min_interval: the minimal interval in seconds (default: 1)
+    :param max_interval: the maximal interval in seconds (default: 30)
+    :param factor: the growth factor of the interval (default: 2)
+    :type interval: float
+    :type eta: int or string
+    :type min_interval: float
+    :type max_interval: float
+    :type factor: float
+    :return: the next interval in seconds
+    :rtype: float
+    """
+    interval = min(max(interval * factor, min_interval), max_interval)
+    try:
+        eta = float(eta)
+    except (TypeError, ValueError):
+        return interval
+    if eta > 0:
+        interval = max(min(interval, eta), min_interval)
+    return interval
+
+
+class _WaitedJob:
+    def __init__(self, job_id, upload_id, callback, deadline):
+        self.job_id = job_id
+        self.upload_id = upload_id
+        self.callback = callback
+        self.deadline = deadline
+        self.future = Future()
+        self.interval = 0
+        self.next_poll = time.monotonic()
+
+
+class JobWaiter:
+
+    """Track the completion of many jobs at once
+
+    A background thread polls the jobs, each job has its own polling interval growing
+    exponentially and bounded by the estimated time left for the job (see
+    :func:`next_poll_interval`). Jobs of the same upload which are due at the same time
+    are checked with a single ``GET /jobs?upload={id}`` request.
+
+    Each added job gets a :class:`~concurrent.futures.Future` resolved with the Job data
+    as soon as its status is "Completed" or "Failed", or with the last known data if the
+    waiter timeout expires. REST errors are set as exceptions of the futures.
+
+    The callback of a job is only called when its status is "Completed" or "Failed",
+    not when the timeout expires: the status of the Job data tells whether the job
+    finished or the waiter gave up on it.
+
+    :Example:
+
+    >>> with foss.job_waiter(timeout=3600) as waiter:
+    >>>     for upload in uploads:
+    >>>         job = foss.schedule_jobs(folder, upload, spec)
+    >>>         waiter.add(job, callback=lambda job: print(f"{job} is finished"))
+    >>>     waiter.wait()
+
+    :param foss: the Fossology session
+    :param timeout: stop waiting for a job x seconds after it has been added (default: None)
+    :param min_interval: the minimal polling interval in seconds (default: 1)
+    :param max_interval: the maximal polling interval in seconds (default: 30)
+    :param factor: the growth factor of the polling interval (default: 2)
+    :type foss: Fossology
+    :type timeout: int
+    :type min_interval: float
+    :type max_interval: float
+    :type factor: float
+    """
+
+    def __init__(
+        self, foss, timeout=None, min_interval=1, max_interval=30, factor=2,
+    ):
+        self.foss = foss
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self._jobs = dict()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, job, callback=None):
+        """Start waiting for a job
+
+        :param job: the job (or job id) to wait for
+        :param callback: function called with the Job as soon as it is finished, not called if the timeout expires first (default: None)
+        :type job: Job or int
+        :type callback: callable
+        :return: a future resolved with the Job data
+        :rtype: Future
+        """
+        job_id = getattr(job, "id", job)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot add a job to a closed waiter")
+            if job_id in self._jobs:
+                return self._jobs[job_id].future
+            deadline = None
+            if self.timeout is not None:
+                deadline = time.monotonic() + self.timeout
+            waited = _WaitedJob(
+                job_id, getattr(job, "uploadId", None), callback, deadline
+            )
+            self._jobs[job_id] = waited
+            if not self._thread:
+                self._thread = threading.Thread(
+                    target=self._run, name="fossology-job-waiter", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return waited.future
+
+    def wait(self, timeout=None):
+        """Block until all jobs added so far are finished
+
+        :param timeout: stop waiting after x seconds (default: None)
+        :type timeout: int
+        :return: the jobs data of the finished jobs
+        :rtype: list of Job
+        """
+        with self._condition:
+            futures = [waited.future for waited in self._jobs.values()]
+        wait_futures(futures, timeout)
+        return [
+            future.result()
+            for future in futures
+            if future.done() and not future.exception()
+        ]
+
+    def close(self):
+        """Stop polling, the futures of the jobs still running are cancelled"""
+        with self._condition:
+            self._closed = True
+            for waited in self._jobs.values():
+                waited.future.cancel()
+            self._jobs.clear()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._jobs:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                now = time.monotonic()
+                next_poll = min(waited.next_poll for waited in self._jobs.values())
+                if next_poll > now:
+                    self._condition.wait(next_poll - now)
+                    continue
+                # Poll jobs due soon together, to batch the requests
+                horizon = now + self.min_interval / 2
+                due = [w for w in self._jobs.values() if w.next_poll <= horizon]
+            for waited, job, error in self._poll(due):
+                self._update(waited, job, error, now)
+
+    def _poll(self, due):
+        by_upload = dict()
+        for waited in due:
+            by_upload.setdefault(waited.upload_id, []).append(waited)
+
+        for upload_id, waited_jobs in by_upload.items():
+            if upload_id is not None and len(waited_jobs) > 1:
+                jobs = self._list_upload_jobs(upload_id)
+                for waited in list(waited_jobs):
+                    if waited.job_id in jobs:
+                        waited_jobs.remove(waited)
+                        yield waited, jobs[waited.job_id], None
+            for waited in waited_jobs:
+                try:
+                    yield waited, self.foss._get_job(waited.job_id), None
+                except Exception as error:
+                    yield waited, None, error
+
+    def _list_upload_jobs(self, upload_id):
+        # Jobs not found here are polled one by one
+        jobs = dict()
+        page = 1
+        try:
+            while True:
+                jobs_list, total_pages = self.foss._list_jobs_page(100, page, upload_id)
+                for job in jobs_list:
+                    jobs[job.id] = job
+                if len(jobs_list) < 100 or (total_pages and page >= total_pages):
+                    return jobs
+                page += 1
+        except Exception as error:
+            logger.debug(f"Listing jobs of upload {upload_id} failed: {error}")
+            return jobs
+
+    def _update(self, waited, job, error, now):
+        finished = error or job.status in JOB_FINISHED_STATUSES
+        expired = waited.deadline is not None and now >= waited.deadline
+        with self._condition:
+            if self._jobs.get(waited.job_id) is not waited:
+                return
+            if not (finished or expired):
+                waited.interval = next_poll_interval(
+                    waited.interval,
+                    job.eta,
+                    self.min_interval,
+                    self.max_interval,
+                    self.factor,
+                )
+                waited.next_poll = now + waited.interval
+                if waited.deadline is not None:
+                    waited.next_poll = min(waited.next_poll, waited.deadline)
+                waited.upload_id = job.uploadId
+                return
+            del self._jobs[waited.job_id]
+
+        if error:
+            waited.future.set_exception(error)
+            return
+        logger.debug(f"Stopped waiting for job {job.id} with status {job.status}")
+        waited.future.set_result(job)
+        # Jobs given up on timeout are still running, their callback isn't called
+        if waited.callback and job.status in JOB_FINISHED_STATUSES:
+            try:
+                waited.callback(job)
+            except Exception as exc:
+                logger.error(f"Callback for job {job.id} failed: {exc}")
+
 
 class Jobs:
     """Class dedicated to all "jobs" related endpoints"""
@@ -32,56 +277,193 @@ class Jobs:
         :rtype: list of Job
         :raises FossologyApiError: if the REST call failed
         """
+        upload_id = upload.id if upload else None
+        jobs_list, _ = self._list_jobs_page(page_size, page, upload_id)
+        return jobs_list
+
+    def _list_jobs_page(self, page_size, page, upload_id):
+        """Get one page of jobs and the total number of pages
+
+        Internal function meant to be called by list_jobs(), iter_jobs() or list_jobs_since()
+
+        API Endpoint: GET /jobs
+
+        :return: the jobs of the page and the total number of pages (None if unknown)
+        :rtype: tuple(list of Job, int)
+        :raises FossologyApiError: if the REST call failed
+        """
         params = {}
         headers = {"limit": str(page_size), "page": str(page)}
-        if upload:
-            params["upload"] = upload.id
+        if upload_id is not None:
+            params["upload"] = upload_id
         response = self.session.get(f"{self.api}/jobs", params=params, headers=headers)
         if response.status_code == 200:
             jobs_list = list()
-            for job in response.json():
+            for job in response_json(response):
                 jobs_list.append(Job.from_json(job))
-            return jobs_list
+            return jobs_list, response_total_pages(response)
         else:
             description = "Getting the list of jobs failed"
             raise FossologyApiError(description, response)
 
+    def iter_jobs(self, upload=None, page_size=100, prefetch=4):
+        """Iterate over all available jobs
+
+        API Endpoint: GET /jobs
+
+        The total number of pages is read from the first response, the following pages
+        are fetched concurrently while the jobs are yielded in order. At most
+        ``prefetch`` pages are requested in advance.
+
+        If the server doesn't provide the total number of pages, the pages are fetched
+        one after the other until a page isn't full.
+
+        :param upload: list only jobs of the given upload (default: None)
+        :param page_size: the maximum number of results per page (default: 100)
+        :param prefetch: the maximum number of pages fetched in advance (default: 4)
+        :type upload: Upload
+        :type page_size: int
+        :type prefetch: int
+        :return: the jobs
+        :rtype: generator of Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        upload_id = upload.id if upload else None
+
+        def fetch_page(page):
+            return self._list_jobs_page(page_size, page, upload_id)
+
+        yield from concurrency.iter_pages(fetch_page, page_size, workers=prefetch)
+
+    def list_jobs_since(self, job_id, upload=None, page_size=20):
+        """Get the jobs which are newer than a given job
+
+        API Endpoint: GET /jobs
+
+        The jobs are returned by the server newest first, pages are fetched until
+        a job with an id lower than or equal to ``job_id`` is found. Polling the
+        job queue with the id of the newest known job thus costs a single request
+        as long as less than ``page_size`` jobs have been created in between.
+
+        :Example:
+
+        >>> last_job_id = 0
+        >>> while True:
+        >>>     new_jobs = foss.list_jobs_since(last_job_id)
+        >>>     if new_jobs:
+        >>>         last_job_id = new_jobs[0].id
+        >>>     time.sleep(60)
+
+        :param job_id: the id of the newest job already known
+        :param upload: list only jobs of the given upload (default: None)
+        :param page_size: the maximum number of results per page (default: 20)
+        :type job_id: int
+        :type upload: Upload
+        :type page_size: int
+        :return: the jobs newer than the given job, newest first
+        :rtype: list of Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        upload_id = upload.id if upload else None
+        new_jobs = list()
+        page = 1
+        while True:
+            jobs_list, total_pages = self._list_jobs_page(page_size, page, upload_id)
+            for job in jobs_list:
+                if int(job.id) <= job_id:
+                    return new_jobs
+                new_jobs.append(job)
+            if len(jobs_list) < page_size or (total_pages and page >= total_pages):
+                return new_jobs
+            page += 1
+
     def detail_job(self, job_id, wait=False, timeout=30):
         """Get detailled information about a job
 
         API Endpoint: GET /jobs/{id}
 
+        If ``wait`` is True, the job is polled until it is finished or ``timeout``
+        seconds elapsed. The polling interval starts at 1 second and grows exponentially,
+        bounded by the estimated time left for the job.
+
         :param job_id: the id of the job
         :param wait: wait until the job is finished (default: False)
         :param timeout: stop waiting after x seconds (default: 30)
         :type: int
         :type wait: boolean
         :type timeout: 30
+        :return: the job data (the last known data if the job didn't finish in time)
+        :rtype: Job
+        :raises FossologyApiError: if the REST call failed
+        """
+        job = self._get_job(job_id)
+        if not wait:
+            return job
+
+        deadline = time.monotonic() + timeout
+        interval = 0
+        while job.status not in JOB_FINISHED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.debug(f"Job {job_id} didn't finish within {timeout} seconds")
+                return job
+            interval = next_poll_interval(interval, job.eta)
+            logger.debug(f"Waiting {interval} seconds for job {job_id} to complete")
+            time.sleep(min(interval, remaining))
+            job = self._get_job(job_id)
+
+        logger.debug(f"Job {job_id} has finished with status {job.status}")
+        return job
+
+    def _get_job(self, job_id):
+        """Get detailled information about a job
+
+        Internal function meant to be called by detail_job() or JobWaiter
+
+        API Endpoint: GET /jobs/{id}
+
         :return: the job data
         :rtype: Job
         :raises FossologyApiError: if the REST call failed
         """
         response = self.session.get(f"{self.api}/jobs/{job_id}")
-        if wait:
-            if response.status_code == 200:
-                job = Job.from_json(response.json())
-                if job.status == "Completed":
-                    logger.debug(f"Job {job_id} has completed")
-                    return job
-            else:
-                description = f"Error while getting details for job {job_id}"
-                raise FossologyApiError(description, response)
-            logger.debug(f"Waiting for job {job_id} to complete")
-            time.sleep(timeout)
-            response = self.session.get(f"{self.api}/jobs/{job_id}")
-
         if response.status_code == 200:
             logger.debug(f"Got details for job {job_id}")
-            return Job.from_json(response.json())
+            return Job.from_json(response_json(response))
         else:
             description = f"Error while getting details for job {job_id}"
             raise FossologyApiError(description, response)
 
+    def job_waiter(self, **kwargs):
+        """Get a waiter tracking the completion of many jobs at once
+
+        :param kwargs: the options of the JobWaiter
+        :type kwargs: key word argument
+        :return: a new job waiter for the current session
+        :rtype: JobWaiter
+        """
+        return JobWaiter(self, **kwargs)
+
+    def wait_for_jobs(self, jobs, timeout=None, callback=None):
+        """Wait until all given jobs are finished
+
+        The jobs are polled concurrently by a :class:`JobWaiter`, see its
+        description for the polling strategy.
+
+        :param jobs: the jobs (or job ids) to wait for
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :param callback: function called with each Job as soon as it is finished, not called for the jobs still running when the timeout expires (default: None)
+        :type jobs: list of Job or int
+        :type timeout: int
+        :type callback: callable
+        :return: the jobs data, in the order of the given jobs, the last known data for the jobs still running when the timeout expires
+        :rtype: list of Job
+        :raises FossologyApiError: if a REST call failed
+        """
+        with JobWaiter(self, timeout=timeout) as waiter:
+            futures = [waiter.add(job, callback=callback) for job in jobs]
+            return [future.result() for future in futures]
+
     def schedule_jobs(self, folder, upload, spec, group=None, wait=False, timeout=30):
         """Schedule jobs for a specific upload
 
@@ -144,12 +526,12 @@ class Jobs:
             headers["groupName"] = group
 
         response = self.session.post(
-            f"{self.api}/jobs", headers=headers, data=json.dumps(spec)
+            f"{self.api}/jobs", headers=headers, data=dumps(spec)
         )
 
         if response.status_code == 201:
             detailled_job = self.detail_job(
-                response.json()["message"], wait=wait, timeout=timeout
+                response_json(response)["message"], wait=wait, timeout=timeout
             )
             return detailled_job
 
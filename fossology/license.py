@@ -2,15 +2,166 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 
-import fossology
-from fossology.exceptions import FossologyApiError, FossologyUnsupported
+from fossology import concurrency
+from fossology.codec import dumps, loads, response_json
+from fossology.exceptions import FossologyApiError
 from fossology.obj import License
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+class LicenseCache:
+
+    """In-memory LRU cache of the licenses, optionally persisted to disk
+
+    Licenses fetched by :func:`~fossology.Fossology.detail_license` are kept for ``ttl``
+    seconds, the least recently used licenses are evicted once ``maxsize`` licenses are
+    cached. Licenses are scoped by server, so the same cache can be shared by several
+    sessions.
+
+    If a ``path`` is given, the cache is loaded from this file and written back by
+    :func:`save`, which :func:`~fossology.Fossology.detail_licenses` calls once all
+    licenses have been fetched. The file is only written if the cache changed since it
+    was loaded or last saved.
+
+    :Example:
+
+    >>> from fossology import Fossology
+    >>> from fossology.license import LicenseCache
+    >>> cache = LicenseCache(path="licenses.json")
+    >>> foss = Fossology(FOSS_URL, FOSS_TOKEN, username, license_cache=cache)
+    >>> licenses = foss.detail_licenses(["MIT", "GPL-2.0-only", "Apache-2.0"])
+
+    :param maxsize: the maximum number of licenses kept in the cache (default: 1024)
+    :param ttl: the number of seconds after which a cached license expires (default: 86400)
+    :param path: the file the cache is persisted to (default: None, no persistence)
+    :type maxsize: int
+    :type ttl: int
+    :type path: str
+    """
+
+    def __init__(self, maxsize=1024, ttl=86400, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = False
+        if path:
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, server, name):
+        """Get a license from the cache
+
+        :param server: the URL of the Fossology instance
+        :param name: the short name of the license
+        :type server: str
+        :type name: str
+        :return: the license, None if it isn't cached or expired
+        :rtype: License
+        """
+        key = (server, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            license, expires = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return license
+
+    def put(self, server, name, license, expires=None):
+        """Add a license to the cache
+
+        :param server: the URL of the Fossology instance
+        :param name: the short name of the license
+        :param license: the license
+        :param expires: the expiration time (default: None, ``ttl`` seconds from now)
+        :type server: str
+        :type name: str
+        :type license: License
+        :type expires: float
+        """
+        key = (server, name)
+        with self._lock:
+            self._entries[key] = (license, expires or time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            self._changed = True
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, server, name=None):
+        """Remove a license or all licenses of a server from the cache
+
+        :param server: the URL of the Fossology instance
+        :param name: the short name of the license (default: None, all licenses)
+        :type server: str
+        :type name: str
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == server and name in (None, key[1]):
+                    del self._entries[key]
+                    self._changed = True
+
+    def clear(self):
+        """Remove all licenses from the cache"""
+        with self._lock:
+            self._changed = self._changed or bool(self._entries)
+            self._entries.clear()
+
+    def save(self):
+        """Write the licenses which didn't expire yet to the cache file
+
+        Nothing is written if the cache didn't change since it was loaded or last saved.
+        """
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            if not self._changed:
+                return
+            self._changed = False
+            entries = [
+                [server, name, license.to_dict(), expires]
+                for (server, name), (license, expires) in self._entries.items()
+                if expires >= now
+            ]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as fp:
+            fp.write(dumps(entries))
+        os.replace(fp.name, self.path)
+        logger.debug(f"Saved {len(entries)} licenses to {self.path}")
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as fp:
+                entries = loads(fp.read())
+            for server, name, license, expires in entries:
+                self.put(server, name, License.from_json(license), expires)
+            self._changed = False
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as error:
+            logger.warning(f"Ignoring unreadable license cache {self.path}: {error}")
+            self.clear()
+
+
 class LicenseEndpoint:
     """Class dedicated to all "license" related endpoints"""
 
@@ -19,20 +170,58 @@ class LicenseEndpoint:
 
         API Endpoint: GET /license
 
+        If the session has a ``license_cache``, cached licenses are returned without
+        any request and fetched licenses are added to the cache.
+
         :param name: Short name of the license
         :rtype name: str
         :return: a list of groups
         :rtype: License() object
         :raises FossologyApiError: if the REST call failed
         """
-        if fossology.versiontuple(self.version) < fossology.versiontuple("1.1.3"):
-            description = f"Endpoint /license is not supported by your Fossology API version {self.version}"
-            raise FossologyUnsupported(description)
+        if self.license_cache is not None:
+            license = self.license_cache.get(self.host, name)
+            if license:
+                return license
+
+        self.capabilities.require("license", "/license")
 
         headers = {"shortName": f"{name}"}
         response = self.session.get(f"{self.api}/license", headers=headers)
         if response.status_code == 200:
-            return License.from_json(response.json())
+            license = License.from_json(response_json(response))
+            if self.license_cache is not None:
+                self.license_cache.put(self.host, name, license)
+            return license
         else:
             description = f"Unable to get license {name}"
             raise FossologyApiError(description, response)
+
+    def detail_licenses(self, names, workers=4):
+        """Get many licenses concurrently
+
+        Each license is only requested once, licenses found in the ``license_cache``
+        of the session are not requested at all. A failure for one license doesn't
+        abort the others. The cache is saved once all licenses have been fetched, if any
+        license was requested.
+
+        :Example:
+
+        >>> results = foss.detail_licenses(["MIT", "GPL-2.0-only"], workers=8)
+        >>> for name, result in results.items():
+        >>>     print(result.result if result.ok else f"{name}: {result.error}")
+
+        :param names: the short names of the licenses
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :type names: list of str
+        :type workers: int
+        :return: the result of each license by short name, with the License as result
+        :rtype: dict of BatchResult
+        """
+        names = list(dict.fromkeys(names))
+        results = concurrency.run_batch(self.detail_license, names, workers=workers)
+        if self.license_cache is not None:
+            self.license_cache.save()
+        failed = [result for result in results if not result.ok]
+        logger.debug(f"Got {len(results) - len(failed)} of {len(results)} licenses")
+        return {result.item: result for result in results}
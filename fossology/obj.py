@@ -1,8 +1,10 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
-import json
 from enum import Enum
+from types import MappingProxyType
+
+from fossology.codec import dumps
 
 
 class AccessLevel(Enum):
@@ -60,6 +62,59 @@ class ClearingStatus(Enum):
     REJECTED = "Rejected"
 
 
+_EMPTY_INFO = MappingProxyType({})
+
+
+def _no_additional_info():
+    return _EMPTY_INFO
+
+
+class _Model(object):
+
+    """Base class of the FOSSology models.
+
+    The attributes of a model are listed in its ``_fields``, the slotted variant of
+    the model stores them in slots.
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+
+    # Factory of the additional_info of an instance without additional information
+    _empty_info = dict
+
+
+def _slotted(model, **models):
+    """Create the slotted variant of a model
+
+    The variant shares the methods of the model but stores its attributes in slots.
+    Without additional information, its ``additional_info`` is a shared read-only
+    empty mapping instead of a new dictionary.
+
+    :param model: the model class
+    :param models: the slotted variants of the nested models, by class attribute
+    :type model: type
+    :type models: key word argument
+    :return: the slotted model class
+    :rtype: type
+    """
+    name = f"Slotted{model.__name__}"
+    namespace = {
+        key: value
+        for key, value in vars(model).items()
+        if key not in ("__dict__", "__weakref__")
+    }
+    namespace.update(models)
+    namespace.update(
+        __slots__=model._fields + ("additional_info",),
+        __qualname__=name,
+        __doc__=f"Slotted variant of :class:`{model.__name__}`.",
+        _empty_info=staticmethod(_no_additional_info),
+    )
+    return type(name, model.__bases__, namespace)
+
+
 class Agents(object):
 
     """FOSSology agents.
@@ -146,10 +201,10 @@ class Agents(object):
         :return: the agents configured for the current user
         :rtype: JSON
         """
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
 
-class User(object):
+class User(_Model):
 
     """FOSSology user.
 
@@ -175,6 +230,17 @@ class User(object):
     :type kwargs: key word argument
     """
 
+    _fields = (
+        "id",
+        "name",
+        "description",
+        "email",
+        "accessLevel",
+        "rootFolderId",
+        "emailNotification",
+        "agents",
+    )
+
     def __init__(
         self,
         id,
@@ -195,7 +261,7 @@ class User(object):
         self.rootFolderId = rootFolderId
         self.emailNotification = emailNotification
         self.agents = agents
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return (
@@ -204,12 +270,31 @@ class User(object):
             f"and root folder {self.rootFolderId}"
         )
 
+    def to_dict(self):
+        """Get a dictionary with the user data
+
+        :return: the user data, in the format used by the REST API
+        :rtype: dict
+        """
+        user = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "email": self.email,
+            "accessLevel": self.accessLevel,
+            "rootFolderId": self.rootFolderId,
+            "emailNotification": self.emailNotification,
+        }
+        if self.agents:
+            user["agents"] = self.agents.to_dict()
+        return {**user, **self.additional_info}
+
     @classmethod
     def from_json(cls, json_dict):
         return cls(**json_dict)
 
 
-class Folder(object):
+class Folder(_Model):
 
     """FOSSology folder.
 
@@ -227,12 +312,14 @@ class Folder(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("id", "name", "description", "parent")
+
     def __init__(self, id, name, description, parent, **kwargs):
         self.id = id
         self.name = name
         self.description = description
         self.parent = parent
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return (
@@ -240,12 +327,26 @@ class Folder(object):
             f"parent folder id = {self.parent}"
         )
 
+    def to_dict(self):
+        """Get a dictionary with the folder data
+
+        :return: the folder data, in the format used by the REST API
+        :rtype: dict
+        """
+        folder = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "parent": self.parent,
+        }
+        return {**folder, **self.additional_info}
+
     @classmethod
     def from_json(cls, json_dict):
         return cls(**json_dict)
 
 
-class Findings(object):
+class Findings(_Model):
 
     """FOSSology license findings.
 
@@ -260,13 +361,15 @@ class Findings(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("scanner", "conclusion", "copyright")
+
     def __init__(
         self, scanner, conclusion, copyright=None, **kwargs,
     ):
         self.scanner = scanner
         self.conclusion = conclusion
         self.copyright = copyright
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return (
@@ -279,7 +382,7 @@ class Findings(object):
         return cls(**json_dict)
 
 
-class Group(object):
+class Group(_Model):
 
     """FOSSology group.
 
@@ -293,10 +396,12 @@ class Group(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("id", "name")
+
     def __init__(self, id, name, **kwargs):
         self.id = id
         self.name = name
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return f"Group {self.name} ({self.id})"
@@ -306,7 +411,7 @@ class Group(object):
         return cls(**json_dict)
 
 
-class License(object):
+class License(_Model):
 
     """FOSSology license.
 
@@ -326,23 +431,40 @@ class License(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("id", "shortName", "fullName", "text", "risk")
+
     def __init__(self, id, shortName, fullName, text, risk, **kwargs):
         self.id = id
         self.shortName = shortName
         self.fullName = fullName
         self.text = text
         self.risk = risk
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return f"License {self.fullName} - {self.shortName} ({self.id}) with risk level {self.risk}"
 
+    def to_dict(self):
+        """Get a dictionary with the license data
+
+        :return: the license data, in the format used by the REST API
+        :rtype: dict
+        """
+        license = {
+            "id": self.id,
+            "shortName": self.shortName,
+            "fullName": self.fullName,
+            "text": self.text,
+            "risk": self.risk,
+        }
+        return {**license, **self.additional_info}
+
     @classmethod
     def from_json(cls, json_dict):
         return cls(**json_dict)
 
 
-class Licenses(object):
+class Licenses(_Model):
 
     """FOSSology file license findings.
 
@@ -356,15 +478,18 @@ class Licenses(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("filepath", "findings")
+    _findings_model = Findings
+
     def __init__(
         self, filePath, findings=None, **kwargs,
     ):
         self.filepath = filePath
         if findings:
-            self.findings = Findings.from_json(findings)
+            self.findings = self._findings_model.from_json(findings)
         else:
             self.findings = findings
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         if self.findings.conclusion:
@@ -377,7 +502,7 @@ class Licenses(object):
         return cls(**json_dict)
 
 
-class Hash(object):
+class Hash(_Model):
 
     """FOSSology hash.
 
@@ -395,6 +520,8 @@ class Hash(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("sha1", "md5", "sha256", "size")
+
     def __init__(
         self, sha1, md5, sha256, size, **kwargs,
     ):
@@ -402,17 +529,31 @@ class Hash(object):
         self.md5 = md5
         self.sha256 = sha256
         self.size = size
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return f"File SHA1: {self.sha1} MD5 {self.md5} SH256 {self.sha256} Size {self.size}B"
 
+    def to_dict(self):
+        """Get a dictionary with the hash sums
+
+        :return: the hash sums, in the format used by the REST API
+        :rtype: dict
+        """
+        hash = {
+            "sha1": self.sha1,
+            "md5": self.md5,
+            "sha256": self.sha256,
+            "size": self.size,
+        }
+        return {**hash, **self.additional_info}
+
     @classmethod
     def from_json(cls, json_dict):
         return cls(**json_dict)
 
 
-class File(object):
+class File(_Model):
 
     """FOSSology file response from filesearch.
 
@@ -426,12 +567,16 @@ class File(object):
     :type kwargs: key word argument
     """
 
+    _fields = ("hash", "findings")
+    _hash_model = Hash
+    _findings_model = Findings
+
     def __init__(
         self, hash, findings, **kwargs,
     ):
-        self.hash = Hash.from_json(hash)
-        self.findings = Findings.from_json(findings)
-        self.additional_info = kwargs
+        self.hash = self._hash_model.from_json(hash)
+        self.findings = self._findings_model.from_json(findings)
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         if self.findings.conclusion:
@@ -444,7 +589,7 @@ class File(object):
         return cls(**json_dict)
 
 
-class Upload(object):
+class Upload(_Model):
 
     """FOSSology upload.
 
@@ -468,6 +613,19 @@ class Upload(object):
     :type kwargs: key word argument
     """
 
+    _fields = (
+        "folderid",
+        "foldername",
+        "id",
+        "description",
+        "uploadname",
+        "uploaddate",
+        "filesize",
+        "filesha1",
+        "hash",
+    )
+    _hash_model = Hash
+
     def __init__(
         self,
         folderid,
@@ -494,8 +652,8 @@ class Upload(object):
         else:
             self.filesize = None
             self.filesha1 = None
-            self.hash = Hash.from_json(hash)
-        self.additional_info = kwargs
+            self.hash = self._hash_model.from_json(hash)
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         if self.filesize:
@@ -514,7 +672,43 @@ class Upload(object):
         return cls(**json_dict)
 
 
-class Summary(object):
+class SearchResult(_Model):
+
+    """FOSSology search result.
+
+    Represents a file or directory found by a FOSSology search.
+
+    :param upload: the upload the item belongs to
+    :param uploadTreeId: the ID of the item in the upload tree
+    :param filename: the name of the item
+    :param kwargs: handle any other search result information provided by the fossology instance
+    :type upload: Upload
+    :type uploadTreeId: int
+    :type filename: string
+    :type kwargs: key word argument
+    """
+
+    _fields = ("upload", "uploadTreeId", "filename")
+    _upload_model = Upload
+
+    def __init__(self, upload, uploadTreeId, filename, **kwargs):
+        self.upload = self._upload_model.from_json(upload)
+        self.uploadTreeId = uploadTreeId
+        self.filename = filename
+        self.additional_info = kwargs or self._empty_info()
+
+    def __str__(self):
+        return (
+            f"File '{self.filename}' ({self.uploadTreeId}) "
+            f"in upload '{self.upload.uploadname}' ({self.upload.id})"
+        )
+
+    @classmethod
+    def from_json(cls, json_dict):
+        return cls(**json_dict)
+
+
+class Summary(_Model):
 
     """FOSSology upload summary.
 
@@ -546,6 +740,20 @@ class Summary(object):
     :type kwargs: key word argument
     """
 
+    _fields = (
+        "id",
+        "uploadName",
+        "mainLicense",
+        "uniqueLicenses",
+        "totalLicenses",
+        "uniqueConcludedLicenses",
+        "totalConcludedLicenses",
+        "filesToBeCleared",
+        "filesCleared",
+        "clearingStatus",
+        "copyrightCount",
+    )
+
     def __init__(
         self,
         id,
@@ -572,7 +780,7 @@ class Summary(object):
         self.filesCleared = filesCleared
         self.clearingStatus = clearingStatus
         self.copyrightCount = copyrightCount
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return (
@@ -585,7 +793,7 @@ class Summary(object):
         return cls(**json_dict)
 
 
-class Job(object):
+class Job(_Model):
 
     """FOSSology job.
 
@@ -611,6 +819,17 @@ class Job(object):
     :type kwargs: key word argument
     """
 
+    _fields = (
+        "id",
+        "name",
+        "queueDate",
+        "uploadId",
+        "userId",
+        "groupId",
+        "eta",
+        "status",
+    )
+
     def __init__(
         self, id, name, queueDate, uploadId, userId, groupId, eta, status, **kwargs
     ):
@@ -622,7 +841,7 @@ class Job(object):
         self.groupId = groupId
         self.eta = eta
         self.status = status
-        self.additional_info = kwargs
+        self.additional_info = kwargs or self._empty_info()
 
     def __str__(self):
         return (
@@ -635,6 +854,22 @@ class Job(object):
         return cls(**json_dict)
 
 
+# Slotted variants of the models, with a smaller memory footprint when many objects
+# are kept: their instances have no __dict__ and only accept the model attributes
+SlottedUser = _slotted(User)
+SlottedFolder = _slotted(Folder)
+SlottedFindings = _slotted(Findings)
+SlottedGroup = _slotted(Group)
+SlottedLicense = _slotted(License)
+SlottedLicenses = _slotted(Licenses, _findings_model=SlottedFindings)
+SlottedHash = _slotted(Hash)
+SlottedFile = _slotted(File, _hash_model=SlottedHash, _findings_model=SlottedFindings)
+SlottedUpload = _slotted(Upload, _hash_model=SlottedHash)
+SlottedSearchResult = _slotted(SearchResult, _upload_model=SlottedUpload)
+SlottedSummary = _slotted(Summary)
+SlottedJob = _slotted(Job)
+
+
 def get_options(group: str = None, folder: Folder = None) -> str:
     options = ""
     if group:
@@ -8,6 +8,7 @@ from typing import Tuple
 
 from tenacity import TryAgain, retry, retry_if_exception_type, stop_after_attempt
 
+from fossology.codec import response_json
 from fossology.exceptions import AuthorizationError, FossologyApiError
 from fossology.obj import ReportFormat, Upload, get_options
 
@@ -48,7 +49,7 @@ class Report:
         response = self.session.get(f"{self.api}/report", headers=headers)
 
         if response.status_code == 201:
-            report_id = re.search("[0-9]*$", response.json()["message"])
+            report_id = re.search("[0-9]*$", response_json(response)["message"])
             return report_id[0]
 
         elif response.status_code == 403:
@@ -0,0 +1,254 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import logging
+from array import array
+
+from fossology.obj import Licenses
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# Flags of the optional columns of a row
+HAS_FINDINGS = 1
+HAS_SCANNER = 2
+HAS_CONCLUSION = 4
+HAS_COPYRIGHT = 8
+
+
+class _StringList:
+
+    """Column of lists of interned strings
+
+    All lists are concatenated in a single array of string ids, the offsets array
+    gives the position of the list of each row.
+    """
+
+    def __init__(self, strings):
+        self.strings = strings
+        self.ids = array("I")
+        self.offsets = array("I", [0])
+
+    def append(self, values):
+        if values:
+            self.ids.extend(self.strings.intern(value) for value in values)
+        self.offsets.append(len(self.ids))
+
+    def row_ids(self, row):
+        return self.ids[self.offsets[row] : self.offsets[row + 1]]
+
+    def row(self, row):
+        return [self.strings.values[string_id] for string_id in self.row_ids(row)]
+
+
+class _StringTable:
+
+    """Table of unique strings, each string is stored once and referenced by its id"""
+
+    def __init__(self):
+        self.values = []
+        self.ids = dict()
+
+    def intern(self, value):
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+class LicenseStore:
+
+    """Compact container of license findings
+
+    Stores the findings of many files in columns: the file paths in a list, the
+    license names and copyrights as ids of interned strings in arrays. Each
+    distinct string is stored once, whatever the number of files it was found in.
+
+    The :class:`~fossology.obj.Licenses` objects are only created when a file is
+    accessed, by index, by path or while iterating over the store.
+
+    :Example:
+
+    >>> store = foss.upload_licenses(upload, compact=True)
+    >>> store.get("linux/kernel/fork.c").findings.scanner
+    ['GPL-2.0-only']
+    >>> store.files_with_license("GPL-2.0-only")[:2]
+    ['linux/COPYING', 'linux/kernel/fork.c']
+
+    :param findings: the license findings to be stored (default: None)
+    :type findings: iterable of Licenses or of JSON dict
+    """
+
+    def __init__(self, findings=None):
+        self._strings = _StringTable()
+        self._paths = []
+        self._flags = array("B")
+        self._scanner = _StringList(self._strings)
+        self._conclusion = _StringList(self._strings)
+        self._copyright = _StringList(self._strings)
+        # Rarely used additional attributes, stored by row
+        self._additional_info = dict()
+        self._path_index = None
+        self._license_index = None
+        if findings:
+            self.extend(findings)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        for row in range(len(self._paths)):
+            yield self._licenses(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._licenses(row) for row in range(len(self._paths))[index]]
+        if index < 0:
+            index += len(self._paths)
+        if not 0 <= index < len(self._paths):
+            raise IndexError("LicenseStore index out of range")
+        return self._licenses(index)
+
+    def __contains__(self, path):
+        return path in self._get_path_index()
+
+    def __str__(self):
+        return f"License findings of {len(self)} files, {len(self.licenses())} distinct licenses"
+
+    def append(self, licenses):
+        """Add the findings of one file
+
+        :param licenses: the findings of the file
+        :type licenses: Licenses or JSON dict
+        """
+        if isinstance(licenses, dict):
+            licenses = Licenses.from_json(licenses)
+        row = len(self._paths)
+        findings = licenses.findings or None
+        flags = 0
+        if findings is not None:
+            flags |= HAS_FINDINGS
+            for flag, value in (
+                (HAS_SCANNER, findings.scanner),
+                (HAS_CONCLUSION, findings.conclusion),
+                (HAS_COPYRIGHT, findings.copyright),
+            ):
+                if value is not None:
+                    flags |= flag
+        self._scanner.append(findings.scanner if findings else None)
+        self._conclusion.append(findings.conclusion if findings else None)
+        self._copyright.append(findings.copyright if findings else None)
+        additional_info = (
+            licenses.additional_info,
+            findings.additional_info if findings else {},
+        )
+        if any(additional_info):
+            self._additional_info[row] = additional_info
+        self._paths.append(licenses.filepath)
+        self._flags.append(flags)
+
+        if self._path_index is not None:
+            self._path_index.setdefault(licenses.filepath, row)
+        self._license_index = None
+
+    def extend(self, findings):
+        """Add the findings of many files
+
+        :param findings: the findings of the files
+        :type findings: iterable of Licenses or of JSON dict
+        """
+        for licenses in findings:
+            self.append(licenses)
+
+    def paths(self):
+        """Get the paths of the files in the store
+
+        :return: the file paths, in the order the files were added
+        :rtype: list of str
+        """
+        return list(self._paths)
+
+    def get(self, path, default=None):
+        """Get the findings of a file
+
+        :param path: the path of the file in the upload
+        :param default: the value returned if the file isn't in the store (default: None)
+        :type path: str
+        :return: the findings of the file
+        :rtype: Licenses
+        """
+        row = self._get_path_index().get(path)
+        if row is None:
+            return default
+        return self._licenses(row)
+
+    def licenses(self):
+        """Get the number of files each license was found or concluded in
+
+        :return: the number of files by license name
+        :rtype: dict
+        """
+        return {
+            self._strings.values[string_id]: len(rows)
+            for string_id, rows in self._get_license_index().items()
+        }
+
+    def files_with_license(self, name, scanner=True, conclusion=True):
+        """Get the files a license was found or concluded in
+
+        :param name: the short name of the license
+        :param scanner: include the files where a scanner found the license (default: True)
+        :param conclusion: include the files where the license was concluded (default: True)
+        :type name: str
+        :type scanner: boolean
+        :type conclusion: boolean
+        :return: the file paths, in the order the files were added
+        :rtype: list of str
+        """
+        string_id = self._strings.ids.get(name)
+        if string_id is None:
+            return []
+        paths = []
+        for row in self._get_license_index().get(string_id, ()):
+            if (scanner and string_id in self._scanner.row_ids(row)) or (
+                conclusion and string_id in self._conclusion.row_ids(row)
+            ):
+                paths.append(self._paths[row])
+        return paths
+
+    def _get_path_index(self):
+        if self._path_index is None:
+            self._path_index = dict()
+            for row, path in enumerate(self._paths):
+                self._path_index.setdefault(path, row)
+        return self._path_index
+
+    def _get_license_index(self):
+        if self._license_index is None:
+            index = dict()
+            for row in range(len(self._paths)):
+                for column in (self._scanner, self._conclusion):
+                    for string_id in column.row_ids(row):
+                        rows = index.setdefault(string_id, array("I"))
+                        if not rows or rows[-1] != row:
+                            rows.append(row)
+            self._license_index = index
+        return self._license_index
+
+    def _licenses(self, row):
+        flags = self._flags[row]
+        licenses_info, findings_info = self._additional_info.get(row, ({}, {}))
+        findings = None
+        if flags & HAS_FINDINGS:
+            findings = {
+                "scanner": self._scanner.row(row) if flags & HAS_SCANNER else None,
+                "conclusion": self._conclusion.row(row)
+                if flags & HAS_CONCLUSION
+                else None,
+                "copyright": self._copyright.row(row)
+                if flags & HAS_COPYRIGHT
+                else None,
+                **findings_info,
+            }
+        return Licenses(self._paths[row], findings=findings, **licenses_info)
@@ -0,0 +1,253 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import codecs
+import json
+import logging
+import os
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+ELEMENT_END = re.compile(r"[ \t\n\r,\]]")
+
+
+class MultipartFile:
+
+    """Streaming multipart/form-data body for a single file
+
+    The body is read chunk by chunk from the file while the request is sent, the
+    memory used is bounded by the chunk size whatever the size of the file. The total
+    length of the body is known in advance, the request is sent with a
+    ``Content-Length`` header.
+
+    :Example:
+
+    >>> def progress(sent, total):
+    >>>     print(f"{sent}/{total} bytes sent")
+    >>>
+    >>> with MultipartFile("fileInput", "firmware.img", callback=progress) as body:
+    >>>     headers = {"Content-Type": body.content_type}
+    >>>     session.post(url, data=body, headers=headers)
+
+    :param field: the name of the form field
+    :param path: the path of the file to be sent
+    :param chunk_size: the size of the chunks read from the file when iterating over the body (default: 1 MiB)
+    :param callback: function called with the number of bytes sent and the total length (default: None)
+    :param mimetype: the content type of the file (default: application/octet-stream)
+    :type field: string
+    :type path: string
+    :type chunk_size: int
+    :type callback: callable
+    :type mimetype: string
+    """
+
+    def __init__(
+        self,
+        field,
+        path,
+        chunk_size=1024 * 1024,
+        callback=None,
+        mimetype="application/octet-stream",
+    ):
+        boundary = uuid.uuid4().hex
+        filename = os.path.basename(path).replace('"', "%22")
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self._preamble = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {mimetype}\r\n\r\n"
+        ).encode()
+        self._epilogue = f"\r\n--{boundary}--\r\n".encode()
+        self._file_size = os.path.getsize(path)
+        self._length = len(self._preamble) + self._file_size + len(self._epilogue)
+        self._file = open(path, "rb")
+        self._sent = 0
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self._read_chunk(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        """Read the next part of the body
+
+        :param size: the maximum number of bytes to be read (default: -1, the remaining body)
+        :type size: int
+        :return: the next bytes of the body, empty when the body has been read completely
+        :rtype: bytes
+        """
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self._read_chunk(self.chunk_size), b""))
+        return self._read_chunk(size)
+
+    def _read_chunk(self, size):
+        chunk = b""
+        file_start = len(self._preamble)
+        file_end = file_start + self._file_size
+        if self._sent < file_start:
+            chunk = self._preamble[self._sent : self._sent + size]
+        elif self._sent < file_end:
+            chunk = self._file.read(min(size, file_end - self._sent))
+            if not chunk:
+                raise IOError(f"{self._file.name} has been truncated while reading it")
+        elif self._sent < self._length:
+            offset = self._sent - file_end
+            chunk = self._epilogue[offset : offset + size]
+
+        if chunk:
+            self._sent += len(chunk)
+            if self.callback:
+                self.callback(self._sent, self._length)
+        return chunk
+
+    def close(self):
+        """Close the underlying file"""
+        self._file.close()
+
+
+class _JSONArrayParser:
+
+    """Decoder of a JSON array fed chunk by chunk"""
+
+    def __init__(self, encoding):
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        # Next expected token: "[", the first element or "]", an element, "," or "]"
+        self.state = "start"
+
+    @property
+    def done(self):
+        return self.state == "end"
+
+    def feed(self, chunk, final=False):  # noqa: C901
+        """Decode the next part of the document
+
+        :return: the elements completed by the chunk
+        :rtype: list
+        :raises JSONDecodeError: if the document isn't a valid JSON array
+        """
+        # Drop the consumed part of the buffer and append the chunk
+        self.buffer = self.buffer[self.position :] + self.text_decoder.decode(
+            chunk, final
+        )
+        self.position = 0
+        elements = list()
+        while not self.done:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position == len(self.buffer):
+                if final:
+                    raise json.JSONDecodeError(
+                        "Unterminated JSON array", self.buffer, self.position
+                    )
+                break
+            token = self.buffer[self.position]
+            if self.state == "start":
+                if token != "[":
+                    raise json.JSONDecodeError(
+                        "Expecting '['", self.buffer, self.position
+                    )
+                self.position += 1
+                self.state = "first"
+            elif self.state == "delimiter" or (self.state == "first" and token == "]"):
+                self.position += 1
+                if token == "]":
+                    self.state = "end"
+                elif token == ",":
+                    self.state = "element"
+                else:
+                    raise json.JSONDecodeError(
+                        "Expecting ',' delimiter", self.buffer, self.position - 1
+                    )
+            else:
+                try:
+                    value, end = self.decoder.raw_decode(self.buffer, self.position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                # A value not followed by a delimiter may be incomplete, e.g. a split number
+                if not final and not ELEMENT_END.match(self.buffer, end):
+                    break
+                self.position = end
+                self.state = "delimiter"
+                elements.append(value)
+        return elements
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """Decode a JSON array incrementally and yield its elements one by one
+
+    Only the elements being decoded are kept in memory, whatever the size of the
+    whole document. The chunks can be split anywhere, even inside a multi-byte
+    character.
+
+    :Example:
+
+    >>> response = session.get(url, stream=True)
+    >>> for element in iter_json_array(response.iter_content(64 * 1024)):
+    >>>     print(element)
+
+    :param chunks: the successive parts of the JSON document
+    :param encoding: the encoding of the chunks (default: utf-8)
+    :type chunks: iterable of bytes
+    :type encoding: string
+    :return: the decoded elements of the array
+    :rtype: generator
+    :raises JSONDecodeError: if the document isn't a valid JSON array
+    """
+    parser = _JSONArrayParser(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+            if parser.done:
+                return
+    yield from parser.feed(b"", final=True)
+
+
+async def aiter_json_array(chunks, encoding="utf-8"):
+    """Decode a JSON array incrementally from an asynchronous iterable of chunks
+
+    Asynchronous equivalent of :func:`iter_json_array`.
+
+    :Example:
+
+    >>> async with client.stream("GET", url) as response:
+    >>>     async for element in aiter_json_array(response.aiter_bytes()):
+    >>>         print(element)
+
+    :param chunks: the successive parts of the JSON document
+    :param encoding: the encoding of the chunks (default: utf-8)
+    :type chunks: asynchronous iterable of bytes
+    :type encoding: string
+    :return: the decoded elements of the array
+    :rtype: asynchronous generator
+    :raises JSONDecodeError: if the document isn't a valid JSON array
+    """
+    parser = _JSONArrayParser(encoding)
+    async for chunk in chunks:
+        if chunk:
+            for element in parser.feed(chunk):
+                yield element
+            if parser.done:
+                return
+    for element in parser.feed(b"", final=True):
+        yield element
@@ -1,19 +1,135 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import hashlib
 import json
 import logging
+import mmap
+import os
 import time
 
 from tenacity import TryAgain, retry, retry_if_exception_type, stop_after_attempt
 
+from fossology import concurrency
+from fossology.codec import dumps, response_json, response_total_pages
 from fossology.exceptions import AuthorizationError, FossologyApiError
-from fossology.obj import Licenses, Summary, Upload, get_options
+from fossology.obj import Hash, Licenses, Summary, Upload, get_options
+from fossology.store import LicenseStore
+from fossology.streaming import MultipartFile, iter_json_array
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+def file_hashes(
+    path, chunk_size=1024 * 1024, use_mmap=False, algorithms=("sha1", "md5", "sha256")
+):
+    """Compute the SHA1, MD5 and SHA256 hash sums of a file in a single pass
+
+    :param path: the path of the file
+    :param chunk_size: the number of bytes hashed at once (default: 1 MiB)
+    :param use_mmap: map the file in memory instead of reading it (default: False)
+    :param algorithms: the hash sums to be computed, the others are None (default: all)
+    :type path: string
+    :type chunk_size: int
+    :type use_mmap: boolean
+    :type algorithms: tuple of string
+    :return: the hash sums and the size of the file, hex digests are upper case like on the server
+    :rtype: Hash
+    """
+    sums = [hashlib.new(algorithm) for algorithm in algorithms]
+    size = os.path.getsize(path)
+    with open(path, "rb") as fp:
+        if use_mmap and size:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                for offset in range(0, size, chunk_size):
+                    chunk = view[offset : offset + chunk_size]
+                    for hash_sum in sums:
+                        hash_sum.update(chunk)
+                    chunk.release()
+                view.release()
+        else:
+            for chunk in iter(lambda: fp.read(chunk_size), b""):
+                for hash_sum in sums:
+                    hash_sum.update(chunk)
+    digests = {hash_sum.name: hash_sum.hexdigest().upper() for hash_sum in sums}
+    return Hash(digests.get("sha1"), digests.get("md5"), digests.get("sha256"), size)
+
+
+class UploadHandle:
+
+    """Handle of an upload accepted by the server but possibly not ready yet
+
+    Returned by ``upload_file(wait=False)``. The handle doesn't block: :func:`poll` sends a
+    single request, :func:`result` waits until the upload is ready. Handles can also be awaited
+    from a coroutine, :func:`result` then blocks a thread of ``executor`` until the upload is
+    ready: pass an executor sized for the number of handles awaited concurrently.
+
+    :param foss: the Fossology session
+    :param upload_id: the id of the upload
+    :param group: the group the upload belongs to (default: None)
+    :param upload: the upload data if already known (default: None)
+    :param executor: the executor waiting for the upload when the handle is awaited (default: None, the default executor of the event loop)
+    :type foss: Fossology
+    :type upload_id: int
+    :type group: string
+    :type upload: Upload
+    :type executor: concurrent.futures.Executor
+    """
+
+    def __init__(self, foss, upload_id, group=None, upload=None, executor=None):
+        self.foss = foss
+        self.id = upload_id
+        self.group = group
+        self.upload = upload
+        self.executor = executor
+        self.retry_after = 0
+
+    def __str__(self):
+        state = "ready" if self.upload else "pending"
+        return f"Upload handle {self.id} ({state})"
+
+    def __await__(self):
+        return self._wait().__await__()
+
+    async def _wait(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.result)
+
+    def done(self):
+        """Whether the upload is known to be ready, no request is sent
+
+        :rtype: boolean
+        """
+        return self.upload is not None
+
+    def poll(self):
+        """Check once whether the upload is ready
+
+        :return: the upload data, or None if the upload isn't ready yet
+        :rtype: Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if not self.upload:
+            self.upload, self.retry_after = self.foss._get_upload(self.id, self.group)
+        return self.upload
+
+    def result(self, timeout=None):
+        """Wait until the upload is ready
+
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type timeout: int
+        :return: the upload data
+        :rtype: Upload
+        :raises FossologyApiError: if the REST call failed or the timeout expired
+        :raises AuthorizationError: if the user can't access the group
+        """
+        return self.foss.wait_for_uploads([self], timeout=timeout)[0]
+
+
 class Uploads:
     """Class dedicated to all "uploads" related endpoints"""
 
@@ -52,6 +168,24 @@ class Uploads:
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
+        upload, retry_after = self._get_upload(upload_id, group)
+        if upload:
+            return upload
+        time.sleep(int(wait_time or retry_after))
+        raise TryAgain
+
+    def _get_upload(self, upload_id, group=None):
+        """Get detailled information about an upload if it is ready
+
+        Internal function meant to be called by detail_upload() or UploadHandle
+
+        API Endpoint: GET /uploads/{id}
+
+        :return: the upload data (None if it isn't ready) and the number of seconds to wait before retrying
+        :rtype: tuple(Upload, int)
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
         headers = {}
         if group:
             headers["groupName"] = group
@@ -59,25 +193,54 @@ class Uploads:
 
         if response.status_code == 200:
             logger.debug(f"Got details for upload {upload_id}")
-            return Upload.from_json(response.json())
+            return Upload.from_json(response_json(response)), 0
 
         elif response.status_code == 403:
             description = f"Getting details for upload {upload_id} {get_options(group)}not authorized"
             raise AuthorizationError(description, response)
 
         elif response.status_code == 503:
-            if not wait_time:
-                wait_time = response.headers["Retry-After"]
+            retry_after = int(response.headers.get("Retry-After", 1))
             logger.debug(
-                f"Retry GET upload {upload_id} after {wait_time} seconds: {response.json()['message']}"
+                f"Upload {upload_id} is not ready, retry after {retry_after} seconds: {response_json(response)['message']}"
             )
-            time.sleep(int(wait_time))
-            raise TryAgain
+            return None, retry_after
 
         else:
             description = f"Error while getting details for upload {upload_id}"
             raise FossologyApiError(description, response)
 
+    def wait_for_uploads(self, handles, timeout=None):
+        """Wait until the server is ready with all given uploads
+
+        The pending uploads are polled in turn, between two rounds the client waits for the
+        shortest ``Retry-After`` interval returned by the server.
+
+        :param handles: the handles of the uploads returned by ``upload_file(wait=False)``
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type handles: list of UploadHandle
+        :type timeout: int
+        :return: the uploads data, in the order of the handles
+        :rtype: list of Upload
+        :raises FossologyApiError: if a REST call failed or the timeout expired
+        :raises AuthorizationError: if the user can't access the group
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = [handle for handle in handles if not handle.done()]
+        while pending:
+            retry_after = min(handle.retry_after for handle in pending)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    description = (
+                        f"{len(pending)} uploads not ready after {timeout} seconds"
+                    )
+                    raise FossologyApiError(description)
+                retry_after = min(retry_after, remaining)
+            time.sleep(retry_after)
+            pending = [handle for handle in pending if not handle.poll()]
+        return [handle.upload for handle in handles]
+
     def upload_file(  # noqa: C901
         self,
         folder,
@@ -90,6 +253,10 @@ class Uploads:
         ignore_scm=False,
         group=None,
         wait_time=0,
+        progress=None,
+        dedupe=False,
+        wait=True,
+        executor=None,
     ):
         """Upload a package to FOSSology
 
@@ -97,6 +264,20 @@ class Uploads:
 
         Perform a file, VCS or URL upload and get information about the upload using :func:`~fossology.uploads.Uploads.detail_upload` and passing the ``wait_time`` argument.
 
+        Files are streamed to the server chunk by chunk using a :class:`~fossology.streaming.MultipartFile`,
+        the memory used does not depend on the size of the file.
+
+        With ``dedupe``, the SHA1 sum of the file is computed first and the upload is skipped
+        if an upload with the same content already exists in the folder itself (not in its
+        subfolders), see :func:`~fossology.uploads.Uploads.find_uploads_by_hash`.
+
+        With ``wait=False``, the function returns as soon as the server accepted the upload, without waiting
+        for the upload to be unpacked. The returned :class:`~fossology.uploads.UploadHandle` can be polled,
+        waited for, awaited or passed with other handles to :func:`~fossology.uploads.Uploads.wait_for_uploads`.
+
+        >>> handles = [foss.upload_file(folder, file=path, wait=False) for path in paths]
+        >>> uploads = foss.wait_for_uploads(handles)
+
         See description of :func:`~fossology.uploads.Uploads.detail_upload` to configure how long the client shall wait for the upload to be ready.
 
         :Example for a file upload:
@@ -167,6 +348,10 @@ class Uploads:
         :param ignore_scm: ignore SCM files (Git, SVN, TFS) (default: True)
         :param group: the group name to chose while uploading the file (default: None)
         :param wait_time: use a customized upload wait time instead of Retry-After (in seconds, default: 0)
+        :param progress: function called with the number of bytes sent and the total number of bytes (default: None)
+        :param dedupe: return the existing upload of the folder if the file has already been uploaded (default: False)
+        :param wait: wait until the server is ready with the upload (default: True)
+        :param executor: the executor waiting for the upload when the handle returned with ``wait=False`` is awaited (default: None, the default executor of the event loop)
         :type folder: Folder
         :type file: string
         :type vcs: dict()
@@ -177,11 +362,37 @@ class Uploads:
         :type ignore_scm: boolean
         :type group: string
         :type wait_time: int
-        :return: the upload data
-        :rtype: Upload
+        :type progress: callable
+        :type dedupe: boolean
+        :type wait: boolean
+        :type executor: concurrent.futures.Executor
+        :return: the upload data, or a handle of the upload if ``wait`` is False
+        :rtype: Upload or UploadHandle
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
+        if file and dedupe:
+            # Uploads are only compared by SHA1 sum and size
+            existing_uploads = self.find_uploads_by_hash(
+                file_hashes(file, algorithms=("sha1",)),
+                folder=folder,
+                group=group,
+                recursive=False,
+            )
+            if existing_uploads:
+                logger.info(
+                    f"{file} has already been uploaded as {existing_uploads[0]}, skipping"
+                )
+                if not wait:
+                    return UploadHandle(
+                        self,
+                        existing_uploads[0].id,
+                        group,
+                        existing_uploads[0],
+                        executor,
+                    )
+                return existing_uploads[0]
+
         headers = {"folderId": str(folder.id)}
         if description:
             headers["uploadDescription"] = description
@@ -194,21 +405,21 @@ class Uploads:
 
         if file:
             headers["uploadType"] = "server"
-            with open(file, "rb") as fp:
-                files = {"fileInput": fp}
+            with MultipartFile("fileInput", file, callback=progress) as body:
+                headers["Content-Type"] = body.content_type
                 response = self.session.post(
-                    f"{self.api}/uploads", files=files, headers=headers
+                    f"{self.api}/uploads", data=body, headers=headers
                 )
         elif vcs or url or server:
             if vcs:
                 headers["uploadType"] = "vcs"
-                data = json.dumps(vcs)
+                data = dumps(vcs)
             elif url:
                 headers["uploadType"] = "url"
-                data = json.dumps(url)
+                data = dumps(url)
             elif server:
                 headers["uploadType"] = "server"
-                data = json.dumps(server)
+                data = dumps(server)
             headers["Content-Type"] = "application/json"
             response = self.session.post(
                 f"{self.api}/uploads", data=data, headers=headers
@@ -229,8 +440,14 @@ class Uploads:
             source = server.get("name")
 
         if response.status_code == 201:
+            if not wait:
+                return UploadHandle(
+                    self, response_json(response)["message"], group, executor=executor
+                )
             try:
-                upload = self.detail_upload(response.json()["message"], wait_time)
+                upload = self.detail_upload(
+                    response_json(response)["message"], group=group, wait_time=wait_time
+                )
                 if upload.filesize:
                     logger.info(
                         f"Upload {upload.uploadname} ({upload.filesize}) "
@@ -265,6 +482,97 @@ class Uploads:
             description = f"Upload {description} could not be performed"
             raise FossologyApiError(description, response)
 
+    def find_uploads_by_hash(self, file_hash, folder=None, group=None, recursive=True):
+        """Find the uploads of a file with the given hash sums
+
+        The SHA1 sum is first looked up with :func:`~fossology.Fossology.filesearch_batch`: if the
+        server doesn't know the file, no upload is listed. Otherwise the uploads of the
+        folder (and its children if ``recursive``) are listed and compared with the SHA1 sum
+        and the size, the other hash sums are not used.
+
+        :Example:
+
+        >>> from fossology.uploads import file_hashes
+        >>> uploads = foss.find_uploads_by_hash(file_hashes("my-package.zip"), foss.rootFolder)
+
+        :param file_hash: the hash sums of the file
+        :param folder: only search uploads from the given folder (default: None)
+        :param group: search uploads from a specific group (default: None)
+        :param recursive: also search uploads from the children folders (default: True)
+        :type file_hash: Hash
+        :type folder: Folder
+        :type group: string
+        :type recursive: boolean
+        :return: the uploads of the file
+        :rtype: list of Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if self.capabilities.filesearch:
+            known_files = self.filesearch_batch([file_hash.sha1], group=group)
+            if known_files[file_hash.sha1] is None:
+                logger.debug(f"File with SHA1 {file_hash.sha1} is unknown")
+                return []
+
+        sha1 = file_hash.sha1.upper()
+        uploads_list = list()
+        upload_hash = self.capabilities.upload_hash
+        for upload in self.iter_uploads(
+            folder=folder, group=group, recursive=recursive
+        ):
+            if upload_hash:
+                upload_sha1, upload_size = upload.hash.sha1, upload.hash.size
+            else:
+                upload_sha1, upload_size = upload.filesha1, upload.filesize
+            if not upload_sha1 or upload_sha1.upper() != sha1:
+                continue
+            if upload_size and int(upload_size) != file_hash.size:
+                continue
+            uploads_list.append(upload)
+        return uploads_list
+
+    def bulk_upload(self, paths, folder, workers=4, **kwargs):
+        """Upload many files concurrently
+
+        Directories are walked recursively and every file found is uploaded. The uploads
+        share the connection pool of the session, use a ``pool_size`` at least equal to
+        ``workers`` when creating the session. A failed upload doesn't abort the others.
+
+        :Example:
+
+        >>> results = foss.bulk_upload(["release/"], foss.rootFolder, workers=8)
+        >>> for result in results:
+        >>>     if not result.ok:
+        >>>         print(f"Upload of {result.item} failed: {result.error}")
+
+        :param paths: the files or directories to be uploaded
+        :param folder: the upload Fossology folder
+        :param workers: the maximum number of concurrent uploads (default: 4)
+        :param kwargs: further arguments passed to :func:`~fossology.uploads.Uploads.upload_file`
+        :type paths: list of string
+        :type folder: Folder
+        :type workers: int
+        :type kwargs: key word argument
+        :return: the result of each file upload, with the file path as item and the Upload as result
+        :rtype: list of BatchResult
+        """
+        files = list()
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, filenames in os.walk(path):
+                    dirs.sort()
+                    files.extend(os.path.join(root, name) for name in sorted(filenames))
+            else:
+                files.append(path)
+
+        def upload(path):
+            return self.upload_file(folder, file=path, **kwargs)
+
+        results = concurrency.run_batch(upload, files, workers=workers)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Uploaded {len(results) - len(failed)} of {len(results)} files")
+        return results
+
     @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
     def upload_summary(self, upload, group=None):
         """Get clearing information about an upload
@@ -280,6 +588,24 @@ class Uploads:
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
+        summary = self._get_summary(upload, group)
+        if summary:
+            return summary
+        time.sleep(3)
+        raise TryAgain
+
+    def _get_summary(self, upload, group=None):
+        """Get clearing information about an upload if it is available
+
+        Internal function meant to be called by upload_summary() or upload_summaries()
+
+        API Endpoint: GET /uploads/{id}/summary
+
+        :return: the upload summary data (None if the unpack agent didn't start yet)
+        :rtype: Summary
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
         headers = {}
         if group:
             headers["groupName"] = group
@@ -288,7 +614,7 @@ class Uploads:
         )
 
         if response.status_code == 200:
-            return Summary.from_json(response.json())
+            return Summary.from_json(response_json(response))
 
         elif response.status_code == 403:
             description = f"Getting summary of upload {upload.id} {get_options(group)}not authorized"
@@ -298,36 +624,153 @@ class Uploads:
             logger.debug(
                 f"Unpack agent for {upload.uploadname} (id={upload.id}) didn't start yet"
             )
-            time.sleep(3)
-            raise TryAgain
+            return None
         else:
             description = f"No summary for upload {upload.uploadname} (id={upload.id})"
             raise FossologyApiError(description, response)
 
-    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
-    def upload_licenses(self, upload, group: str = None, agent=None, containers=False):
+    def upload_summaries(self, uploads, group=None, workers=4, attempts=3, wait_time=3):
+        """Get clearing information about many uploads concurrently
+
+        API Endpoint: GET /uploads/{id}/summary
+
+        The summaries are fetched in rounds: all pending uploads are requested concurrently,
+        the uploads which are not ready yet are requested again in the next round after a
+        single shared wait of ``wait_time`` seconds.
+
+        :Example:
+
+        >>> summaries = foss.upload_summaries(foss.list_uploads(), workers=8)
+        >>> for upload_id, result in summaries.items():
+        >>>     if result.ok:
+        >>>         print(result.result)
+
+        :param uploads: the uploads to gather data from
+        :param group: the group name to chose while accessing the uploads (default: None)
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param attempts: the maximum number of rounds (default: 3)
+        :param wait_time: the number of seconds to wait between two rounds (default: 3)
+        :type uploads: list of Upload
+        :type group: string
+        :type workers: int
+        :type attempts: int
+        :type wait_time: int
+        :return: the result of each upload keyed by upload id, with the Summary as result
+        :rtype: dict of BatchResult
+        """
+        results = dict()
+        pending = list(uploads)
+        for attempt in range(attempts):
+            if attempt:
+                logger.debug(f"{len(pending)} summaries not available yet")
+                time.sleep(wait_time)
+            batch = concurrency.run_batch(
+                lambda upload: self._get_summary(upload, group), pending, workers
+            )
+            pending = list()
+            for result in batch:
+                if result.ok and result.result is None:
+                    pending.append(result.item)
+                else:
+                    results[result.item.id] = result
+            if not pending:
+                break
+
+        for upload in pending:
+            description = f"No summary for upload {upload.uploadname} (id={upload.id}) after {attempts} attempts"
+            results[upload.id] = concurrency.BatchResult(
+                upload, error=FossologyApiError(description)
+            )
+        return results
+
+    def upload_licenses(
+        self, upload, group: str = None, agent=None, containers=False, compact=False
+    ):
         """Get clearing information about an upload
 
         API Endpoint: GET /uploads/{id}/licenses
 
-        The response does not generate Python objects yet, the plain JSON data is simply returned.
+        All findings are loaded in memory, use :func:`iter_upload_licenses` for large uploads
+        or ``compact=True`` to store them in a :class:`~fossology.store.LicenseStore`.
 
         :param upload: the upload to gather data from
         :param agent: the license agents to use (e.g. "nomos,monk,ninka,ojo,reportImport", default: "nomos")
         :param containers: wether to show containers or not (default: False)
         :param group: the group name to chose while accessing the upload (default: None)
+        :param compact: return a compact LicenseStore instead of a list (default: False)
         :type upload: Upload
         :type agent: string
         :type containers: boolean
         :type group: string
+        :type compact: boolean
         :return: the list of licenses findings for the specified agent
-        :rtype: list of Licenses
+        :rtype: list of Licenses or LicenseStore
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        findings = self.iter_upload_licenses(upload, group, agent, containers)
+        if compact:
+            return LicenseStore(findings)
+        return list(findings)
+
+    def iter_upload_licenses(
+        self, upload, group: str = None, agent=None, containers=False, chunk_size=65536
+    ):
+        """Iterate over the license findings of an upload, one file at a time
+
+        API Endpoint: GET /uploads/{id}/licenses
+
+        The response is decoded while it is received, the memory used doesn't depend
+        on the number of files in the upload.
+
+        :Example:
+
+        >>> for file_licenses in foss.iter_upload_licenses(upload):
+        >>>     print(file_licenses.filepath, file_licenses.findings.scanner)
+
+        :param upload: the upload to gather data from
+        :param agent: the license agents to use (e.g. "nomos,monk,ninka,ojo,reportImport", default: "nomos")
+        :param containers: wether to show containers or not (default: False)
+        :param group: the group name to chose while accessing the upload (default: None)
+        :param chunk_size: the number of bytes read from the response at once (default: 64 KiB)
+        :type upload: Upload
+        :type agent: string
+        :type containers: boolean
+        :type group: string
+        :type chunk_size: int
+        :return: the licenses findings for the specified agent
+        :rtype: generator of Licenses
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        response = self._get_licenses_response(upload, group, agent, containers)
+        try:
+            for file_with_findings in iter_json_array(
+                response.iter_content(chunk_size), response.encoding or "utf-8"
+            ):
+                yield Licenses.from_json(file_with_findings)
+        except json.JSONDecodeError as error:
+            description = f"Invalid licenses for upload {upload.uploadname} (id={upload.id}): {error}"
+            raise FossologyApiError(description)
+        finally:
+            response.close()
+
+    # Retry until the unpack agent is finished
+    @retry(retry=retry_if_exception_type(TryAgain), stop=stop_after_attempt(3))
+    def _get_licenses_response(self, upload, group=None, agent=None, containers=False):
+        """Send the request for the license findings of an upload
+
+        Internal function meant to be called by iter_upload_licenses()
+
+        API Endpoint: GET /uploads/{id}/licenses
+
+        :return: the streamed response, its body hasn't been read yet
+        :rtype: requests.Response
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
         headers = {}
         params = {}
-        headers = {}
         if group:
             headers["groupName"] = group
         if agent:
@@ -336,20 +779,16 @@ class Uploads:
             params["agent"] = agent = "nomos"
         if containers:
             params["containers"] = "true"
-        if group:
-            headers["groupName"] = group
 
         response = self.session.get(
-            f"{self.api}/uploads/{upload.id}/licenses", params=params, headers=headers
+            f"{self.api}/uploads/{upload.id}/licenses",
+            params=params,
+            headers=headers,
+            stream=True,
         )
 
         if response.status_code == 200:
-            all_licenses = []
-            scanned_files = response.json()
-            for file_with_findings in scanned_files:
-                file_licenses = Licenses.from_json(file_with_findings)
-                all_licenses.append(file_licenses)
-            return all_licenses
+            return response
 
         elif response.status_code == 403:
             description = f"Getting license for upload {upload.id} {get_options(group)}not authorized"
@@ -363,6 +802,7 @@ class Uploads:
             logger.debug(
                 f"Unpack agent for {upload.uploadname} (id={upload.id}) didn't start yet"
             )
+            response.close()
             time.sleep(3)
             raise TryAgain
 
@@ -402,6 +842,150 @@ class Uploads:
             description = f"Unable to delete upload {upload.id}"
             raise FossologyApiError(description, response)
 
+    def bulk_delete_uploads(
+        self, uploads, group=None, workers=4, wait=False, timeout=None
+    ):
+        """Delete many uploads concurrently
+
+        The deletions are only scheduled by the server. If ``wait`` is True, the uploads
+        are polled until they don't exist anymore or ``timeout`` seconds elapsed. A failed
+        deletion doesn't abort the others.
+
+        :Example:
+
+        >>> results = foss.bulk_delete_uploads(old_uploads, workers=8, wait=True)
+        >>> for result in results:
+        >>>     if not result.ok:
+        >>>         print(f"Deletion of {result.item} failed: {result.error}")
+
+        :param uploads: the uploads to be deleted
+        :param group: the group name to chose while deleting the uploads (default: None)
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param wait: wait until the uploads are deleted (default: False)
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type uploads: list of Upload
+        :type group: string
+        :type workers: int
+        :type wait: boolean
+        :type timeout: int
+        :return: the result of each deletion, with the upload as item
+        :rtype: list of BatchResult
+        """
+
+        def delete(upload):
+            return self.delete_upload(upload, group)
+
+        def deleted(upload):
+            return not self._upload_exists(upload.id, group)
+
+        results = concurrency.run_batch(delete, uploads, workers=workers)
+        if wait:
+            for result in concurrency.poll_batch(deleted, results, timeout, workers):
+                description = (
+                    f"Upload {result.item.id} not deleted after {timeout} seconds"
+                )
+                result.error = FossologyApiError(description)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Deleted {len(results) - len(failed)} of {len(results)} uploads")
+        return results
+
+    def bulk_move_uploads(
+        self, uploads, folder, group=None, workers=4, wait=False, timeout=None
+    ):
+        """Move many uploads to another folder concurrently
+
+        If ``wait`` is True, the uploads are polled until they are found in the
+        destination folder or ``timeout`` seconds elapsed. A failed move doesn't abort
+        the others.
+
+        :param uploads: the uploads to be moved
+        :param folder: the destination Folder
+        :param group: the group name to chose while changing the uploads (default: None)
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param wait: wait until the uploads are moved (default: False)
+        :param timeout: stop waiting after x seconds (default: None, wait forever)
+        :type uploads: list of Upload
+        :type folder: Folder
+        :type group: string
+        :type workers: int
+        :type wait: boolean
+        :type timeout: int
+        :return: the result of each move, with the upload as item
+        :rtype: list of BatchResult
+        """
+
+        def move(upload):
+            return self.move_upload(upload, folder, group)
+
+        def moved(upload):
+            moved_upload, _ = self._get_upload(upload.id, group)
+            return moved_upload is not None and moved_upload.folderid == folder.id
+
+        results = concurrency.run_batch(move, uploads, workers=workers)
+        if wait:
+            for result in concurrency.poll_batch(moved, results, timeout, workers):
+                description = (
+                    f"Upload {result.item.id} not moved after {timeout} seconds"
+                )
+                result.error = FossologyApiError(description)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Moved {len(results) - len(failed)} of {len(results)} uploads")
+        return results
+
+    def bulk_copy_uploads(self, uploads, folder, workers=4):
+        """Copy many uploads to another folder concurrently
+
+        A failed copy doesn't abort the others. The server doesn't return the id of the
+        copies, their completion can't be tracked.
+
+        :param uploads: the uploads to be copied
+        :param folder: the destination Folder
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :type uploads: list of Upload
+        :type folder: Folder
+        :type workers: int
+        :return: the result of each copy, with the upload as item
+        :rtype: list of BatchResult
+        """
+
+        def copy(upload):
+            return self.copy_upload(upload, folder)
+
+        results = concurrency.run_batch(copy, uploads, workers=workers)
+        failed = [result for result in results if not result.ok]
+        logger.info(f"Copied {len(results) - len(failed)} of {len(results)} uploads")
+        return results
+
+    def _upload_exists(self, upload_id, group=None):
+        """Check whether an upload exists, even if it isn't ready yet
+
+        Internal function meant to be called by bulk_delete_uploads()
+
+        API Endpoint: GET /uploads/{id}
+
+        :rtype: boolean
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        headers = {}
+        if group:
+            headers["groupName"] = group
+        response = self.session.get(f"{self.api}/uploads/{upload_id}", headers=headers)
+
+        if response.status_code in (200, 503):
+            return True
+
+        elif response.status_code == 404:
+            return False
+
+        elif response.status_code == 403:
+            description = f"Getting details for upload {upload_id} {get_options(group)}not authorized"
+            raise AuthorizationError(description, response)
+
+        else:
+            description = f"Error while getting details for upload {upload_id}"
+            raise FossologyApiError(description, response)
+
     def list_uploads(
         self, folder=None, group=None, recursive=True, page_size=20, page=1
     ):
@@ -424,6 +1008,26 @@ class Uploads:
         :raises FossologyApiError: if the REST call failed
         :raises AuthorizationError: if the user can't access the group
         """
+        uploads_list, total_pages = self._list_uploads_page(
+            folder, group, recursive, page_size, page
+        )
+        logger.info(
+            f"Retrieved page {page} of uploads, {total_pages or 'Unknown'} pages are in total available"
+        )
+        return uploads_list
+
+    def _list_uploads_page(self, folder, group, recursive, page_size, page):
+        """Get one page of uploads and the total number of pages
+
+        Internal function meant to be called by list_uploads() or iter_uploads()
+
+        API Endpoint: GET /uploads
+
+        :return: the uploads of the page and the total number of pages (None if unknown)
+        :rtype: tuple(list of Upload, int)
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
         params = {}
         headers = {"limit": str(page_size), "page": str(page)}
         if group:
@@ -439,12 +1043,9 @@ class Uploads:
 
         if response.status_code == 200:
             uploads_list = list()
-            for upload in response.json():
+            for upload in response_json(response):
                 uploads_list.append(Upload.from_json(upload))
-            logger.info(
-                f"Retrieved page {page} of uploads, {response.headers.get('X-TOTAL-PAGES', 'Unknown')} pages are in total available"
-            )
-            return uploads_list
+            return uploads_list, response_total_pages(response)
 
         elif response.status_code == 403:
             description = (
@@ -456,6 +1057,94 @@ class Uploads:
             description = "Unable to retrieve the list of uploads"
             raise FossologyApiError(description, response)
 
+    def iter_uploads(
+        self, folder=None, group=None, recursive=True, page_size=100, prefetch=4
+    ):
+        """Iterate over all uploads available to the registered user
+
+        API Endpoint: GET /uploads
+
+        The total number of pages is read from the first response, the following pages
+        are fetched concurrently while the uploads are yielded in order. At most
+        ``prefetch`` pages are requested in advance, which bounds the memory usage.
+
+        If the server doesn't provide the total number of pages, the pages are fetched
+        one after the other until a page isn't full.
+
+        :Example:
+
+        >>> for upload in foss.iter_uploads(folder=foss.rootFolder, page_size=500):
+        >>>     print(upload)
+
+        :param folder: only list uploads from the given folder
+        :param group: list uploads from a specific group (not only your own uploads) (default: None)
+        :param recursive: wether to list uploads from children folders or not (default: True)
+        :param page_size: limit the number of uploads per page (default: 100)
+        :param prefetch: the maximum number of pages fetched in advance (default: 4)
+        :type folder: Folder
+        :type group: string
+        :type recursive: boolean
+        :type page_size: int
+        :type prefetch: int
+        :return: the uploads
+        :rtype: generator of Upload
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+
+        def fetch_page(page):
+            return self._list_uploads_page(folder, group, recursive, page_size, page)
+
+        yield from concurrency.iter_pages(fetch_page, page_size, workers=prefetch)
+
+    def walk_uploads(self, root=None, group=None, workers=4, page_size=100):
+        """Iterate over the uploads of each folder of a folder tree
+
+        The folders are taken from the index of the folders, the uploads of each folder
+        are listed without recursion. The pages of uploads are fetched concurrently,
+        with at most ``workers`` requests in flight. The uploads are yielded as the pages
+        arrive, not in the order of the folders.
+
+        :Example:
+
+        >>> for folder, upload in foss.walk_uploads(workers=8):
+        >>>     print(foss.folders.path(folder), upload.uploadname)
+
+        :param root: the folder the walk starts from (default: None, the root folder)
+        :param group: list uploads from a specific group (not only your own uploads) (default: None)
+        :param workers: the maximum number of concurrent requests (default: 4)
+        :param page_size: limit the number of uploads per page (default: 100)
+        :type root: Folder
+        :type group: string
+        :type workers: int
+        :type page_size: int
+        :return: the uploads and the folder they are stored in
+        :rtype: generator of tuple(Folder, Upload)
+        :raises FossologyApiError: if the REST call failed
+        :raises AuthorizationError: if the user can't access the group
+        """
+        if root is not None and root not in self.folders:
+            self.refresh_folders()
+
+        def fetch_page(task):
+            folder, page = task
+            uploads_list, total_pages = self._list_uploads_page(
+                folder, group, False, page_size, page
+            )
+            if total_pages is None:
+                # Pages are fetched one after the other until a page isn't full
+                if len(uploads_list) == page_size:
+                    return uploads_list, [(folder, page + 1)]
+                return uploads_list, []
+            if page == 1:
+                return uploads_list, [(folder, p) for p in range(2, total_pages + 1)]
+            return uploads_list, []
+
+        tasks = [(folder, 1) for folder, _ in self.folders.walk(root)]
+        for (folder, _), uploads_list in concurrency.crawl(fetch_page, tasks, workers):
+            for upload in uploads_list:
+                yield folder, upload
+
     def move_upload(self, upload, folder, group=None):
         """Move an upload to another folder
 
@@ -7,9 +7,11 @@ import time
 from typing import Dict
 
 import pytest
+import responses
 
 import fossology
 from fossology.exceptions import AuthenticationError, FossologyApiError
+from fossology.folders import FolderIndex
 from fossology.obj import AccessLevel, Agents, Folder, TokenScope, Upload
 
 logger = logging.getLogger("fossology")
@@ -116,6 +118,56 @@ def foss(foss_server: str, foss_token: str, foss_agents: Agents) -> fossology.Fo
     foss.close()
 
 
+@pytest.fixture
+def folder_tree(foss: fossology.Fossology, foss_server: str):
+    """Replace the index of the folders of the session by mocked folders
+
+    The factory takes the folders below the root folder as (id, name, parent id), mocks
+    GET /folders with them and returns the new index. The index of the session is
+    restored after the test.
+    """
+    folders = foss.folders
+
+    def make_tree(tree):
+        root = foss.rootFolder
+        folders_list = [
+            {"id": root.id, "name": root.name, "description": "", "parent": None}
+        ]
+        for folder_id, name, parent in tree:
+            folders_list.append(
+                {"id": folder_id, "name": name, "description": "", "parent": parent}
+            )
+        responses.add(responses.GET, f"{foss_server}/api/v1/folders", json=folders_list)
+        foss.folders = FolderIndex(map(Folder.from_json, folders_list), root.id)
+        return foss.folders
+
+    yield make_tree
+    foss.folders = folders
+
+
+@pytest.fixture(scope="session")
+def upload_json(foss: fossology.Fossology):
+    """Build the JSON data of a mocked upload, in the root folder by default
+
+    The factory takes the upload id and the fields to override, use
+    ``Upload.from_json()`` to get the Upload object.
+    """
+
+    def make_upload(upload_id, **fields):
+        return {
+            "folderid": foss.rootFolder.id,
+            "foldername": foss.rootFolder.name,
+            "id": upload_id,
+            "description": "",
+            "uploadname": f"upload-{upload_id}",
+            "uploaddate": "2021-01-01",
+            "hash": {"sha1": "", "md5": "", "sha256": "", "size": ""},
+            **fields,
+        }
+
+    return make_upload
+
+
 @pytest.fixture(scope="session")
 def test_file_path() -> str:
     return "tests/files/base-files_11.tar.xz"
@@ -0,0 +1,225 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from email.parser import BytesParser
+
+import pytest
+
+from fossology.aio import AsyncFossology
+from fossology.exceptions import AuthorizationError, FossologyApiError
+from fossology.obj import Folder, Upload
+
+httpx = pytest.importorskip("httpx")
+
+FOSS_URL = "http://fossology/repo"
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def upload_json(upload_id):
+    return {
+        "folderid": 2,
+        "foldername": "Software Repository",
+        "id": upload_id,
+        "description": "",
+        "uploadname": f"upload-{upload_id}",
+        "uploaddate": "2021-01-01",
+        "hash": {"sha1": "A" * 40, "md5": None, "sha256": None, "size": 10},
+    }
+
+
+class FakeServer:
+
+    """Handler of an httpx.MockTransport answering the requests of the tests"""
+
+    def __init__(self):
+        self.routes = {
+            ("GET", "/users"): lambda request: httpx.Response(
+                200,
+                json=[
+                    {
+                        "id": 3,
+                        "name": "fossy",
+                        "description": "",
+                        "email": "fossy@example.com",
+                        "accessLevel": "admin",
+                        "rootFolderId": 2,
+                        "emailNotification": True,
+                    }
+                ],
+            ),
+            ("GET", "/version"): lambda request: httpx.Response(
+                200, json={"version": "1.3.0"}
+            ),
+            ("GET", "/folders"): lambda request: httpx.Response(
+                200,
+                json=[
+                    {
+                        "id": 2,
+                        "name": "Software Repository",
+                        "description": "",
+                        "parent": None,
+                    },
+                    {"id": 4, "name": "Child", "description": "", "parent": 2},
+                ],
+            ),
+            ("GET", "/folders/2"): lambda request: httpx.Response(
+                200,
+                json={
+                    "id": 2,
+                    "name": "Software Repository",
+                    "description": "",
+                    "parent": None,
+                },
+            ),
+        }
+        self.requests = list()
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path[len("/repo/api/v1") :]
+        handler = self.routes.get((request.method, path))
+        if handler is None:
+            return httpx.Response(404, json={"message": "Not found"})
+        return handler(request)
+
+    def client(self):
+        return AsyncFossology(
+            FOSS_URL, "token", "fossy", transport=httpx.MockTransport(self)
+        )
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+def test_async_open(server: FakeServer):
+    async def open_session():
+        async with server.client() as foss:
+            return foss
+
+    foss = run(open_session())
+    assert foss.user.name == "fossy"
+    assert foss.version == "1.3.0"
+    assert foss.rootFolder.id == 2
+    assert foss.folders.get_by_path("Child").id == 4
+    assert foss.capabilities.groups
+    assert server.requests[0].headers["Authorization"] == "Bearer token"
+
+
+def test_async_detail_upload_retry(server: FakeServer):
+    responses = [
+        httpx.Response(503, headers={"Retry-After": "0"}, json={"message": "Busy"}),
+        httpx.Response(200, json=upload_json(5)),
+    ]
+    server.routes[("GET", "/uploads/5")] = lambda request: responses.pop(0)
+
+    async def detail_uploads():
+        async with server.client() as foss:
+            return await foss.detail_upload(5, group="test")
+
+    upload = run(detail_uploads())
+    assert isinstance(upload, Upload)
+    assert upload.id == 5
+    assert server.requests[-1].headers["groupName"] == "test"
+    assert not responses
+
+
+def test_async_errors(server: FakeServer):
+    server.routes[("DELETE", "/uploads/5")] = lambda request: httpx.Response(
+        403, json={"message": "Forbidden"}
+    )
+
+    async def fail():
+        async with server.client() as foss:
+            with pytest.raises(FossologyApiError) as excinfo:
+                await foss.detail_job(0)
+            assert "Error while getting details for job 0" in str(excinfo.value)
+            with pytest.raises(AuthorizationError):
+                await foss.delete_upload(Upload.from_json(upload_json(5)), "test")
+
+    run(fail())
+
+
+def test_async_iter_uploads(server: FakeServer):
+    def list_uploads(request):
+        page = int(request.headers["page"])
+        return httpx.Response(
+            200,
+            headers={"X-TOTAL-PAGES": "3"},
+            json=[upload_json(page * 10 + i) for i in range(2)],
+        )
+
+    server.routes[("GET", "/uploads")] = list_uploads
+
+    async def iter_uploads():
+        async with server.client() as foss:
+            return [upload.id async for upload in foss.iter_uploads(page_size=2)]
+
+    assert run(iter_uploads()) == [10, 11, 20, 21, 30, 31]
+    pages = [request.headers["page"] for request in server.requests[4:]]
+    assert sorted(pages) == ["1", "2", "3"]
+
+
+def test_async_upload_file(server: FakeServer, test_file_path: str):
+    received = dict()
+
+    def post_upload(request):
+        received["headers"] = request.headers
+        received["content"] = request.read()
+        return httpx.Response(201, json={"message": 7})
+
+    server.routes[("POST", "/uploads")] = post_upload
+    server.routes[("GET", "/uploads/7")] = lambda request: httpx.Response(
+        200, json=upload_json(7)
+    )
+
+    async def upload_file():
+        async with server.client() as foss:
+            return await foss.upload_file(
+                Folder(4, "Child", "", 2), file=test_file_path, description="Test"
+            )
+
+    upload = run(upload_file())
+    assert upload.id == 7
+    headers = received["headers"]
+    assert headers["folderId"] == "4"
+    assert headers["uploadType"] == "server"
+    assert int(headers["Content-Length"]) == len(received["content"])
+    message = BytesParser().parsebytes(
+        f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode()
+        + received["content"]
+    )
+    with open(test_file_path, "rb") as fp:
+        assert message.get_payload()[0].get_payload(decode=True) == fp.read()
+
+
+def test_async_iter_upload_licenses(server: FakeServer):
+    findings = [
+        {
+            "filePath": f"upload/file-{i}.c",
+            "findings": {"scanner": ["MIT"], "conclusion": None},
+        }
+        for i in range(50)
+    ]
+    server.routes[("GET", "/uploads/5/licenses")] = lambda request: httpx.Response(
+        200, content=json.dumps(findings).encode()
+    )
+
+    async def iter_licenses():
+        async with server.client() as foss:
+            upload = Upload.from_json(upload_json(5))
+            return [
+                licenses.filepath
+                async for licenses in foss.iter_upload_licenses(
+                    upload, agent="ojo", chunk_size=64
+                )
+            ]
+
+    assert run(iter_licenses()) == [finding["filePath"] for finding in findings]
+    assert server.requests[-1].url.params["agent"] == "ojo"
@@ -0,0 +1,177 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import time
+
+import responses
+
+from fossology import Fossology
+from fossology.cache import FilesearchIndex, SessionCache
+from fossology.folders import FolderIndex
+from fossology.obj import Agents, Folder, User
+
+
+def test_session_cache(foss_server: str, foss_token: str, tmp_path):
+    cache = SessionCache(str(tmp_path))
+    foss = Fossology(foss_server, foss_token, "fossy", session_cache=cache)
+    foss.close()
+
+    with responses.RequestsMock() as rsps:
+        # No request is sent to the server
+        cached_foss = Fossology(foss_server, foss_token, "fossy", session_cache=cache)
+        assert not rsps.calls
+    assert cached_foss.version == foss.version
+    assert cached_foss.user.id == foss.user.id
+    assert cached_foss.user.agents.to_dict() == foss.user.agents.to_dict()
+    assert cached_foss.rootFolder.id == foss.rootFolder.id
+    assert [folder.id for folder in cached_foss.folders] == [
+        folder.id for folder in foss.folders
+    ]
+    cached_foss.close()
+
+
+def test_session_cache_invalidation(foss_server: str, foss_token: str, tmp_path):
+    cache = SessionCache(str(tmp_path), ttl=1)
+    foss = Fossology(foss_server, foss_token, "fossy", session_cache=cache)
+    assert cache.load(foss_server, foss_token, "fossy")
+    foss.invalidate_cache()
+    assert not cache.load(foss_server, foss_token, "fossy")
+
+    cache.store(foss_server, foss_token, "fossy", {"version": foss.version})
+    time.sleep(1.5)
+    assert not cache.load(foss_server, foss_token, "fossy")
+
+    cache.store(foss_server, foss_token, "fossy", {"version": foss.version})
+    cache.clear()
+    assert not list(tmp_path.iterdir())
+    foss.close()
+
+
+def test_filesearch_index(tmp_path):
+    index = FilesearchIndex(str(tmp_path / "filesearch.sqlite"), ttl=60, pending_ttl=1)
+    cleared = {"hash": {"sha1": "AAAA"}, "findings": {"conclusion": ["MIT"]}}
+    uncleared = {"hash": {"sha1": "BBBB"}, "findings": {"conclusion": []}}
+    unknown = {"hash": {"sha1": "CCCC"}, "message": "Not found"}
+    index.store(
+        "http://fossology",
+        [(("sha1", "aaaa"), cleared), (("sha1", "BBBB"), uncleared)],
+    )
+    index.store("http://fossology", [(("sha1", "CCCC"), unknown)], group="test")
+
+    hashes = [("sha1", "AAAA"), ("sha1", "bbbb"), ("sha1", "CCCC"), ("md5", "AAAA")]
+    assert index.lookup("http://fossology", hashes) == {
+        ("sha1", "AAAA"): cleared,
+        ("sha1", "BBBB"): uncleared,
+    }
+    assert index.lookup("http://fossology", hashes, group="test") == {
+        ("sha1", "CCCC"): unknown
+    }
+    assert not index.lookup("http://other", hashes)
+
+    # Results of files which aren't cleared expire sooner
+    time.sleep(1.5)
+    assert list(index.lookup("http://fossology", hashes)) == [("sha1", "AAAA")]
+    index.purge()
+    assert not index.lookup("http://fossology", hashes, group="test")
+
+    index.invalidate("http://fossology", [("sha1", "aaaa")])
+    assert not index.lookup("http://fossology", hashes)
+
+    # All results of a server are removed, whatever their group
+    index.store("http://fossology", [(("sha1", "AAAA"), cleared)])
+    index.store("http://fossology", [(("sha1", "CCCC"), unknown)], group="test")
+    index.store("http://other", [(("sha1", "AAAA"), cleared)])
+    index.invalidate("http://fossology", group="test")
+    assert not index.lookup("http://fossology", hashes, group="test")
+    assert index.lookup("http://fossology", hashes)
+    index.store("http://fossology", [(("sha1", "CCCC"), unknown)], group="test")
+    index.invalidate("http://fossology")
+    assert not index.lookup("http://fossology", hashes)
+    assert not index.lookup("http://fossology", hashes, group="test")
+    assert index.lookup("http://other", hashes)
+    index.store("http://fossology", [(("sha1", "AAAA"), cleared)])
+    index.clear()
+    assert not index.lookup("http://fossology", hashes)
+    index.close()
+
+
+def test_session_cache_user_root_folder(foss_server: str, foss_user: dict, tmp_path):
+    # The root folder of the user is a subfolder of the top-level folder
+    user = User.from_json(dict(foss_user, name="fossy", rootFolderId=2))
+    user.agents = Agents.from_json(user.agents)
+    folders = [
+        Folder(1, "Software Repository", "", None),
+        Folder(2, "Team", "", 1),
+        Folder(3, "Product", "", 2),
+    ]
+    cache = SessionCache(str(tmp_path))
+    cache.store(
+        foss_server,
+        "token",
+        "fossy",
+        {
+            "version": "1.2.1",
+            "user": user,
+            "rootFolder": folders[1],
+            "folders": FolderIndex(folders, 2),
+        },
+    )
+
+    with responses.RequestsMock() as rsps:
+        cached_foss = Fossology(foss_server, "token", "fossy", session_cache=cache)
+        assert not rsps.calls
+    assert cached_foss.folders.root == 2
+    assert cached_foss.get_folder_by_path("/Product", refresh=False).id == 3
+    assert cached_foss.folders.path(3) == "/Product"
+    assert [folder.id for folder, _ in cached_foss.folders.walk()] == [2, 3]
+
+    # Entries written without the root folder are fetched again
+    entries = json.loads((tmp_path / os.listdir(tmp_path)[0]).read_text())
+    entries["folders"]["value"] = entries["folders"]["value"]["folders"]
+    (tmp_path / os.listdir(tmp_path)[0]).write_text(json.dumps(entries))
+    assert "folders" not in cache.load(foss_server, "token", "fossy")
+    cached_foss.close()
+
+
+@responses.activate
+def test_session_cache_folder_changes(foss_server: str, foss_user: dict, tmp_path):
+    user = User.from_json(dict(foss_user, name="fossy"))
+    user.agents = Agents.from_json(user.agents)
+    folders = [
+        Folder(1, "Software Repository", "", None),
+        Folder(2, "A", "", 1),
+        Folder(3, "B", "", 2),
+    ]
+    cache = SessionCache(str(tmp_path))
+    cache.store(
+        foss_server,
+        "token",
+        "fossy",
+        {
+            "version": "1.2.1",
+            "user": user,
+            "rootFolder": folders[0],
+            "folders": FolderIndex(folders, 1),
+        },
+    )
+    foss = Fossology(foss_server, "token", "fossy", session_cache=cache)
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/folders/3", status=202)
+    foss.delete_folder(foss.get_folder_by_path("/A/B", refresh=False))
+    responses.add(
+        responses.POST,
+        f"{foss_server}/api/v1/folders",
+        status=201,
+        json={"code": 201, "message": 4},
+    )
+    foss.create_folder(folders[1], "C")
+
+    # Another session sharing the cache sees the changes without any request
+    calls = len(responses.calls)
+    other_foss = Fossology(foss_server, "token", "fossy", session_cache=cache)
+    assert not other_foss.get_folder_by_path("/A/B", refresh=False)
+    assert other_foss.get_folder_by_path("/A/C", refresh=False).id == 4
+    assert len(responses.calls) == calls
+    foss.close()
+    other_foss.close()
@@ -0,0 +1,29 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from fossology.capabilities import Capabilities
+from fossology.exceptions import FossologyUnsupported
+
+
+def test_capabilities():
+    capabilities = Capabilities("1.1.3")
+    assert capabilities.to_dict() == {
+        "filesearch": True,
+        "upload_hash": True,
+        "search_upload": True,
+        "license": True,
+        "groups": False,
+    }
+    assert str(capabilities) == (
+        "Capabilities of API version 1.1.3: filesearch, upload_hash, search_upload, license"
+    )
+    capabilities.require("license", "/license")
+    with pytest.raises(FossologyUnsupported) as excinfo:
+        capabilities.require("groups", "/groups")
+    assert (
+        "Endpoint /groups is not supported by your Fossology API version 1.1.3"
+        in excinfo.value.message
+    )
+    assert not Capabilities("1.0.16").filesearch
@@ -0,0 +1,43 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from fossology import codec
+
+
+@pytest.fixture(params=sorted(codec.CODECS))
+def json_codec(request):
+    previous = codec.set_codec(request.param)
+    yield codec.get_codec()
+    codec.set_codec(previous)
+
+
+def test_codec_roundtrip(json_codec: codec.JSONCodec):
+    document = {"message": "Ünïcode €", "ids": [1, 2, 3], "done": True, "eta": None}
+    encoded = codec.dumps(document)
+    assert isinstance(encoded, str)
+    assert json.loads(encoded) == document
+    assert codec.loads(encoded) == document
+    assert codec.loads(encoded.encode()) == document
+
+
+@pytest.mark.parametrize("document", [b"", b"<html>", b'{"message": '])
+def test_codec_invalid_document(json_codec: codec.JSONCodec, document: bytes):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(document)
+
+
+def test_set_codec():
+    previous = codec.set_codec("json")
+    try:
+        assert codec.get_codec() is codec.STDLIB_CODEC
+        with pytest.raises(ValueError):
+            codec.set_codec("unknown")
+        custom = codec.JSONCodec("custom", json.loads, lambda obj: "[]")
+        codec.set_codec(custom)
+        assert codec.dumps({"a": 1}) == "[]"
+    finally:
+        codec.set_codec(previous)
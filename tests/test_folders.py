@@ -1,6 +1,7 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import json
 import secrets
 import time
 
@@ -146,3 +147,126 @@ def test_delete_folder_error(foss_server: str, foss: Fossology):
     with pytest.raises(FossologyApiError) as excinfo:
         foss.delete_folder(folder)
     assert f"Unable to delete folder {folder.id}" in str(excinfo.value)
+
+
+@responses.activate
+def test_folder_index(foss_server: str, foss: Fossology, folder_tree):
+    root = foss.rootFolder
+    folder_tree(
+        [
+            (9001, "Top", root.id),
+            (9002, "Product", 9001),
+            (9003, "1.2", 9002),
+            (9004, "1.3", 9002),
+        ]
+    )
+
+    folder = foss.get_folder_by_path("/Top/Product/1.2/")
+    assert folder.id == 9003
+    assert foss.folders.path(folder) == "/Top/Product/1.2"
+    assert foss.get_folder_by_path("/").id == root.id
+    assert [f.name for f, _ in foss.folders.walk(9001)] == [
+        "Top",
+        "Product",
+        "1.2",
+        "1.3",
+    ]
+    assert not responses.calls
+
+    # Unknown paths are looked up on the server once
+    assert not foss.get_folder_by_path("/Top/Other")
+    assert len(responses.calls) == 1
+
+    # The index follows renamed and deleted folders
+    renamed = {"id": 9002, "name": "Renamed", "description": "", "parent": 9001}
+    responses.add(responses.PATCH, f"{foss_server}/api/v1/folders/9002")
+    responses.add(responses.GET, f"{foss_server}/api/v1/folders/9002", json=renamed)
+    foss.update_folder(foss.folders.get(9002), name="Renamed")
+    assert foss.folders.path(9003) == "/Top/Renamed/1.2"
+    assert not foss.get_folder_by_path("/Top/Product", refresh=False)
+
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/folders/9002", status=202)
+    foss.delete_folder(foss.folders.get(9002))
+    assert [f.id for f, _ in foss.folders.walk(9001)] == [9001]
+    assert 9003 not in foss.folders
+
+
+@responses.activate
+def test_folder_index_list(foss: Fossology, folder_tree):
+    root = foss.rootFolder
+    folders = folder_tree([(9001, "Top", root.id), (9002, "Product", 9001)])
+
+    # The index can still be used like the former list of folders
+    assert len(folders) == 3
+    assert folders[0].id == root.id
+    assert [folder.id for folder in folders[1:]] == [9001, 9002]
+    assert folders == list(folders)
+    folders.append(Folder(9003, "Other", "", root.id))
+    assert folders[-1].id == 9003
+    folders.remove(folders[-1])
+    with pytest.raises(ValueError):
+        folders.remove(9003)
+
+    # Listed folders keep the root folder as parent, the index has the actual parents
+    assert {folder.parent for folder in foss.list_folders()} == {root.id}
+    assert folders.get(9002).parent == 9001
+
+
+@responses.activate
+def test_ensure_folder_path(foss_server: str, foss: Fossology, folder_tree):
+    folder_tree([(9001, "BU", foss.rootFolder.id)])
+    created = []
+
+    def create(request):
+        created.append(
+            (
+                request.headers["parentFolder"],
+                request.headers["folderName"],
+                request.headers["folderDescription"],
+            )
+        )
+        return 201, {}, json.dumps({"code": 201, "message": 9001 + len(created)})
+
+    responses.add_callback(
+        responses.POST, f"{foss_server}/api/v1/folders", callback=create
+    )
+    folder = foss.ensure_folder_path("/BU/Product/1.2", description="Release")
+    assert created == [("9001", "Product", "Release"), ("9002", "1.2", "Release")]
+    assert (folder.id, folder.name, folder.parent) == (9003, "1.2", 9002)
+    assert folder.description == "Release"
+    assert foss.folders.path(folder) == "/BU/Product/1.2"
+    # Only the folder creations were requested
+    assert len(responses.calls) == 2
+
+    assert foss.ensure_folder_path("BU/Product/1.2/").id == 9003
+    assert len(responses.calls) == 2
+
+    # Folders created without description get an empty description
+    folder = foss.ensure_folder_path("/BU/Product/1.3")
+    assert created[-1] == ("9002", "1.3", "")
+    assert folder.description == ""
+
+
+@responses.activate
+def test_bulk_folders(foss_server: str, foss: Fossology, folder_tree):
+    root = foss.rootFolder
+    folders = folder_tree(
+        [(9001, "A", root.id), (9002, "B", root.id), (9003, "Archive", root.id)]
+    )
+    a, b, archive = (folders.get(folder_id) for folder_id in (9001, 9002, 9003))
+
+    for folder in (a, b):
+        moved = dict(folder.to_dict(), parent=9003)
+        url = f"{foss_server}/api/v1/folders/{folder.id}"
+        responses.add(responses.PUT, url, status=202)
+        responses.add(responses.GET, url, json=moved)
+    results = foss.bulk_move_folders([a, b], archive, workers=2, wait=True)
+    assert all(result.ok for result in results)
+    assert [result.result.parent for result in results] == [9003, 9003]
+    assert foss.folders.path(9002) == "/Archive/B"
+
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/folders/9003", status=202)
+    responses.add(responses.GET, f"{foss_server}/api/v1/folders/9003", status=404)
+    results = foss.bulk_delete_folders([archive], wait=True, timeout=10)
+    assert results[0].ok
+    assert 9002 not in foss.folders
@@ -1,13 +1,18 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import json
 import secrets
 
 import pytest
 import responses
 
 import fossology
-from fossology.exceptions import FossologyApiError, FossologyUnsupported
+from fossology.exceptions import (
+    AuthorizationError,
+    FossologyApiError,
+    FossologyUnsupported,
+)
 from fossology.obj import Group
 
 
@@ -51,3 +56,75 @@ def test_create_group(foss: fossology.Fossology):
             f"Group {name} already exists, failed to create group or no group name provided"
             in str(excinfo.value)
         )
+
+
+@responses.activate
+def test_fan_out_groups(foss_server: str, foss: fossology.Fossology, upload_json):
+    if fossology.versiontuple(foss.version) < fossology.versiontuple("1.2.1"):
+        return
+    groups = [{"id": i, "name": f"group-{i}"} for i in range(4)]
+    responses.add(responses.GET, f"{foss_server}/api/v1/groups", json=groups)
+
+    def uploads(request):
+        group = request.headers["groupName"]
+        if group == "group-3":
+            return 403, {}, json.dumps({"message": "Not a member"})
+        group_id = int(group.split("-")[1])
+        uploads = [
+            upload_json(upload_id)
+            # Uploads shared by the groups are listed for each of them
+            for upload_id in (group_id, group_id + 1, 10)
+        ]
+        return 200, {"X-TOTAL-PAGES": "1"}, json.dumps(uploads)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/uploads", callback=uploads
+    )
+    merged, errors = foss.fan_out_groups(foss.iter_uploads, workers=2)
+    assert [upload.id for upload in merged] == [0, 1, 10, 2, 3]
+    assert list(errors) == ["group-3"]
+    assert "not authorized" in errors["group-3"].message
+
+    merged, errors = foss.fan_out_groups(
+        "list_uploads",
+        groups=["group-1", "group-2"],
+        key=lambda upload: upload.uploadname,
+    )
+    assert [upload.id for upload in merged] == [1, 2, 10, 3]
+    assert not errors
+
+    errors = dict()
+    streamed = foss.iter_fan_out_groups(foss.iter_uploads, workers=2, errors=errors)
+    received = dict((upload.id, group) for group, upload in streamed)
+    assert sorted(received) == [0, 1, 2, 3, 10]
+    assert received[0] == "group-0" and received[3] == "group-2"
+    assert list(errors) == ["group-3"]
+    with pytest.raises(AuthorizationError):
+        list(foss.iter_fan_out_groups(foss.iter_uploads, groups=["group-3"]))
+
+    # Closing the generator early stops the queries
+    streamed = foss.iter_fan_out_groups(foss.iter_uploads, workers=1, buffer_size=1)
+    next(streamed)
+    streamed.close()
+
+
+def test_fan_out_groups_key(foss: fossology.Fossology):
+    def items(group):
+        return [{"name": "shared"}, {"name": group}]
+
+    with pytest.raises(TypeError) as excinfo:
+        foss.fan_out_groups(items, groups=["group-1", "group-2"])
+    assert "pass key=" in str(excinfo.value)
+
+    merged, _ = foss.fan_out_groups(
+        items, groups=["group-1", "group-2"], key=lambda item: item["name"]
+    )
+    assert merged == [{"name": "shared"}, {"name": "group-1"}, {"name": "group-2"}]
+    streamed = foss.iter_fan_out_groups(
+        items, groups=["group-1", "group-2"], key=lambda item: item["name"]
+    )
+    assert sorted(item["name"] for _, item in streamed) == [
+        "group-1",
+        "group-2",
+        "shared",
+    ]
@@ -1,6 +1,7 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import json
 import secrets
 from typing import Dict
 
@@ -44,6 +45,97 @@ def test_schedule_jobs(foss: Fossology, upload: Upload, foss_schedule_agents: Di
     assert jobs[0].id == job.id
 
 
+@responses.activate
+def test_iter_jobs_and_since(foss_server: str, foss: Fossology):
+    total = 12
+
+    def jobs_page(request):
+        page_size = int(request.headers["limit"])
+        page = int(request.headers["page"])
+        job_ids = list(range(total, 0, -1))[(page - 1) * page_size : page * page_size]
+        jobs = [
+            {
+                "id": job_id,
+                "name": "test",
+                "queueDate": "2021-01-01",
+                "uploadId": 1,
+                "userId": 1,
+                "groupId": 1,
+                "eta": 0,
+                "status": "Completed",
+            }
+            for job_id in job_ids
+        ]
+        headers = {"X-TOTAL-PAGES": str(-(-total // page_size))}
+        return 200, headers, json.dumps(jobs)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/jobs", callback=jobs_page
+    )
+    jobs = list(foss.iter_jobs(page_size=5))
+    assert [job.id for job in jobs] == list(range(total, 0, -1))
+    assert len(responses.calls) == 3
+
+    responses.calls.reset()
+    jobs = foss.list_jobs_since(10, page_size=5)
+    assert [job.id for job in jobs] == [12, 11]
+    assert len(responses.calls) == 1
+
+    responses.calls.reset()
+    jobs = foss.list_jobs_since(3, page_size=5)
+    assert len(jobs) == 9
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_wait_for_jobs(foss_server: str, foss: Fossology):
+    def job(job_id, status):
+        return {
+            "id": job_id,
+            "name": "test",
+            "queueDate": "2021-01-01",
+            "uploadId": 1,
+            "userId": 1,
+            "groupId": 1,
+            "eta": 1,
+            "status": status,
+        }
+
+    for job_id in (1, 2):
+        responses.add(
+            responses.GET,
+            f"{foss_server}/api/v1/jobs/{job_id}",
+            json=job(job_id, "Processing"),
+        )
+        responses.add(
+            responses.GET,
+            f"{foss_server}/api/v1/jobs/{job_id}",
+            json=job(job_id, "Completed"),
+        )
+    responses.add(responses.GET, f"{foss_server}/api/v1/jobs/3", status=404)
+
+    finished = []
+    jobs = foss.wait_for_jobs([1, 2], callback=lambda job: finished.append(job.id))
+    assert [job.status for job in jobs] == ["Completed", "Completed"]
+    assert sorted(finished) == [1, 2]
+
+    # The callback isn't called for jobs still running when the timeout expires
+    responses.add(
+        responses.GET, f"{foss_server}/api/v1/jobs/4", json=job(4, "Processing")
+    )
+    finished.clear()
+    jobs = foss.wait_for_jobs(
+        [4], timeout=0, callback=lambda job: finished.append(job.id)
+    )
+    assert [job.status for job in jobs] == ["Processing"]
+    assert not finished
+
+    with foss.job_waiter() as waiter:
+        with pytest.raises(FossologyApiError) as excinfo:
+            waiter.add(3).result()
+    assert "Error while getting details for job 3" in str(excinfo.value)
+
+
 @responses.activate
 def test_schedule_job_error(foss_server: str, foss: Fossology, upload: Upload):
     responses.add(responses.POST, f"{foss_server}/api/v1/jobs", status=404)
@@ -1,11 +1,15 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import json
+import os
+
 import pytest
 import responses
 
 import fossology
 from fossology.exceptions import FossologyApiError, FossologyUnsupported
+from fossology.license import LicenseCache
 from fossology.obj import License
 
 short = "GPL-2.0+"
@@ -39,3 +43,51 @@ def test_detail_license(foss: fossology.Fossology):
         license = foss.detail_license(short)
         assert license
         assert type(license) == License
+
+
+@responses.activate
+def test_detail_licenses(foss_server: str, foss: fossology.Fossology, tmp_path):
+    if fossology.versiontuple(foss.version) < fossology.versiontuple("1.1.3"):
+        return
+
+    def license(request):
+        name = request.headers["shortName"]
+        if name == "Unknown":
+            return 404, {}, json.dumps({"code": 404, "message": "No license found"})
+        body = {"id": 1, "shortName": name, "fullName": name, "text": "", "risk": 1}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/license", callback=license
+    )
+    foss.license_cache = LicenseCache(path=str(tmp_path / "licenses.json"))
+    try:
+        results = foss.detail_licenses(["MIT", "GPL-2.0-only", "MIT", "Unknown"])
+        assert list(results) == ["MIT", "GPL-2.0-only", "Unknown"]
+        assert results["MIT"].result.shortName == "MIT"
+        assert "Unable to get license Unknown" in results["Unknown"].error.message
+        assert len(responses.calls) == 3
+
+        # Cached licenses are not requested again, even by a new session
+        assert foss.detail_license("GPL-2.0-only").fullName == "GPL-2.0-only"
+        foss.license_cache = LicenseCache(path=str(tmp_path / "licenses.json"))
+        saved = os.stat(tmp_path / "licenses.json")
+        results = foss.detail_licenses(["MIT", "GPL-2.0-only"])
+        assert all(result.ok for result in results.values())
+        assert len(responses.calls) == 3
+        # The cache file isn't written again if no license was fetched
+        assert os.stat(tmp_path / "licenses.json").st_ino == saved.st_ino
+    finally:
+        foss.license_cache = None
+
+
+def test_license_cache():
+    cache = LicenseCache(maxsize=2, ttl=60)
+    for name in ("MIT", "BSD-3-Clause", "Apache-2.0"):
+        cache.put("server", name, License(1, name, name, "", 1))
+        cache.get("server", "MIT")
+    assert cache.get("server", "MIT")
+    assert not cache.get("server", "BSD-3-Clause")
+    assert not cache.get("other", "MIT")
+    cache.put("server", "MIT", License(1, "MIT", "MIT", "", 1), expires=1)
+    assert not cache.get("server", "MIT")
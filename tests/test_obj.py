@@ -0,0 +1,79 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from fossology.obj import (
+    Job,
+    SlottedFolder,
+    SlottedHash,
+    SlottedJob,
+    SlottedUpload,
+    Upload,
+)
+
+job = {
+    "id": 1,
+    "name": "upload.tar.gz",
+    "queueDate": "2021-01-01 12:00:00",
+    "uploadId": 2,
+    "userId": 3,
+    "groupId": 3,
+    "eta": 0,
+    "status": "Completed",
+}
+
+
+upload = {
+    "folderid": 1,
+    "foldername": "Software Repository",
+    "id": 2,
+    "description": "",
+    "uploadname": "upload.tar.gz",
+    "uploaddate": "2021-01-01",
+    "hash": {"sha1": "", "md5": "", "sha256": "", "size": 0},
+}
+
+
+def test_models_are_plain():
+    plain = Upload.from_json(upload)
+    plain.comment = "kept"
+    assert vars(plain)["comment"] == "kept"
+    assert vars(plain.hash)["additional_info"] == {}
+
+
+def test_slotted_models():
+    slotted = SlottedUpload.from_json(upload)
+    assert not hasattr(slotted, "__dict__")
+    assert isinstance(slotted.hash, SlottedHash)
+    assert not hasattr(slotted.hash, "__dict__")
+    assert slotted.hash.to_dict() == Upload.from_json(upload).hash.to_dict()
+    assert str(slotted) == str(Upload.from_json(upload))
+    with pytest.raises(AttributeError):
+        slotted.unknown = True
+
+
+def test_additional_info():
+    known = Job.from_json(job)
+    assert known.additional_info == {}
+    known.additional_info["comment"] = "kept"
+    assert known.additional_info == {"comment": "kept"}
+    assert Job.from_json(job).additional_info == {}
+
+    slotted = SlottedJob.from_json(job)
+    assert slotted.additional_info == {}
+    assert slotted.additional_info is SlottedJob.from_json(job).additional_info
+    with pytest.raises(TypeError):
+        slotted.additional_info["comment"] = "kept"
+
+    unknown = SlottedJob.from_json({**job, "priority": 1})
+    assert unknown.additional_info == {"priority": 1}
+
+
+def test_slotted_to_dict():
+    folder = {"id": 2, "name": "Folder", "description": "", "parent": 1}
+    assert SlottedFolder.from_json(folder).to_dict() == folder
+    assert SlottedFolder.from_json({**folder, "size": 3}).to_dict() == {
+        **folder,
+        "size": 3,
+    }
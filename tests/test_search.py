@@ -1,12 +1,15 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import json
 import secrets
 
 import pytest
 import responses
 
 from fossology import Fossology, versiontuple
+from fossology.cache import FilesearchIndex
+from fossology.capabilities import Capabilities
 from fossology.exceptions import (
     AuthorizationError,
     FossologyApiError,
@@ -70,6 +73,66 @@ def test_search_upload_does_not_exist(foss: Fossology):
         assert not search_result
 
 
+@responses.activate
+def test_search_upload_unsupported(
+    foss_server: str, foss: Fossology, monkeypatch, upload_json
+):
+    monkeypatch.setattr(foss, "capabilities", Capabilities("1.0.16"))
+    upload = Upload.from_json(upload_json(1))
+    with pytest.raises(FossologyUnsupported) as excinfo:
+        foss.search(upload=upload, filename="share")
+    assert "Endpoint /search with upload is not supported" in excinfo.value.message
+    with pytest.raises(FossologyUnsupported):
+        next(foss.iter_search(upload=upload, filename="share"))
+
+    # Searches which aren't limited to an upload are still supported
+    responses.add(responses.GET, f"{foss_server}/api/v1/search", json=[])
+    assert foss.search(filename="share") == []
+    assert list(foss.iter_search(filename="share")) == []
+
+
+@responses.activate
+def test_iter_search(foss_server: str, foss: Fossology, upload_json):
+    total = 23
+    upload = upload_json(1, uploadname="base-files_11.tar.xz")
+
+    def search_page(request):
+        assert request.headers["license"] == "GPL-2.0"
+        page_size = int(request.headers["limit"])
+        page = int(request.headers["page"])
+        items = [
+            {"upload": upload, "uploadTreeId": item, "filename": f"file-{item}"}
+            for item in range((page - 1) * page_size, min(page * page_size, total))
+        ]
+        headers = {"X-TOTAL-PAGES": str(-(-total // page_size))}
+        return 200, headers, json.dumps(items)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/search", callback=search_page
+    )
+    items = list(foss.iter_search(license="GPL-2.0", page_size=5, prefetch=2))
+    assert [item.uploadTreeId for item in items] == list(range(total))
+    assert str(items[0]) == "File 'file-0' (0) in upload 'base-files_11.tar.xz' (1)"
+    assert len(responses.calls) == 5
+
+    # All items are returned at once if the server doesn't paginate the results
+    items = [
+        {"upload": upload, "uploadTreeId": item, "filename": f"file-{item}"}
+        for item in range(8)
+    ]
+    responses.replace(responses.GET, f"{foss_server}/api/v1/search", json=items)
+    assert len(list(foss.iter_search(license="GPL-2.0", page_size=5))) == 8
+    assert len(responses.calls) == 6
+
+    # Oversized pages are capped, non-positive sizes are rejected
+    assert len(list(foss.iter_search(license="GPL-2.0", page_size=5000))) == 8
+    assert responses.calls[-1].request.headers["limit"] == "1000"
+    for page_size in (0, -1):
+        with pytest.raises(ValueError):
+            list(foss.iter_search(license="GPL-2.0", page_size=page_size))
+    assert len(responses.calls) == 7
+
+
 @responses.activate
 def test_search_error(foss_server: str, foss: Fossology):
     responses.add(responses.GET, f"{foss_server}/api/v1/search", status=404)
@@ -104,6 +167,70 @@ def test_filesearch(foss: Fossology, scanned_upload: Upload):
             )
 
 
+@responses.activate
+def test_filesearch_batch(foss_server: str, foss: Fossology, tmp_path):
+    if versiontuple(foss.version) <= versiontuple("1.0.16"):
+        return
+    known = {f"{i:040X}" for i in range(0, 10, 2)}
+    searched = []
+
+    def filesearch(request):
+        filelist = json.loads(request.body)
+        searched.append(filelist)
+        results = []
+        for entry in filelist:
+            sha1 = entry.get("sha1", "").upper()
+            hash = {"sha1": sha1, "md5": None, "sha256": None, "size": None}
+            if sha1 in known:
+                findings = {"scanner": ["MIT"], "conclusion": []}
+                results.append({"hash": hash, "findings": findings})
+            elif len(filelist) > 1:
+                # Unknown files are omitted when the chunk has several entries
+                continue
+            else:
+                results.append({"hash": hash, "message": "Not found"})
+        return 200, {}, json.dumps(results)
+
+    responses.add_callback(
+        responses.POST, f"{foss_server}/api/v1/filesearch", callback=filesearch
+    )
+    hashes = [f"{i:040x}" for i in range(9)]
+    results = foss.filesearch_batch(
+        hashes + [{"sha1": hashes[0]}], chunk_size=4, workers=2
+    )
+    assert list(results) == hashes
+    assert [i for i, sha1 in enumerate(hashes) if results[sha1]] == [0, 2, 4, 6, 8]
+    assert results[hashes[2]].findings.scanner == ["MIT"]
+    assert sorted(len(filelist) for filelist in searched) == [1, 4, 4]
+
+    # Known hashes are found in the local index
+    index = FilesearchIndex(str(tmp_path / "filesearch.sqlite"))
+    searched.clear()
+    foss.filesearch_batch(hashes, index=index)
+    results = foss.filesearch_batch(hashes + [f"{9:040x}"], index=index)
+    assert [len(filelist) for filelist in searched] == [9, 1]
+    assert results[hashes[2]].findings.scanner == ["MIT"]
+    assert results[hashes[1]] is None
+
+    # Hash sums differing by their case are searched once, under each given key
+    mixed = f"{0xAB:040x}"
+    known.add(mixed.upper())
+    searched.clear()
+    results = foss.filesearch_batch([mixed, mixed.upper(), {"sha1": hashes[3]}])
+    assert searched == [[{"sha1": mixed}, {"sha1": hashes[3]}]]
+    assert list(results) == [mixed, mixed.upper(), hashes[3]]
+    assert results[mixed] is results[mixed.upper()]
+    assert results[mixed].findings.scanner == ["MIT"]
+    foss.filesearch_batch([mixed], index=index)
+    results = foss.filesearch_batch([mixed.upper(), hashes[1]], index=index)
+    assert len(searched) == 2
+    assert results[mixed.upper()].findings.scanner == ["MIT"]
+
+    # The legacy search stops at the first unknown file
+    result = foss.filesearch(filelist=[{"sha1": hashes[1]}])
+    assert result == "Unable to get a result with the given filesearch criteria"
+
+
 def test_filesearch_nogroup(foss: Fossology):
     if versiontuple(foss.version) > versiontuple("1.0.16"):
         with pytest.raises(AuthorizationError) as excinfo:
@@ -0,0 +1,59 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from fossology.obj import Licenses
+from fossology.store import LicenseStore
+
+
+@pytest.fixture
+def findings() -> list:
+    return [
+        {
+            "filePath": "upload/COPYING",
+            "findings": {"scanner": ["GPL-2.0-only"], "conclusion": ["GPL-2.0-only"]},
+        },
+        {
+            "filePath": "upload/src/main.c",
+            "findings": {
+                "scanner": ["MIT", "GPL-2.0-only"],
+                "conclusion": None,
+                "copyright": ["Copyright (c) Siemens AG"],
+            },
+        },
+        {"filePath": "upload/README", "findings": None, "uploadId": 1},
+        Licenses("upload/src/util.c", findings={"scanner": [], "conclusion": ["MIT"]}),
+    ]
+
+
+def test_license_store(findings: list):
+    store = LicenseStore(findings[:2])
+    store.extend(findings[2:])
+    assert len(store) == 4
+    assert store.paths()[0] == "upload/COPYING"
+    assert "upload/README" in store
+    assert "upload/unknown" not in store
+    assert store.get("upload/unknown") is None
+
+    main = store.get("upload/src/main.c")
+    assert main.findings.scanner == ["MIT", "GPL-2.0-only"]
+    assert main.findings.conclusion is None
+    assert main.findings.copyright == ["Copyright (c) Siemens AG"]
+    readme = store[-2]
+    assert readme.filepath == "upload/README"
+    assert readme.findings is None
+    assert readme.additional_info == {"uploadId": 1}
+    assert [licenses.filepath for licenses in store[2:]] == [
+        "upload/README",
+        "upload/src/util.c",
+    ]
+    with pytest.raises(IndexError):
+        store[4]
+
+    assert store.licenses() == {"GPL-2.0-only": 2, "MIT": 2}
+    assert store.files_with_license("MIT") == ["upload/src/main.c", "upload/src/util.c"]
+    assert store.files_with_license("MIT", conclusion=False) == ["upload/src/main.c"]
+    assert store.files_with_license("GPL-2.0-only", scanner=False) == ["upload/COPYING"]
+    assert store.files_with_license("Apache-2.0") == []
+    assert str(store) == "License findings of 4 files, 2 distinct licenses"
@@ -0,0 +1,71 @@
+# Copyright 2019-2021 Siemens AG
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from email.parser import BytesParser
+
+import pytest
+
+from fossology.streaming import MultipartFile, aiter_json_array, iter_json_array
+
+
+def test_multipart_file(test_file_path: str):
+    progress = []
+    with MultipartFile(
+        "fileInput",
+        test_file_path,
+        chunk_size=1024,
+        callback=lambda sent, total: progress.append((sent, total)),
+    ) as body:
+        content = b"".join(iter(lambda: body.read(1000), b""))
+        assert len(content) == len(body)
+
+    headers = f"Content-Type: {body.content_type}\r\n\r\n".encode()
+    message = BytesParser().parsebytes(headers + content)
+    part = message.get_payload()[0]
+    assert part.get_param("name", header="content-disposition") == "fileInput"
+    assert part.get_filename() == "base-files_11.tar.xz"
+    with open(test_file_path, "rb") as fp:
+        assert part.get_payload(decode=True) == fp.read()
+
+    assert progress[-1] == (len(body), len(body))
+    assert all(sent <= 1000 * (i + 1) for i, (sent, _) in enumerate(progress))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_json_array(chunk_size: int):
+    elements = [
+        {"filePath": "upload/ünïcode.c", "findings": {"scanner": ["MIT"]}},
+        12.5e-3,
+        "€",
+        [],
+        None,
+    ]
+    content = json.dumps(elements, indent=2, ensure_ascii=False).encode()
+    chunks = [
+        content[offset : offset + chunk_size]
+        for offset in range(0, len(content), chunk_size)
+    ]
+    assert list(iter_json_array(chunks)) == elements
+    assert list(iter_json_array([b" [ ] "])) == []
+
+
+@pytest.mark.parametrize("content", [b"", b"{}", b"[1,", b"[1 2]", b"[1,]"])
+def test_iter_json_array_invalid(content: bytes):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([content]))
+
+
+def test_aiter_json_array():
+    elements = [{"filePath": "upload/ünïcode.c", "findings": {}}, 1, "€"]
+    content = json.dumps(elements, ensure_ascii=False).encode()
+
+    async def chunks():
+        for offset in range(0, len(content), 5):
+            yield content[offset : offset + 5]
+
+    async def decode():
+        return [element async for element in aiter_json_array(chunks())]
+
+    assert asyncio.get_event_loop().run_until_complete(decode()) == elements
@@ -1,14 +1,20 @@
 # Copyright 2019-2021 Siemens AG
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import json
 import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import responses
 
 from fossology import Fossology, versiontuple
+from fossology.capabilities import Capabilities
 from fossology.exceptions import AuthorizationError, FossologyApiError
 from fossology.obj import AccessLevel, Folder, SearchTypes, Upload
+from fossology.uploads import UploadHandle, file_hashes
 
 
 def test_upload_sha1(foss: Fossology, upload: Upload):
@@ -31,6 +37,72 @@ def test_upload_sha1(foss: Fossology, upload: Upload):
         )
 
 
+def test_file_hashes(test_file_path: str):
+    file_hash = file_hashes(test_file_path)
+    assert file_hash.sha1 == "D4D663FC2877084362FB2297337BE05684869B00"
+    assert file_hashes(test_file_path, use_mmap=True).to_dict() == file_hash.to_dict()
+
+
+@responses.activate
+def test_find_uploads_by_hash_legacy(
+    foss: Fossology, foss_server: str, test_file_path: str, monkeypatch
+):
+    # Servers before 1.0.17 only provide the SHA1 sum and the size of uploads
+    monkeypatch.setattr(foss, "capabilities", Capabilities("1.0.16"))
+    file_hash = file_hashes(test_file_path)
+    uploads = [
+        {
+            "folderid": 1,
+            "foldername": "",
+            "id": upload_id,
+            "description": "",
+            "uploadname": "base-files_11.tar.xz",
+            "uploaddate": "2021-01-01",
+            "filesize": file_hash.size,
+            "filesha1": sha1,
+        }
+        for upload_id, sha1 in ((1, file_hash.sha1.lower()), (2, "0" * 40))
+    ]
+    responses.add(responses.GET, f"{foss_server}/api/v1/uploads", json=uploads)
+    found = foss.find_uploads_by_hash(file_hash)
+    assert [upload.id for upload in found] == [1]
+    # No filesearch request is sent
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_upload_dedupe_folder(
+    foss: Fossology, foss_server: str, test_file_path: str, upload_json, monkeypatch
+):
+    monkeypatch.setattr(foss, "capabilities", Capabilities("1.0.16"))
+    file_hash = file_hashes(test_file_path)
+
+    def uploads(request):
+        # Uploads of the subfolders are not considered
+        assert request.params["recursive"] == "false"
+        upload = upload_json(1, filesha1=file_hash.sha1, filesize=file_hash.size)
+        return 200, {}, json.dumps([upload])
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/uploads", callback=uploads
+    )
+    upload = foss.upload_file(foss.rootFolder, file=test_file_path, dedupe=True)
+    assert upload.id == 1
+    assert len(responses.calls) == 1
+
+
+def test_upload_dedupe(foss: Fossology, upload: Upload, test_file_path: str):
+    if versiontuple(foss.version) > versiontuple("1.0.16"):
+        existing = foss.find_uploads_by_hash(
+            file_hashes(test_file_path), folder=foss.rootFolder
+        )
+        assert upload.id in [existing_upload.id for existing_upload in existing]
+        deduped_upload = foss.upload_file(
+            foss.rootFolder, file=test_file_path, dedupe=True
+        )
+        assert deduped_upload.id in [existing_upload.id for existing_upload in existing]
+
+
 def test_get_upload_unauthorized(foss: Fossology, upload: Upload):
     with pytest.raises(AuthorizationError) as excinfo:
         foss.detail_upload(
@@ -96,6 +168,137 @@ def test_get_uploads(foss: Fossology, upload_folder: Folder, test_file_path: str
         assert len(foss.list_uploads(folder=upload_subfolder)) == 1
 
 
+@responses.activate
+def test_iter_uploads(foss: Fossology, foss_server: str, upload_json):
+    total = 23
+
+    def uploads_page(request):
+        page_size = int(request.headers["limit"])
+        page = int(request.headers["page"])
+        uploads = [
+            upload_json(upload_id)
+            for upload_id in range((page - 1) * page_size, min(page * page_size, total))
+        ]
+        headers = {"X-TOTAL-PAGES": str(-(-total // page_size))}
+        return 200, headers, json.dumps(uploads)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/uploads", callback=uploads_page
+    )
+    uploads = list(foss.iter_uploads(page_size=5, prefetch=2))
+    assert [upload.id for upload in uploads] == list(range(total))
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_walk_uploads(foss: Fossology, foss_server: str, folder_tree, upload_json):
+    root = foss.rootFolder
+    folder_tree([(9001, "A", root.id), (9002, "B", 9001)])
+    # Number of uploads per folder, B doesn't provide the total number of pages
+    counts = {root.id: 3, 9001: 12, 9002: 7}
+
+    def uploads_page(request):
+        assert request.params["recursive"] == "false"
+        folder_id = int(request.params["folderId"])
+        page_size = int(request.headers["limit"])
+        page = int(request.headers["page"])
+        total = counts[folder_id]
+        uploads = [
+            upload_json(folder_id * 100 + upload_id, folderid=folder_id)
+            for upload_id in range((page - 1) * page_size, min(page * page_size, total))
+        ]
+        headers = {}
+        if folder_id != 9002:
+            headers["X-TOTAL-PAGES"] = str(-(-total // page_size))
+        return 200, headers, json.dumps(uploads)
+
+    responses.add_callback(
+        responses.GET, f"{foss_server}/api/v1/uploads", callback=uploads_page
+    )
+    pairs = list(foss.walk_uploads(workers=3, page_size=5))
+    assert sorted((folder.id, upload.id) for folder, upload in pairs) == sorted(
+        (folder_id, folder_id * 100 + upload_id)
+        for folder_id, total in counts.items()
+        for upload_id in range(total)
+    )
+    # 1 + 3 + 2 pages
+    assert len(responses.calls) == 6
+
+    pairs = list(foss.walk_uploads(root=foss.folders.get(9002), page_size=5))
+    assert {folder.id for folder, _ in pairs} == {9002}
+    assert len(pairs) == 7
+
+
+@responses.activate
+def test_bulk_delete_uploads(foss: Fossology, foss_server: str, upload_json):
+    uploads = [
+        Upload.from_json(upload_json(upload_id)) for upload_id in (9001, 9002, 9003)
+    ]
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/uploads/9001", status=202)
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/uploads/9002", status=202)
+    responses.add(responses.DELETE, f"{foss_server}/api/v1/uploads/9003", status=404)
+    responses.add(responses.GET, f"{foss_server}/api/v1/uploads/9001", status=404)
+    responses.add(
+        responses.GET,
+        f"{foss_server}/api/v1/uploads/9002",
+        status=503,
+        json={"message": "Ununpack job not started"},
+    )
+    results = foss.bulk_delete_uploads(uploads, workers=2, wait=True, timeout=0)
+    assert [result.item.id for result in results] == [9001, 9002, 9003]
+    assert results[0].ok
+    assert "Upload 9002 not deleted after 0 seconds" in results[1].error.message
+    assert "Unable to delete upload 9003" in results[2].error.message
+    assert len(responses.calls) == 5
+
+
+def test_bulk_upload(foss: Fossology, upload_folder: Folder, test_file_path: str):
+    results = foss.bulk_upload(
+        [test_file_path, "tests/files/does-not-exist.tar.xz"], upload_folder, workers=2
+    )
+    assert [result.item for result in results] == [
+        test_file_path,
+        "tests/files/does-not-exist.tar.xz",
+    ]
+    assert results[0].ok
+    assert results[0].result.uploadname == "base-files_11.tar.xz"
+    assert not results[1].ok
+    assert isinstance(results[1].error, FileNotFoundError)
+
+    # Cleanup
+    foss.delete_upload(results[0].result)
+
+
+def test_upload_no_wait(foss: Fossology, upload_folder: Folder, test_file_path: str):
+    handles = [
+        foss.upload_file(upload_folder, file=test_file_path, wait=False)
+        for _ in range(2)
+    ]
+    assert all(isinstance(handle, UploadHandle) for handle in handles)
+    uploads = foss.wait_for_uploads(handles, timeout=300)
+    assert [upload.id for upload in uploads] == [handle.id for handle in handles]
+    assert all(handle.done() for handle in handles)
+    assert handles[0].poll().uploadname == "base-files_11.tar.xz"
+
+    # Cleanup
+    for upload in uploads:
+        foss.delete_upload(upload)
+
+
+def test_upload_handle_await_executor():
+    class FakeFossology:
+        def wait_for_uploads(self, handles, timeout=None):
+            return [threading.current_thread().name for _ in handles]
+
+    async def wait(handle):
+        return await handle
+
+    with ThreadPoolExecutor(1, thread_name_prefix="uploads") as executor:
+        handle = UploadHandle(FakeFossology(), 1, executor=executor)
+        thread_name = asyncio.get_event_loop().run_until_complete(wait(handle))
+    assert thread_name.startswith("uploads")
+
+
 def test_upload_from_vcs(foss: Fossology):
     vcs = {
         "vcsType": "git",
@@ -248,6 +451,48 @@ def test_upload_summary(foss: Fossology, scanned_upload: Upload):
     )
 
 
+@responses.activate
+def test_upload_summaries(foss: Fossology, foss_server: str, upload_json):
+    uploads = [Upload.from_json(upload_json(upload_id)) for upload_id in range(1, 5)]
+    calls = dict()
+
+    def summary(request):
+        upload_id = int(request.url.split("/")[-2])
+        calls[upload_id] = calls.get(upload_id, 0) + 1
+        if upload_id == 3:
+            return 404, {}, json.dumps({"message": "Not found"})
+        if upload_id == 4 or calls[upload_id] < upload_id:
+            return 503, {}, json.dumps({"message": "Ununpacked"})
+        body = {
+            "id": upload_id,
+            "uploadName": f"upload-{upload_id}",
+            "mainLicense": None,
+            "uniqueLicenses": 0,
+            "totalLicenses": 0,
+            "uniqueConcludedLicenses": 0,
+            "totalConcludedLicenses": 0,
+            "filesToBeCleared": 0,
+            "filesCleared": 0,
+            "clearingStatus": "Open",
+            "copyrightCount": 0,
+        }
+        return 200, {}, json.dumps(body)
+
+    for upload in uploads:
+        responses.add_callback(
+            responses.GET,
+            f"{foss_server}/api/v1/uploads/{upload.id}/summary",
+            callback=summary,
+        )
+    summaries = foss.upload_summaries(uploads, workers=2, wait_time=0)
+    assert sorted(summaries) == [1, 2, 3, 4]
+    assert summaries[1].result.id == 1
+    assert summaries[2].result.id == 2
+    assert "No summary for upload upload-3" in summaries[3].error.message
+    assert "after 3 attempts" in summaries[4].error.message
+    assert calls == {1: 1, 2: 2, 3: 1, 4: 3}
+
+
 def test_upload_licenses(foss: Fossology, scanned_upload: Upload):
     # Default agent "nomos"
     licenses = foss.upload_licenses(scanned_upload)
@@ -272,6 +517,41 @@ def test_upload_licenses(foss: Fossology, scanned_upload: Upload):
     )
 
 
+@responses.activate
+def test_iter_upload_licenses(foss: Fossology, foss_server: str, upload_json):
+    upload = Upload.from_json(upload_json(1, uploadname="upload"))
+    findings = [
+        {
+            "filePath": f"upload/file-{i}.c",
+            "findings": {"scanner": ["MIT"], "conclusion": None},
+        }
+        for i in range(100)
+    ]
+    responses.add(
+        responses.GET,
+        f"{foss_server}/api/v1/uploads/1/licenses",
+        body=json.dumps(findings),
+        content_type="application/json",
+    )
+    licenses = foss.iter_upload_licenses(upload, chunk_size=16)
+    first = next(licenses)
+    assert first.filepath == "upload/file-0.c"
+    assert first.findings.scanner == ["MIT"]
+    assert len(list(licenses)) == 99
+    assert len(foss.upload_licenses(upload)) == 100
+    store = foss.upload_licenses(upload, compact=True)
+    assert store.files_with_license("MIT")[-1] == "upload/file-99.c"
+
+    responses.replace(
+        responses.GET,
+        f"{foss_server}/api/v1/uploads/1/licenses",
+        body='[{"filePath": "upload/file-0.c"}, {"filePath"',
+    )
+    with pytest.raises(FossologyApiError) as excinfo:
+        foss.upload_licenses(upload)
+    assert "Invalid licenses for upload upload (id=1)" in str(excinfo.value)
+
+
 def test_delete_unknown_upload_unknown_group(foss: Fossology):
     if versiontuple(foss.version) > versiontuple("1.0.16"):
         upload = Upload(
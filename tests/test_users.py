@@ -84,6 +84,23 @@ def test_wrong_user(foss_server, foss_token):
         Fossology(foss_server, foss_token, "nofossy")
 
 
+def test_lazy_session(foss_server, foss_token):
+    foss = Fossology(foss_server, foss_token, "fossy", lazy=True)
+    assert "version" not in vars(foss)
+    assert "user" not in vars(foss)
+    assert foss.rootFolder.id == foss.user.rootFolderId
+    assert foss.version
+    assert foss.folders
+    foss.close()
+
+
+def test_lazy_wrong_user(foss_server, foss_token):
+    foss = Fossology(foss_server, foss_token, "nofossy", lazy=True)
+    with pytest.raises(AuthenticationError):
+        foss.user
+    foss.close()
+
+
 def test_unknown_user(foss: Fossology):
     with pytest.raises(FossologyApiError):
         foss.detail_user(30)